@@ -1,9 +1,106 @@
+import os
+import time
+import statistics
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import bcrypt
 
+# --- Hashing Configuration ---
+# BCRYPT_ROUNDS may be a fixed cost (e.g. "12") or "auto" to calibrate on this host.
+# Stored hashes with a different cost are upgraded on the next successful login.
+BCRYPT_ROUNDS = os.environ.get("BCRYPT_ROUNDS", "12")
+BCRYPT_TARGET_MS = float(os.environ.get("BCRYPT_TARGET_MS", "250"))
+BCRYPT_CALIBRATION_SAMPLES = int(os.environ.get("BCRYPT_CALIBRATION_SAMPLES", "5"))
+# "auto" keeps its pick here and never lowers it, so a noisy calibration on a busy
+# host cannot move the cost down (and rehash every user) between restarts.
+BCRYPT_ROUNDS_FILE = os.environ.get(
+    "BCRYPT_ROUNDS_FILE", os.path.join(os.path.dirname(__file__), "data", "bcrypt_rounds")
+)
+
+# bcrypt releases the GIL, so a small thread pool bounds how many hashes run at
+# once without blocking every other session on the worker.
+HASH_WORKERS = int(os.environ.get("HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+
+_rounds = None
+_pool = None
+_lock = threading.Lock()
+
+
+def calibrate_bcrypt_rounds(target_ms: float = BCRYPT_TARGET_MS, min_rounds: int = 10, max_rounds: int = 16,
+                            samples: int = BCRYPT_CALIBRATION_SAMPLES) -> int:
+    """
+    Picks the highest bcrypt cost whose hash time stays within target_ms on this host.
+    Each extra round doubles the work, so hashes are only timed at min_rounds; the
+    median of several samples keeps one slow (or fast) run from deciding the cost.
+    """
+    timings = []
+    for _ in range(max(1, samples)):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration-sample", bcrypt.gensalt(rounds=min_rounds))
+        timings.append((time.perf_counter() - start) * 1000)
+    elapsed_ms = statistics.median(timings)
+
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+
+def _auto_rounds(path: str | None = None) -> int:
+    """
+    Calibrates, but never goes below the cost stored in BCRYPT_ROUNDS_FILE by an
+    earlier run; a higher pick replaces the stored one.
+    """
+    path = path or BCRYPT_ROUNDS_FILE
+    try:
+        with open(path, encoding="utf-8") as f:
+            stored = int(f.read().strip())
+    except (OSError, ValueError):
+        stored = None
+
+    rounds = calibrate_bcrypt_rounds()
+    if stored is not None and stored >= rounds:
+        return stored
+
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(f"{rounds}\n")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass   # read-only install: the cost is still used for this process
+    return rounds
+
+
+def get_bcrypt_rounds() -> int:
+    """Returns the configured bcrypt cost, calibrating once if set to 'auto'."""
+    global _rounds
+    if _rounds is None:
+        with _lock:
+            if _rounds is None:
+                if str(BCRYPT_ROUNDS).lower() == "auto":
+                    _rounds = _auto_rounds()
+                else:
+                    _rounds = int(BCRYPT_ROUNDS)
+    return _rounds
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _pool
+
+
 # --- Password Hashing and Verification ---
-def hash_password(plain_text_password: str) -> str:
+def hash_password(plain_text_password: str, rounds: int | None = None) -> str:
     password_bytes = plain_text_password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or get_bcrypt_rounds())
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -12,6 +109,21 @@ def verify_password(plain_text_password: str, hashed_password: str) -> bool:
     hash_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(plain_bytes, hash_bytes)
 
+def needs_rehash(hashed_password: str, rounds: int | None = None) -> bool:
+    """True if the stored hash was made with a cost other than the configured one."""
+    try:
+        cost = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return cost != (rounds or get_bcrypt_rounds())
+
+# --- Off-thread Hashing (bounded worker pool) ---
+def submit_hash(plain_text_password: str, rounds: int | None = None) -> Future:
+    return _get_pool().submit(hash_password, plain_text_password, rounds)
+
+def submit_verify(plain_text_password: str, hashed_password: str) -> Future:
+    return _get_pool().submit(verify_password, plain_text_password, hashed_password)
+
 # --- Input Validation ---
 def validate_username(username: str) -> tuple[bool, str]:
     if len(username) < 3 or len(username) > 20:
@@ -0,0 +1,132 @@
+import argparse
+import csv
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from app.auth import hash_password, get_bcrypt_rounds, validate_username, validate_password
+from app.cyber_security.user_db import connect_db, create_users_table
+
+# SQLite's default limit on bound parameters per statement
+_SQL_PARAM_CHUNK = 900
+
+
+# --- Read CSV ---
+def read_users_csv(csv_file: str) -> list[dict]:
+    """Reads a CSV with 'username' and 'password' columns (UTF-8, with or without a BOM)."""
+    with open(csv_file, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        return [
+            {"username": (row.get("username") or "").strip(), "password": row.get("password") or ""}
+            for row in reader
+        ]
+
+
+def _existing_usernames(cur, usernames: list[str]) -> set[str]:
+    found = set()
+    for i in range(0, len(usernames), _SQL_PARAM_CHUNK):
+        chunk = usernames[i:i + _SQL_PARAM_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        cur.execute(f"SELECT username FROM users WHERE username IN ({placeholders})", chunk)
+        found.update(r[0] for r in cur.fetchall())
+    return found
+
+
+# --- Bulk Register ---
+def bulk_register_users(rows: list[dict], workers: int | None = None) -> list[dict]:
+    """
+    Registers many users at once.
+    Validates every row, hashes the valid passwords across a process pool and
+    inserts all of them in a single transaction.
+    Returns one report entry per input row: {row, username, success, message}.
+    """
+    create_users_table()
+    report = [
+        {"row": i + 1, "username": r["username"], "success": False, "message": ""}
+        for i, r in enumerate(rows)
+    ]
+
+    # --- Validation and duplicates within the file ---
+    pending = []
+    seen = set()
+    for entry, r in zip(report, rows):
+        ok, msg = validate_username(r["username"])
+        if ok:
+            ok, msg = validate_password(r["password"])
+        if ok and r["username"] in seen:
+            ok, msg = False, "Duplicate username in import file."
+        if not ok:
+            entry["message"] = msg
+            continue
+        seen.add(r["username"])
+        pending.append((entry, r))
+
+    conn = connect_db()
+    try:
+        cur = conn.cursor()
+
+        # --- Duplicates already in the database (skip hashing them) ---
+        existing = _existing_usernames(cur, [r["username"] for _, r in pending])
+        to_hash = []
+        for entry, r in pending:
+            if r["username"] in existing:
+                entry["message"] = "Username entered already exists."
+            else:
+                to_hash.append((entry, r))
+
+        # --- Parallel hashing ---
+        rounds = get_bcrypt_rounds()
+        passwords = [r["password"] for _, r in to_hash]
+        if passwords:
+            workers = workers or os.cpu_count() or 1
+            chunksize = max(1, len(passwords) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                hashes = list(pool.map(hash_password, passwords, [rounds] * len(passwords), chunksize=chunksize))
+        else:
+            hashes = []
+
+        # --- Single transaction insert ---
+        cur.execute("BEGIN")
+        for (entry, r), hashed in zip(to_hash, hashes):
+            try:
+                cur.execute(
+                    "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+                    (r["username"], hashed)
+                )
+                entry["success"] = True
+                entry["message"] = "User registered successfully."
+            except sqlite3.IntegrityError:
+                entry["message"] = "Username entered already exists."
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return report
+
+
+def write_report(report: list[dict], report_file: str):
+    with open(report_file, "w", newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["row", "username", "success", "message"])
+        writer.writeheader()
+        writer.writerows(report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-provision users from a CSV of username,password.")
+    parser.add_argument("csv_file")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: CPU count)")
+    parser.add_argument("--report", default=None, help="write the per-row report to this CSV")
+    args = parser.parse_args()
+
+    result = bulk_register_users(read_users_csv(args.csv_file), workers=args.workers)
+    created = sum(1 for r in result if r["success"])
+    print(f"{created} of {len(result)} users created.")
+    for r in result:
+        if not r["success"]:
+            print(f"  row {r['row']} ({r['username'] or '<empty>'}): {r['message']}")
+    if args.report:
+        write_report(result, args.report)
+        print(f"Report written to {args.report}")
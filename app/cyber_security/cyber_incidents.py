@@ -1,7 +1,14 @@
 import sqlite3
 import os
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
 import pandas as pd
 
+from app.cyber_security.spike_detector import SpikeDetector
+from app.cyber_security.write_queue import GroupCommitWriter, WRITE_QUEUE
+from app.services.metrics import timed
+
 # -------------------------
 # Database Path
 # -------------------------
@@ -9,11 +16,56 @@ BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DB_FILE = os.path.join(BASE_DIR, "data", "CYBER_INCIDENTS.db")
 CSV_FILE = os.path.join(BASE_DIR, "data", "CYBER_INCIDENTS.csv")
 
+# INCIDENT_COLUMN_STORE=1 serves the Cyber Security panel from an in-memory
+# columnar copy of the table (see incident_store.py) instead of SQL scans.
+COLUMN_STORE = os.environ.get("INCIDENT_COLUMN_STORE", "0") == "1"
+
+INCIDENT_COLUMNS = ["Incident ID", "Timestamp", "Severity", "Category", "Status", "Description"]
+# Columns the paginated tables can sort by (each gets a (column, incident_id) index)
+SORT_INDEX_COLUMNS = ("timestamp", "severity", "category", "status")
+
+# Shared by the KPIs, the backlog and the open list, so counts and lists agree
+# (an incident with no status is unresolved)
+UNRESOLVED_WHERE = "IFNULL(status, '') NOT IN ('Closed','Resolved')"
+HIGH_SEVERITY_WHERE = "severity IN ('High','Critical')"
+
+# SQL expression per trend bucket size (timestamps are 'YYYY-MM-DD HH:MM:SS...')
+TREND_BUCKETS = {
+    "raw": "timestamp",
+    "hour": "substr(timestamp, 1, 13)",
+    "day": "substr(timestamp, 1, 10)",
+    "month": "substr(timestamp, 1, 7)",
+}
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """
+    The Cyber Security page's aggregates, read in one transaction. The
+    High/Critical open list itself is paged from high_severity_open_source().
+    """
+    total: int
+    unresolved: int
+    phishing: int
+    high_open_count: int
+    phishing_trend: pd.DataFrame           # Timestamp, Count
+    unresolved_by_category: pd.DataFrame   # Category, Unresolved
+
+
 class CyberIncidentDB:
 
-    def __init__(self, db_path=DB_FILE,csv_path=CSV_FILE):
+    def __init__(self, db_path=DB_FILE,csv_path=CSV_FILE, column_store=None):
         self.db_path = db_path
         self.csv_path = csv_path
+        self._sources = {}
+        self._spike_state_ready = False
+        self._spikes_lock = threading.Lock()
+        self.use_column_store = COLUMN_STORE if column_store is None else column_store
+        self._store = None
+        self._store_version = None
+        # Held across each write so the column store sees writes in commit order
+        self._write_lock = threading.RLock()
+        self._writer = None
         self._create_table()
 
     # ------- Internal connection helper --------
@@ -21,6 +73,7 @@ class CyberIncidentDB:
         return sqlite3.connect(self.db_path)
 
     # ------- Create Table --------
+    @timed("cyber_db._create_table")
     def _create_table(self):
         conn = self._connect()
         cur = conn.cursor()
@@ -34,13 +87,94 @@ class CyberIncidentDB:
                 description TEXT
             )
         ''')
+        # (column, key) indexes let the keyset-paginated views walk the sort order
+        for column in SORT_INDEX_COLUMNS:
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_cyber_incidents_{column} "
+                f"ON cyber_incidents ({column}, incident_id)"
+            )
         conn.commit()
         conn.close()
 
-    # ------- CRUD METHODS --------
-    def insert(self, row):
-        conn = self._connect()
-        cur = conn.cursor()
+    # ------- Spike detector --------
+    def _ensure_spike_state(self):
+        """
+        Replays a DB without saved detector state (e.g. one that predates
+        the detector) once, in timestamp order; after that every insert
+        updates the state incrementally. Runs before a write transaction
+        starts, since it commits on its own connection.
+        """
+        if self._spike_state_ready:
+            return
+        with self._spikes_lock:
+            if self._spike_state_ready:
+                return
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                detector = SpikeDetector()
+                if not detector.load(conn):
+                    detector.rebuild(conn.execute(
+                        "SELECT category, timestamp FROM cyber_incidents ORDER BY timestamp"
+                    ))
+                    detector.save(conn)
+                conn.commit()
+            finally:
+                conn.close()
+            self._spike_state_ready = True
+
+    def _spike_detector(self, conn, categories=None):
+        """
+        A fresh SpikeDetector holding the saved state of `categories` (all
+        if None), read through conn. The state table is the only copy:
+        writers load it inside their write transaction and save it back in
+        the same one, so writers in other instances or processes never
+        overwrite each other's updates, and a rolled-back write leaves the
+        saved state untouched.
+        """
+        detector = SpikeDetector()
+        detector.load(conn, categories)
+        return detector
+
+    # ------- Column store --------
+    def _file_version(self):
+        try:
+            st = os.stat(self.db_path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    @timed("cyber_db.column_store")
+    def column_store(self):
+        """
+        In-memory IncidentColumnStore of the table. Built on first use and
+        kept current by this instance's write methods; rebuilt if the DB file
+        was changed by anything else.
+        """
+        from app.cyber_security.incident_store import IncidentColumnStore
+        with self._write_lock:
+            if self._store is None or self._store_version != self._file_version():
+                conn = self._connect()
+                try:
+                    rows = conn.execute("""
+                        SELECT incident_id, timestamp, severity, category, status, description
+                        FROM cyber_incidents ORDER BY incident_id
+                    """).fetchall()
+                finally:
+                    conn.close()
+                self._store = IncidentColumnStore.from_rows(rows)
+                self._store_version = self._file_version()
+            return self._store
+
+    def _update_column_store(self, version_before, apply):
+        # Only patch a store that was current before this write
+        if self._store is not None and self._store_version == version_before:
+            apply(self._store)
+            self._store_version = self._file_version()
+
+    # ------- Write statements (shared by the CRUD methods and commit_batch) --------
+    @staticmethod
+    def _exec_insert(cur, row):
         cur.execute('''
             INSERT OR IGNORE INTO cyber_incidents
             (incident_id, timestamp, severity, category, status, description)
@@ -53,27 +187,136 @@ class CyberIncidentDB:
             row['status'],
             row['description']
         ))
-        conn.commit()
-        conn.close()
+        return cur.rowcount > 0
 
-    def update_status(self, incident_id, new_status):
-        conn = self._connect()
-        cur = conn.cursor()
+    @staticmethod
+    def _exec_update_status(cur, incident_id, new_status):
         cur.execute(
             "UPDATE cyber_incidents SET status=? WHERE incident_id=?",
             (new_status, incident_id)
         )
-        conn.commit()
-        conn.close()
+        return cur.rowcount
 
-    def delete(self, incident_id):
-        conn = self._connect()
-        cur = conn.cursor()
+    @staticmethod
+    def _exec_delete(cur, incident_id):
         cur.execute("DELETE FROM cyber_incidents WHERE incident_id=?", (incident_id,))
-        conn.commit()
-        conn.close()
+        return cur.rowcount
+
+    @staticmethod
+    def _apply_to_store(store, kind, args):
+        if kind == "insert":
+            store.insert(*args)
+        elif kind == "update_status":
+            store.update_status(*args)
+        elif kind == "delete":
+            store.delete(*args)
+
+    # ------- CRUD METHODS --------
+    @timed("cyber_db.insert")
+    def insert(self, row):
+        with self._write_lock:
+            self._ensure_spike_state()
+            version = self._file_version()
+            conn = self._connect()
+            try:
+                cur = conn.cursor()
+                inserted = self._exec_insert(cur, row)
+                if inserted:
+                    # The INSERT holds the write lock, so the state read here is current;
+                    # it is saved in the same transaction as the incident itself
+                    spikes = self._spike_detector(conn, [row['category']])
+                    spikes.observe(row['category'], row['timestamp'])
+                    spikes.save(conn)
+                conn.commit()
+            finally:
+                conn.close()
+            if inserted:
+                self._update_column_store(version, lambda store: store.insert(row))
+            return inserted
+
+    @timed("cyber_db.update_status")
+    def update_status(self, incident_id, new_status):
+        with self._write_lock:
+            version = self._file_version()
+            conn = self._connect()
+            try:
+                updated = self._exec_update_status(conn.cursor(), incident_id, new_status)
+                conn.commit()
+            finally:
+                conn.close()
+            self._update_column_store(version, lambda store: store.update_status(incident_id, new_status))
+            return updated
+
+    @timed("cyber_db.delete")
+    def delete(self, incident_id):
+        with self._write_lock:
+            version = self._file_version()
+            conn = self._connect()
+            try:
+                deleted = self._exec_delete(conn.cursor(), incident_id)
+                conn.commit()
+            finally:
+                conn.close()
+            self._update_column_store(version, lambda store: store.delete(incident_id))
+            return deleted
+
+    # ------- GROUP COMMIT --------
+    @timed("cyber_db.commit_batch")
+    def commit_batch(self, conn, ops):
+        """
+        Applies (kind, args) operations ('insert', 'update_status', 'delete')
+        in a single transaction on conn, which must be in autocommit mode
+        (isolation_level=None). Each op runs in its own savepoint, so a bad
+        one is rolled back alone. Returns (ok, result or exception) per op.
+        If the commit itself fails, nothing is applied and the error is raised.
+        """
+        with self._write_lock:
+            self._ensure_spike_state()
+            version = self._file_version()
+            cur = conn.cursor()
+            outcomes = []
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                # Read under the write lock taken by BEGIN IMMEDIATE, saved before COMMIT
+                spikes = self._spike_detector(conn, [
+                    args[0].get('category') for kind, args in ops if kind == "insert" and isinstance(args[0], dict)
+                ])
+                for kind, args in ops:
+                    cur.execute("SAVEPOINT op")
+                    try:
+                        result = getattr(self, f"_exec_{kind}")(cur, *args)
+                    except Exception as e:
+                        cur.execute("ROLLBACK TO op")
+                        outcomes.append((False, e))
+                    else:
+                        if kind == "insert" and result:
+                            spikes.observe(args[0]['category'], args[0]['timestamp'])
+                        outcomes.append((True, result))
+                    cur.execute("RELEASE op")
+                spikes.save(conn)
+                cur.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    cur.execute("ROLLBACK")
+                raise
+
+            def apply(store):
+                for (kind, args), (ok, result) in zip(ops, outcomes):
+                    if ok and (kind != "insert" or result):
+                        self._apply_to_store(store, kind, args)
+            self._update_column_store(version, apply)
+            return outcomes
+
+    def writer(self):
+        """Shared GroupCommitWriter (single writer thread) for this database."""
+        if self._writer is None:
+            with self._write_lock:
+                if self._writer is None:
+                    self._writer = GroupCommitWriter(self)
+        return self._writer
 
     # ------- QUERY METHODS --------
+    @timed("cyber_db.fetch_all")
     def fetch_all(self):
         conn = self._connect()
         cur = conn.cursor()
@@ -85,6 +328,7 @@ class CyberIncidentDB:
             columns=["Incident ID", "Timestamp", "Severity", "Category", "Status", "Description"]
         )
 
+    @timed("cyber_db.phishing_trend")
     def phishing_trend(self):
         conn = self._connect()
         cur = conn.cursor()
@@ -99,13 +343,14 @@ class CyberIncidentDB:
         conn.close()
         return pd.DataFrame(data, columns=["Timestamp", "Count"])
 
+    @timed("cyber_db.unresolved_by_category")
     def unresolved_by_category(self):
         conn = self._connect()
         cur = conn.cursor()
-        cur.execute("""
+        cur.execute(f"""
             SELECT category, COUNT(*) 
             FROM cyber_incidents 
-            WHERE status NOT IN ('Closed','Resolved')
+            WHERE {UNRESOLVED_WHERE}
             GROUP BY category 
             ORDER BY COUNT(*) DESC
         """)
@@ -113,13 +358,14 @@ class CyberIncidentDB:
         conn.close()
         return pd.DataFrame(data, columns=["Category", "Unresolved"])
 
+    @timed("cyber_db.high_severity_open")
     def high_severity_open(self):
         conn = self._connect()
         cur = conn.cursor()
-        cur.execute("""
+        cur.execute(f"""
             SELECT * FROM cyber_incidents
-            WHERE status NOT IN ('Closed','Resolved')
-              AND severity IN ('High','Critical')
+            WHERE {UNRESOLVED_WHERE}
+              AND {HIGH_SEVERITY_WHERE}
         """)
         data = cur.fetchall()
         conn.close()
@@ -128,41 +374,209 @@ class CyberIncidentDB:
             columns=["Incident ID", "Timestamp", "Severity", "Category", "Status", "Description"]
         )
 
+    @timed("cyber_db.categories")
+    def categories(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT DISTINCT category FROM cyber_incidents WHERE category IS NOT NULL ORDER BY category"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [r[0] for r in rows]
+
+    # ------- DASHBOARD SNAPSHOT --------
+    @timed("cyber_db.dashboard_snapshot")
+    def dashboard_snapshot(self, trend_bucket="day"):
+        """
+        Computes the Cyber Security page's KPIs, phishing trend and
+        per-category backlog inside a single read transaction, so all of them
+        describe the same state of the table. Aggregation is done in SQL;
+        only the grouped rows come back.
+        With the column store enabled, daily trends are answered from memory.
+        """
+        if self.use_column_store and trend_bucket == "day":
+            return self.column_store().dashboard_snapshot()
+
+        bucket = TREND_BUCKETS[trend_bucket]
+        unresolved = UNRESOLVED_WHERE
+        high = HIGH_SEVERITY_WHERE
+
+        conn = self._connect()
+        try:
+            cur = conn.cursor()
+            # Deferred BEGIN: the first SELECT takes the shared lock and holds it until COMMIT
+            cur.execute("BEGIN")
+            cur.execute(f"""
+                SELECT COUNT(*),
+                       IFNULL(SUM({unresolved}), 0),
+                       IFNULL(SUM(lower(category) = 'phishing'), 0),
+                       IFNULL(SUM({unresolved} AND {high}), 0)
+                FROM cyber_incidents
+            """)
+            total, unresolved_count, phishing_count, high_open_count = cur.fetchone()
+
+            cur.execute(f"""
+                SELECT {bucket} AS bucket, COUNT(*)
+                FROM cyber_incidents
+                WHERE lower(category)='phishing'
+                GROUP BY bucket
+                ORDER BY bucket
+            """)
+            trend = cur.fetchall()
+
+            cur.execute(f"""
+                SELECT category, COUNT(*)
+                FROM cyber_incidents
+                WHERE {unresolved}
+                GROUP BY category
+                ORDER BY COUNT(*) DESC, category
+            """)
+            backlog = cur.fetchall()
+            conn.commit()
+        finally:
+            conn.close()
+
+        return DashboardSnapshot(
+            total=total,
+            unresolved=unresolved_count,
+            phishing=phishing_count,
+            high_open_count=high_open_count,
+            phishing_trend=pd.DataFrame(trend, columns=["Timestamp", "Count"]),
+            unresolved_by_category=pd.DataFrame(backlog, columns=["Category", "Unresolved"]),
+        )
+
+    @timed("cyber_db.active_spikes")
+    def active_spikes(self, now=None):
+        self._ensure_spike_state()
+        conn = self._connect()
+        try:
+            return self._spike_detector(conn).active_spikes(now)
+        finally:
+            conn.close()
+
+    @timed("cyber_db.spike_events")
+    def spike_events(self, limit=20, now=None):
+        self._ensure_spike_state()
+        conn = self._connect()
+        try:
+            return self._spike_detector(conn).recent_events(limit, now)
+        finally:
+            conn.close()
+
+    # ------- PAGINATED VIEWS --------
+    @timed("cyber_db.table_source")
+    def table_source(self, base_where=None, base_params=()):
+        """Keyset-paginated source over cyber_incidents for render_paginated_table."""
+        from app.services.paginated_table import SQLiteTableSource
+        key = (base_where, tuple(base_params))
+        if key not in self._sources:
+            # Reused across reruns so its row-count cache survives
+            self._sources[key] = SQLiteTableSource(
+                self.db_path, "cyber_incidents", "incident_id", base_where, base_params
+            )
+        return self._sources[key]
+
+    @timed("cyber_db.high_severity_open_source")
+    def high_severity_open_source(self):
+        return self.table_source(f"{UNRESOLVED_WHERE} AND {HIGH_SEVERITY_WHERE}")
+
 
 # =====================================================
 # PROCEDURAL WRAPPER FUNCTIONS (Dashboard Compatibility)
 # =====================================================
 
-_db = CyberIncidentDB()   # Single global instance
+_db = None   # Single global instance, created on first use
+_db_lock = threading.Lock()
+
+
+def _get_db():
+    global _db
+    if _db is None:
+        # Page scripts and the precompute thread may get here at the same time
+        with _db_lock:
+            if _db is None:
+                _db = CyberIncidentDB()
+    return _db
 
 
 def create_table():
-    _db._create_table()
+    # The table is created when the global instance is first built
+    _get_db()
+
 
+# Writes go through the group-commit queue (WRITE_QUEUE=0 writes directly);
+# each call returns once its write is committed.
 
 def insert_incident(row):
-    _db.insert(row)
+    if WRITE_QUEUE:
+        return _get_db().writer().insert(row).result()
+    return _get_db().insert(row)
 
 
 def update_incident_status(incident_id, new_status):
-    _db.update_status(incident_id, new_status)
+    if WRITE_QUEUE:
+        return _get_db().writer().update_status(incident_id, new_status).result()
+    return _get_db().update_status(incident_id, new_status)
 
 
 def delete_incident(incident_id):
-    _db.delete(incident_id)
+    if WRITE_QUEUE:
+        return _get_db().writer().delete(incident_id).result()
+    return _get_db().delete(incident_id)
+
+
+def submit_incident(row):
+    """
+    Queues an insert and returns its Future (bulk loaders submit many, then
+    wait). With WRITE_QUEUE=0 the insert is done directly and the Future is
+    already resolved.
+    """
+    if WRITE_QUEUE:
+        return _get_db().writer().insert(row)
+    future = Future()
+    try:
+        future.set_result(_get_db().insert(row))
+    except Exception as e:
+        future.set_exception(e)
+    return future
 
 
 def get_all_incidents():
-    return _db.fetch_all()
+    return _get_db().fetch_all()
 
 
 def phishing_trend_over_time():
-    return _db.phishing_trend()
+    return _get_db().phishing_trend()
 
 
 def unresolved_per_category():
-    return _db.unresolved_by_category()
+    return _get_db().unresolved_by_category()
 
 
 def high_severity_open_incidents():
-    return _db.high_severity_open()
+    return _get_db().high_severity_open()
+
+
+def dashboard_snapshot(trend_bucket="day"):
+    return _get_db().dashboard_snapshot(trend_bucket)
+
+
+def incident_categories():
+    return _get_db().categories()
+
+
+def active_spikes():
+    return _get_db().active_spikes()
+
+
+def spike_events(limit=20):
+    return _get_db().spike_events(limit)
+
+
+def incidents_table_source():
+    return _get_db().table_source()
+
+
+def high_severity_open_source():
+    return _get_db().high_severity_open_source()
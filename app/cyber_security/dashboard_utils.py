@@ -1,10 +1,21 @@
 import os
 import pandas as pd
 
+from app.services.metrics import timed
+
+# ----------------------------
+# CSV Paths
+# ----------------------------
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+CYBER_CSV = os.path.join(DATA_DIR, "cyber_incidents.csv")
+DATASETS_CSV = os.path.join(DATA_DIR, "datasets_metadata.csv")
+TICKETS_CSV = os.path.join(DATA_DIR, "it_tickets.csv")
+
 # ----------------------------
 # Functions for Dashboard CSVs
 # ----------------------------
 
+@timed("csv.load_all_dashboard_data")
 def load_all_dashboard_data():
     """
     Returns three DataFrames for the Dashboard overview:
@@ -12,20 +23,14 @@ def load_all_dashboard_data():
     2. datasets_metadata.csv
     3. it_tickets.csv
     """
-    ROOT_DIR = os.path.dirname(os.path.dirname(__file__))  # fixed
-    DATA_DIR = os.path.join(ROOT_DIR, "data")
-
     # --- 1. cyber_incidents CSV ---
-    cyber_csv = os.path.join(DATA_DIR, "cyber_incidents.csv")
-    cyber_df = pd.read_csv(cyber_csv) if os.path.exists(cyber_csv) else pd.DataFrame()
+    cyber_df = pd.read_csv(CYBER_CSV) if os.path.exists(CYBER_CSV) else pd.DataFrame()
 
     # --- 2. datasets_metadata CSV ---
-    dataset_file = os.path.join(DATA_DIR, "datasets_metadata.csv")
-    dataset_df = pd.read_csv(dataset_file) if os.path.exists(dataset_file) else pd.DataFrame()
+    dataset_df = pd.read_csv(DATASETS_CSV) if os.path.exists(DATASETS_CSV) else pd.DataFrame()
 
     # --- 3. it_tickets CSV ---
-    it_file = os.path.join(DATA_DIR, "it_tickets.csv")
-    it_df = pd.read_csv(it_file) if os.path.exists(it_file) else pd.DataFrame()
+    it_df = pd.read_csv(TICKETS_CSV) if os.path.exists(TICKETS_CSV) else pd.DataFrame()
 
     return cyber_df, dataset_df, it_df
 
@@ -33,15 +38,14 @@ def load_all_dashboard_data():
 # Function for Cyber Security analytics
 # ----------------------------
 
+@timed("csv.load_cyber_incidents_csv")
 def load_cyber_incidents_csv():
     """
     Load cyber_incidents.csv specifically for Cyber Security analytics.
     Returns a DataFrame or empty DataFrame if the file does not exist.
     """
-    ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
-    csv_file = os.path.join(ROOT_DIR, "data", "cyber_incidents.csv")
-    if os.path.exists(csv_file):
-        df = pd.read_csv(csv_file)
+    if os.path.exists(CYBER_CSV):
+        df = pd.read_csv(CYBER_CSV)
         # Ensure consistent lowercase columns for easy filtering
         df.columns = [c.strip().lower() for c in df.columns]
         return df
@@ -0,0 +1,257 @@
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.cyber_security.cyber_incidents import DashboardSnapshot, INCIDENT_COLUMNS
+
+RESOLVED_STATUSES = ("Closed", "Resolved")
+HIGH_SEVERITIES = ("High", "Critical")
+NO_TIME = np.iinfo(np.int64).min   # unparsable timestamp (same value as NaT)
+_EPOCH = datetime(1970, 1, 1)
+_US_PER_DAY = 86_400_000_000
+
+
+def _popcount(words):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+def _epoch_us(timestamp):
+    """Microseconds since 1970-01-01 for an ISO timestamp, or NO_TIME."""
+    try:
+        delta = datetime.fromisoformat(str(timestamp)) - _EPOCH
+    except (ValueError, TypeError):
+        return NO_TIME
+    return delta.days * _US_PER_DAY + delta.seconds * 1_000_000 + delta.microseconds
+
+
+class IncidentColumnStore:
+    """
+    In-memory columnar copy of cyber_incidents for fast filtering.
+
+    Severity, status and category are stored as integer codes, and every
+    distinct value also has a bitmap (one bit per row slot, packed into
+    uint64 words). A conjunctive filter such as "unresolved AND severity in
+    (High, Critical) AND category = Phishing" is a few bitwise ANDs/ORs over
+    n/64 words plus a popcount. Deleted rows are cleared from the `alive`
+    bitmap, which every query ANDs in. Writes are applied in place by the
+    CyberIncidentDB write methods.
+    """
+
+    CODED = ("severity", "status", "category")
+
+    def __init__(self, capacity=1024):
+        self.n = 0   # row slots used (including deleted ones)
+        self._alloc(max(64, capacity))
+        self.values = {col: [] for col in self.CODED}        # code -> value
+        self.code_of = {col: {} for col in self.CODED}       # value -> code
+        self.bitmaps = {col: [] for col in self.CODED}       # code -> uint64 words
+        self.slot_of = {}                                    # incident_id -> slot
+        self._lock = threading.RLock()
+
+    def _alloc(self, capacity):
+        self.capacity = -(-capacity // 64) * 64
+        words = self.capacity // 64
+        self.ids = np.zeros(self.capacity, dtype=np.int64)
+        self.times = np.full(self.capacity, NO_TIME, dtype=np.int64)   # sort key and trend bucket
+        self.timestamps = np.empty(self.capacity, dtype=object)
+        self.descriptions = np.empty(self.capacity, dtype=object)
+        self.codes = {col: np.full(self.capacity, -1, dtype=np.int32) for col in self.CODED}
+        self.alive = np.zeros(words, dtype=np.uint64)
+
+    # ------- Building --------
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds the store from (incident_id, timestamp, severity, category, status, description) rows."""
+        df = pd.DataFrame(rows, columns=["incident_id", "timestamp", "severity", "category", "status", "description"])
+        n = len(df)
+        store = cls(capacity=max(1024, n * 2))
+        store.n = n
+        store.ids[:n] = df["incident_id"].to_numpy(dtype=np.int64)
+        store.timestamps[:n] = df["timestamp"].to_numpy(dtype=object)
+        store.descriptions[:n] = df["description"].to_numpy(dtype=object)
+        parsed = pd.to_datetime(df["timestamp"], format="ISO8601", errors="coerce")
+        store.times[:n] = parsed.to_numpy(dtype="datetime64[us]").astype(np.int64)
+        store.slot_of = dict(zip(store.ids[:n].tolist(), range(n)))
+        store.alive[:] = store._pack(np.ones(n, dtype=bool))
+
+        for col in cls.CODED:
+            codes, uniques = pd.factorize(df[col])   # missing values get code -1
+            store.codes[col][:n] = codes
+            store.values[col] = list(uniques)
+            store.code_of[col] = {v: i for i, v in enumerate(uniques)}
+            store.bitmaps[col] = [store._pack(codes == i) for i in range(len(uniques))]
+        return store
+
+    def _pack(self, mask):
+        """Bool mask over slots [0, len(mask)) -> uint64 words sized to the capacity."""
+        buf = np.zeros(self.capacity // 8, dtype=np.uint8)
+        bits = np.packbits(mask, bitorder="little")
+        buf[:len(bits)] = bits
+        return buf.view(np.uint64)
+
+    def _grow(self):
+        old = (self.ids, self.times, self.timestamps, self.descriptions, self.codes, self.alive)
+        old_words = len(self.alive)
+        self._alloc(self.capacity * 2)
+        n = self.n
+        self.ids[:n], self.times[:n], self.timestamps[:n], self.descriptions[:n] = (a[:n] for a in old[:4])
+        for col in self.CODED:
+            self.codes[col][:n] = old[4][col][:n]
+            grown = []
+            for words in self.bitmaps[col]:
+                new = np.zeros(len(self.alive), dtype=np.uint64)
+                new[:old_words] = words
+                grown.append(new)
+            self.bitmaps[col] = grown
+        self.alive[:old_words] = old[5]
+
+    @staticmethod
+    def _set(words, slot, on=True):
+        bit = np.uint64(1) << np.uint64(slot & 63)
+        if on:
+            words[slot >> 6] |= bit
+        else:
+            words[slot >> 6] &= ~bit
+
+    def _code(self, col, value):
+        if value is None:
+            return -1
+        code = self.code_of[col].get(value)
+        if code is None:
+            code = len(self.values[col])
+            self.values[col].append(value)
+            self.code_of[col][value] = code
+            self.bitmaps[col].append(np.zeros(len(self.alive), dtype=np.uint64))
+        return code
+
+    # ------- Write paths (called by CyberIncidentDB) --------
+    def insert(self, row):
+        with self._lock:
+            if self.n == self.capacity:
+                self._grow()
+            slot = self.n
+            self.n += 1
+            incident_id = int(row["incident_id"])
+            self.ids[slot] = incident_id
+            self.timestamps[slot] = row["timestamp"]
+            self.descriptions[slot] = row["description"]
+            self.times[slot] = _epoch_us(row["timestamp"])
+            for col in self.CODED:
+                code = self._code(col, row[col])
+                self.codes[col][slot] = code
+                if code >= 0:
+                    self._set(self.bitmaps[col][code], slot)
+            self._set(self.alive, slot)
+            self.slot_of[incident_id] = slot
+
+    def update_status(self, incident_id, new_status):
+        with self._lock:
+            slot = self.slot_of.get(int(incident_id))
+            if slot is None:
+                return
+            old = self.codes["status"][slot]
+            if old >= 0:
+                self._set(self.bitmaps["status"][old], slot, on=False)
+            code = self._code("status", new_status)
+            self.codes["status"][slot] = code
+            if code >= 0:
+                self._set(self.bitmaps["status"][code], slot)
+
+    def delete(self, incident_id):
+        with self._lock:
+            slot = self.slot_of.pop(int(incident_id), None)
+            if slot is not None:
+                self._set(self.alive, slot, on=False)
+
+    # ------- Filtering --------
+    def bits(self, col, values, ignore_case=False):
+        """OR of the bitmaps of the given values (unknown values match nothing)."""
+        if ignore_case:
+            wanted = {str(v).lower() for v in values}
+            codes = [i for i, v in enumerate(self.values[col]) if str(v).lower() in wanted]
+        else:
+            codes = [self.code_of[col][v] for v in values if v in self.code_of[col]]
+        words = np.zeros(len(self.alive), dtype=np.uint64)
+        for code in codes:
+            words |= self.bitmaps[col][code]
+        return words
+
+    def select(self, severity=None, status=None, category=None, exclude_status=None):
+        """
+        Bitmap of live rows matching every given filter; each filter is a
+        list of accepted values (category is matched case-insensitively).
+        """
+        with self._lock:
+            words = self.alive.copy()
+            if severity is not None:
+                words &= self.bits("severity", severity)
+            if status is not None:
+                words &= self.bits("status", status)
+            if category is not None:
+                words &= self.bits("category", category, ignore_case=True)
+            if exclude_status is not None:
+                words &= ~self.bits("status", exclude_status)
+            return words
+
+    def count(self, **filters):
+        return _popcount(self.select(**filters))
+
+    def slots(self, words):
+        return np.flatnonzero(np.unpackbits(words.view(np.uint8), bitorder="little")[:self.n])
+
+    def decode(self, col, codes):
+        # Code -1 (missing) picks the trailing None
+        lookup = np.array(self.values[col] + [None], dtype=object)
+        return lookup[codes]
+
+    def frame(self, slots):
+        """DataFrame (INCIDENT_COLUMNS) of the given row slots."""
+        with self._lock:
+            return pd.DataFrame({
+                "Incident ID": self.ids[slots],
+                "Timestamp": self.timestamps[slots],
+                "Severity": self.decode("severity", self.codes["severity"][slots]),
+                "Category": self.decode("category", self.codes["category"][slots]),
+                "Status": self.decode("status", self.codes["status"][slots]),
+                "Description": self.descriptions[slots],
+            }, columns=INCIDENT_COLUMNS)
+
+    # ------- Cyber Security panel queries --------
+    def dashboard_snapshot(self):
+        """Same result as CyberIncidentDB.dashboard_snapshot(trend_bucket='day')."""
+        with self._lock:
+            unresolved = self.alive & ~self.bits("status", RESOLVED_STATUSES)
+            phishing = self.alive & self.bits("category", ["phishing"], ignore_case=True)
+            high_open = unresolved & self.bits("severity", HIGH_SEVERITIES)
+
+            times = self.times[self.slots(phishing)]
+            days = times[times != NO_TIME] // _US_PER_DAY
+            if len(days):
+                first = days.min()
+                counts = np.bincount(days - first)
+                nonzero = np.flatnonzero(counts)
+                trend = pd.DataFrame({
+                    "Timestamp": np.datetime_as_string((nonzero + first).astype("datetime64[D]")),
+                    "Count": counts[nonzero],
+                })
+            else:
+                trend = pd.DataFrame(columns=["Timestamp", "Count"])
+
+            backlog = [
+                (value, _popcount(unresolved & self.bitmaps["category"][code]))
+                for code, value in enumerate(self.values["category"])
+            ]
+            backlog = sorted(((v, c) for v, c in backlog if c), key=lambda item: (-item[1], item[0]))
+
+            return DashboardSnapshot(
+                total=_popcount(self.alive),
+                unresolved=_popcount(unresolved),
+                phishing=_popcount(phishing),
+                high_open_count=_popcount(high_open),
+                phishing_trend=trend,
+                unresolved_by_category=pd.DataFrame(backlog, columns=["Category", "Unresolved"]),
+            )
@@ -0,0 +1,282 @@
+import json
+import math
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+
+# -------------------------
+# Detector Defaults
+# -------------------------
+BUCKETS = ("hour", "day")
+DEFAULT_ALPHA = 0.2        # EWMA weight of the newest bucket
+DEFAULT_THRESHOLD = 3.0    # z-score at which a bucket counts as a spike
+DEFAULT_MIN_COUNT = 3      # ...and it must hold at least this many incidents
+DEFAULT_WARMUP = 7         # closed buckets needed before a category is scored
+DEFAULT_LATENESS = 1       # older open buckets a late incident may still land in
+MIN_STD = 1.0              # floor on the baseline deviation (sparse categories)
+MAX_GAP_FOLD = 400         # empty buckets folded one by one; the baseline has decayed by then
+MAX_EVENTS = 10            # past spikes kept per category
+
+STATE_TABLE = "incident_spike_state"
+
+
+def bucket_index(timestamp, bucket="day"):
+    """Integer bucket for a 'YYYY-MM-DD HH:MM:SS' timestamp, or None if unparsable."""
+    try:
+        ts = str(timestamp)
+        day = date(int(ts[0:4]), int(ts[5:7]), int(ts[8:10])).toordinal()
+        return day * 24 + int(ts[11:13]) if bucket == "hour" else day
+    except (ValueError, TypeError):
+        return None
+
+
+def bucket_label(index, bucket="day"):
+    if bucket == "hour":
+        day, hour = divmod(index, 24)
+        return f"{date.fromordinal(day).isoformat()} {hour:02d}:00"
+    return date.fromordinal(index).isoformat()
+
+
+@dataclass(frozen=True)
+class Spike:
+    category: str
+    bucket: str        # bucket label, e.g. '2024-04-12'
+    count: int
+    expected: float    # EWMA baseline
+    zscore: float
+
+
+# =====================================================
+# PER-CATEGORY STATE
+# =====================================================
+
+class CategoryState:
+    """
+    EWMA mean/variance of closed bucket counts, plus the few most recent
+    (still open) buckets. Everything here is O(1) in the incident history.
+    """
+    __slots__ = ("mean", "var", "n", "last_closed", "open", "late", "events")
+
+    def __init__(self):
+        self.mean = 0.0
+        self.var = 0.0
+        self.n = 0                # closed buckets folded in
+        self.last_closed = None   # newest closed bucket index
+        self.open = {}            # bucket index -> count
+        self.late = 0             # incidents older than every open bucket (not scored)
+        self.events = []          # past spikes, newest last
+
+    def to_dict(self):
+        return {
+            "mean": self.mean, "var": self.var, "n": self.n, "last_closed": self.last_closed,
+            "open": [[b, c] for b, c in sorted(self.open.items())], "late": self.late, "events": self.events,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls()
+        state.mean = data["mean"]
+        state.var = data["var"]
+        state.n = data["n"]
+        state.last_closed = data["last_closed"]
+        state.open = {b: c for b, c in data["open"]}
+        state.late = data.get("late", 0)
+        state.events = data.get("events", [])
+        return state
+
+
+# =====================================================
+# DETECTOR
+# =====================================================
+
+class SpikeDetector:
+    """
+    Online per-category spike detector over incident counts per time bucket.
+
+    observe() adds one incident in O(1): it bumps the incident's open bucket
+    and closes buckets that fell out of the lateness window, scoring each
+    against the category's EWMA baseline before folding it in. A bucket is a
+    spike when its count is at least min_count and threshold standard
+    deviations above the baseline. State is saved per category, so no
+    detection step rescans the incident history.
+    Deletes and status changes do not affect the counts.
+
+    An open bucket older than the lateness window relative to the clock has
+    expired: it is no longer reported as active (it shows up as a past
+    spike instead), even if no newer incident has closed it yet.
+    """
+
+    def __init__(self, bucket="day", alpha=DEFAULT_ALPHA, threshold=DEFAULT_THRESHOLD,
+                 min_count=DEFAULT_MIN_COUNT, warmup=DEFAULT_WARMUP, lateness=DEFAULT_LATENESS):
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of {BUCKETS}")
+        self.bucket = bucket
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_count = min_count
+        self.warmup = warmup
+        self.lateness = lateness
+        self.states = {}
+        self._dirty = set()
+        self._replace_all = False   # next save drops rows left by a previous bucket size
+        self._lock = threading.RLock()
+
+    # ------- Scoring --------
+    def _zscore(self, state, count):
+        return (count - state.mean) / max(math.sqrt(state.var), MIN_STD)
+
+    def _is_spike(self, state, count, z):
+        return state.n >= self.warmup and count >= self.min_count and z >= self.threshold
+
+    def _fold(self, state, x):
+        if state.n == 0:
+            state.mean, state.var = float(x), 0.0
+        else:
+            diff = x - state.mean
+            incr = self.alpha * diff
+            state.mean += incr
+            state.var = (1 - self.alpha) * (state.var + diff * incr)
+        state.n += 1
+
+    def _close(self, state, index, count):
+        # Buckets with no incidents between the last closed one and this one
+        if state.last_closed is not None:
+            for _ in range(min(index - state.last_closed - 1, MAX_GAP_FOLD)):
+                self._fold(state, 0)
+        z = self._zscore(state, count)
+        if self._is_spike(state, count, z):
+            state.events.append({
+                "bucket": bucket_label(index, self.bucket), "count": count,
+                "expected": round(state.mean, 3), "zscore": round(z, 2),
+            })
+            del state.events[:-MAX_EVENTS]
+        self._fold(state, count)
+        state.last_closed = index
+
+    # ------- Updates --------
+    def observe(self, category, timestamp):
+        """Counts one incident; returns its bucket's Spike if that bucket is currently spiking."""
+        index = bucket_index(timestamp, self.bucket)
+        if index is None or not category:
+            return None
+        with self._lock:
+            state = self.states.get(category)
+            if state is None:
+                state = self.states[category] = CategoryState()
+            self._dirty.add(category)
+
+            if state.last_closed is not None and index <= state.last_closed:
+                state.late += 1
+                return None
+            state.open[index] = state.open.get(index, 0) + 1
+
+            newest = max(state.open)
+            for closing in sorted(b for b in state.open if b < newest - self.lateness):
+                self._close(state, closing, state.open.pop(closing))
+
+            count = state.open.get(index)
+            if count is None:
+                return None
+            z = self._zscore(state, count)
+            if self._is_spike(state, count, z):
+                return Spike(category, bucket_label(index, self.bucket), count, state.mean, z)
+            return None
+
+    def rebuild(self, rows):
+        """Replays (category, timestamp) rows, oldest first, into empty state."""
+        with self._lock:
+            self.states.clear()
+            for category, timestamp in rows:
+                self.observe(category, timestamp)
+            self._dirty = set(self.states)
+            self._replace_all = True
+
+    # ------- Queries --------
+    def _expired(self, index, now):
+        """True if open bucket `index` is older than the lateness window at wall-clock `now`."""
+        current = bucket_index((now or datetime.now()).isoformat(sep=" "), self.bucket)
+        return index < current - self.lateness
+
+    def _open_spikes(self, now, expired):
+        spikes = []
+        for category, state in self.states.items():
+            for index, count in state.open.items():
+                if self._expired(index, now) != expired:
+                    continue
+                z = self._zscore(state, count)
+                if self._is_spike(state, count, z):
+                    spikes.append(Spike(category, bucket_label(index, self.bucket), count, state.mean, z))
+        return spikes
+
+    def active_spikes(self, now=None):
+        """Spikes in each category's unexpired open buckets, highest z-score first."""
+        with self._lock:
+            spikes = self._open_spikes(now, expired=False)
+        return sorted(spikes, key=lambda s: s.zscore, reverse=True)
+
+    def recent_events(self, limit=20, now=None):
+        """Past spikes (closed or expired buckets) across categories, newest bucket first."""
+        with self._lock:
+            events = [dict(e, category=c) for c, s in self.states.items() for e in s.events]
+            events += [
+                {"bucket": s.bucket, "count": s.count, "expected": round(s.expected, 3),
+                 "zscore": round(s.zscore, 2), "category": s.category}
+                for s in self._open_spikes(now, expired=True)
+            ]
+        return sorted(events, key=lambda e: e["bucket"], reverse=True)[:limit]
+
+    # ------- Persistence (inside the caller's transaction) --------
+    def create_table(self, conn):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+                category TEXT PRIMARY KEY,
+                bucket TEXT NOT NULL,
+                state TEXT NOT NULL,
+                updated_at TEXT
+            )
+        """)
+
+    def load(self, conn, categories=None):
+        """
+        Loads saved state, only for `categories` if given (the others are
+        left as they are). Returns False if no state was saved for this
+        bucket size.
+        """
+        self.create_table(conn)
+        if categories is None:
+            rows = conn.execute(f"SELECT category, bucket, state FROM {STATE_TABLE}").fetchall()
+        else:
+            categories = list(set(categories))
+            rows = []
+            for i in range(0, len(categories), 500):
+                chunk = categories[i:i + 500]
+                rows += conn.execute(
+                    f"SELECT category, bucket, state FROM {STATE_TABLE} "
+                    f"WHERE category IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+        loaded = {c: CategoryState.from_dict(json.loads(s)) for c, b, s in rows if b == self.bucket}
+        with self._lock:
+            if categories is None:
+                self.states = loaded
+                self._dirty.clear()
+            else:
+                for category in categories:
+                    self.states.pop(category, None)
+                    self._dirty.discard(category)
+                self.states.update(loaded)
+            return bool(loaded) and len(loaded) == len(rows)
+
+    def save(self, conn):
+        """Writes the categories changed since the last save (one row each)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            now = datetime.now().isoformat(timespec="seconds")
+            if self._replace_all:
+                conn.execute(f"DELETE FROM {STATE_TABLE}")
+                self._replace_all = False
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {STATE_TABLE} (category, bucket, state, updated_at) VALUES (?, ?, ?, ?)",
+                [(c, self.bucket, json.dumps(self.states[c].to_dict()), now) for c in self._dirty],
+            )
+            self._dirty.clear()
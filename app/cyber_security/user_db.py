@@ -1,13 +1,19 @@
 import sqlite3
 import os
-from app.auth import hash_password, verify_password, validate_username, validate_password
+from app.auth import (
+    submit_hash,
+    submit_verify,
+    needs_rehash,
+    validate_username,
+    validate_password,
+)
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DB_FILE = os.path.join(BASE_DIR, "data", "USER_DATABASE.db")
 
-# Ensure the data folder exists
-os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
+# Set once the users table is known to exist for the current DB_FILE
+_table_ready_for = None
 
 # --- DB Connection ---
 def connect_db():
@@ -16,6 +22,8 @@ def connect_db():
 # --- Users Table ---
 def create_users_table():
     """Creates the users table if it doesn't exist."""
+    global _table_ready_for
+    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
     conn = connect_db()
     cur = conn.cursor()
     cur.execute('''
@@ -26,9 +34,12 @@ def create_users_table():
     ''')
     conn.commit()
     conn.close()
+    _table_ready_for = DB_FILE
 
-# Ensure table exists on import
-create_users_table()
+def _ensure_users_table():
+    """Creates the users table on first use instead of at import time."""
+    if _table_ready_for != DB_FILE:
+        create_users_table()
 
 # --- Register User ---
 def register_user(username: str, password: str) -> dict:
@@ -40,6 +51,7 @@ def register_user(username: str, password: str) -> dict:
     if not ok:
         return {"success": False, "message": msg}
 
+    _ensure_users_table()
     conn = connect_db()
     cur = conn.cursor()
     cur.execute("SELECT * FROM users WHERE username = ?", (username,))
@@ -47,7 +59,7 @@ def register_user(username: str, password: str) -> dict:
         conn.close()
         return {"success": False, "message": "Username entered already exists."}
 
-    hashed = hash_password(password)
+    hashed = submit_hash(password).result()
     cur.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, hashed))
     conn.commit()
     conn.close()
@@ -56,6 +68,7 @@ def register_user(username: str, password: str) -> dict:
 
 # --- Authenticate User ---
 def authenticate_user(username: str, password: str) -> bool:
+    _ensure_users_table()
     conn = connect_db()
     cur = conn.cursor()
     cur.execute("SELECT password_hash FROM users WHERE username = ?", (username,))
@@ -66,7 +79,28 @@ def authenticate_user(username: str, password: str) -> bool:
         return False
 
     stored_hash = row[0]
-    return verify_password(password, stored_hash)
+    if not submit_verify(password, stored_hash).result():
+        return False
+
+    # Upgrade hashes made with an older cost while we still have the plain password
+    if needs_rehash(stored_hash):
+        rehash_user_password(username, password, stored_hash)
+    return True
+
+# --- Rehash Stored Password ---
+def rehash_user_password(username: str, password: str, old_hash: str) -> bool:
+    """Replaces old_hash with a hash at the configured cost, unless it changed meanwhile."""
+    new_hash = submit_hash(password).result()
+    conn = connect_db()
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE users SET password_hash = ? WHERE username = ? AND password_hash = ?",
+        (new_hash, username, old_hash)
+    )
+    conn.commit()
+    updated = cur.rowcount == 1
+    conn.close()
+    return updated
 
 # --- Helper to get DB path ---
 def getDBPath():
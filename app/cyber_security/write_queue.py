@@ -0,0 +1,161 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from app.services.metrics import incr, observe
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Configuration
+# -------------------------
+# WRITE_QUEUE=0 makes the insert/update/delete wrappers write directly
+# (one transaction per call) instead of through the group-commit writer.
+WRITE_QUEUE = os.environ.get("WRITE_QUEUE", "1") != "0"
+# Most operations committed in one transaction
+MAX_BATCH = int(os.environ.get("WRITE_MAX_BATCH", "256"))
+# Longest the writer waits for more operations after the first one arrives.
+# 0 still batches everything queued while the previous commit was running,
+# without delaying a lone writer; a few ms helps when fsync is very cheap.
+MAX_DELAY = float(os.environ.get("WRITE_MAX_DELAY_MS", "0")) / 1000
+# The writer thread exits (closing its connection) after this long with no writes
+IDLE_TIMEOUT = 30.0
+
+
+class _Op:
+    __slots__ = ("kind", "args", "future")
+
+    def __init__(self, kind, args):
+        self.kind = kind
+        self.args = args
+        self.future = Future()
+
+
+class GroupCommitWriter:
+    """
+    Single writer thread in front of a CyberIncidentDB. Operations submitted
+    from any session are queued; the thread takes the first one, keeps
+    collecting until max_batch ops are queued or max_delay has passed, and
+    commits them all in one transaction (CyberIncidentDB.commit_batch), so
+    one fsync is shared by the whole batch. Each op's Future resolves once
+    that transaction has committed, with the same value the direct method
+    returns, or with the op's exception (other ops in the batch still commit).
+    """
+
+    def __init__(self, db, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+        self.db = db
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0.0, max_delay)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.batches = 0
+        self.ops = 0
+        self.largest_batch = 0
+
+    # ------- Submitting --------
+    def submit(self, kind, *args):
+        """Queues one write ('insert', 'update_status' or 'delete'); returns its Future."""
+        op = _Op(kind, args)
+        # Under the lock, so an idle thread cannot exit between this put and its last check
+        with self._lock:
+            self._queue.put(op)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cyber-db-writer", daemon=True)
+                self._thread.start()
+        return op.future
+
+    def insert(self, row):
+        return self.submit("insert", row)
+
+    def update_status(self, incident_id, new_status):
+        return self.submit("update_status", incident_id, new_status)
+
+    def delete(self, incident_id):
+        return self.submit("delete", incident_id)
+
+    # ------- Writer thread --------
+    def _next_batch(self):
+        """Blocks for the first op, then gathers more until max_batch or max_delay; None when idle."""
+        try:
+            first = self._queue.get(timeout=IDLE_TIMEOUT)
+        except queue.Empty:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        conn = None
+        batch = []
+        try:
+            # Autocommit mode: commit_batch issues BEGIN IMMEDIATE / COMMIT itself
+            conn = sqlite3.connect(self.db.db_path, isolation_level=None, timeout=30)
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    with self._lock:
+                        if self._queue.empty():
+                            self._thread = None
+                            return
+                    continue
+                self._commit(conn, batch)
+                batch = []
+        except BaseException as e:
+            # e.g. the DB cannot be opened: fail everything waiting, and let the next submit start a new thread
+            incr("cyber_db.group_commit.errors")
+            logger.exception("Incident writer thread failed")
+            with self._lock:
+                self._thread = None
+                pending = batch + self._drain()
+            for op in pending:
+                if not op.future.done():
+                    op.future.set_exception(e)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _drain(self):
+        ops = []
+        while True:
+            try:
+                ops.append(self._queue.get_nowait())
+            except queue.Empty:
+                return ops
+
+    def _commit(self, conn, batch):
+        start = time.perf_counter()
+        try:
+            outcomes = self.db.commit_batch(conn, [(op.kind, op.args) for op in batch])
+        except Exception as e:
+            # Nothing in the batch was committed
+            incr("cyber_db.group_commit.errors")
+            for op in batch:
+                op.future.set_exception(e)
+            return
+
+        observe("cyber_db.group_commit", time.perf_counter() - start)
+        incr("cyber_db.group_commit.ops", len(batch))
+        self.batches += 1
+        self.ops += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for op, (ok, result) in zip(batch, outcomes):
+            if ok:
+                op.future.set_result(result)
+            else:
+                op.future.set_exception(result)
+
+    # ------- Stats --------
+    @property
+    def mean_batch(self):
+        return self.ops / self.batches if self.batches else 0.0
@@ -1,18 +1,21 @@
 import os
 import pandas as pd
 
+from app.cyber_security import dashboard_utils
+from app.services.metrics import timed
+
 # ===========================================
 # Load Dataset Metadata CSV
 # ===========================================
 
+@timed("datasets.load_datasets_csv")
 def load_datasets_csv():
     """
     Loads datasets_metadata.csv from the /app/data/ directory.
     Returns a DataFrame (empty if file is missing).
     """
 
-    ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
-    csv_path = os.path.join(ROOT_DIR, "data", "datasets_metadata.csv")
+    csv_path = dashboard_utils.DATASETS_CSV
 
     try:
         if os.path.exists(csv_path):
@@ -40,6 +43,7 @@ def load_datasets_csv():
 # Dataset Resource Consumption Analysis
 # ===========================================
 
+@timed("datasets.dataset_resource_analysis")
 def dataset_resource_analysis(df):
     """
     Calculates resource consumption:
@@ -71,6 +75,7 @@ def dataset_resource_analysis(df):
 # Dataset Source Dependency Analysis
 # ===========================================
 
+@timed("datasets.dataset_source_dependency")
 def dataset_source_dependency(df):
     """
     Groups datasets by uploader (department/team).
@@ -107,6 +112,7 @@ def dataset_source_dependency(df):
 # Governance & Archiving Recommendations
 # ===========================================
 
+@timed("datasets.dataset_governance_recommendations")
 def dataset_governance_recommendations(df):
     """
     Returns a list of governance recommendations.
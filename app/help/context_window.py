@@ -0,0 +1,118 @@
+import os
+from collections import deque
+
+# -------------------------
+# Defaults
+# -------------------------
+DEFAULT_TOKEN_BUDGET = int(os.environ.get("HELP_TOKEN_BUDGET", "4000"))
+# Share of the budget reserved for the rolling summary of older turns
+SUMMARY_SHARE = 0.25
+# Characters of each folded turn kept in the summary
+SUMMARY_CHARS_PER_TURN = 160
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def _format(msg) -> str:
+    return f"{msg['role'].upper()}: {msg['content']}"
+
+
+class ContextWindow:
+    """
+    Assembles the prompt for one chat session under a token budget:
+    system prompt(s) + rolling summary of older turns + a sliding window of
+    recent turns. The summary is extended incrementally, so each turn only
+    folds the messages that just slid out of the window.
+    Keep one instance per session (e.g. in st.session_state).
+    """
+
+    def __init__(self, token_budget=DEFAULT_TOKEN_BUDGET, min_recent_messages=2,
+                 summary_chars_per_turn=SUMMARY_CHARS_PER_TURN):
+        self.token_budget = token_budget
+        self.min_recent_messages = min_recent_messages
+        self.summary_chars_per_turn = summary_chars_per_turn
+        self.summary_budget = int(token_budget * SUMMARY_SHARE)
+
+        self._summary_lines = deque()
+        self._summary_tokens = 0
+        self._folded = 0           # conversation messages already folded
+        self._folded_tail = None   # last folded message, to detect a different history
+
+    # ------- Rolling summary --------
+    def _reset_summary(self):
+        self._summary_lines.clear()
+        self._summary_tokens = 0
+        self._folded = 0
+        self._folded_tail = None
+
+    def _fold(self, convo, upto):
+        # A shorter or different history means the cached summary no longer applies
+        if self._folded > upto or (self._folded and convo[self._folded - 1] != self._folded_tail):
+            self._reset_summary()
+
+        for msg in convo[self._folded:upto]:
+            text = " ".join(msg["content"].split())
+            if len(text) > self.summary_chars_per_turn:
+                text = text[:self.summary_chars_per_turn].rstrip() + "..."
+            line = f"- {msg['role']}: {text}"
+            self._summary_lines.append(line)
+            self._summary_tokens += estimate_tokens(line)
+
+        # Oldest summary lines fall off once the summary is over its share
+        while self._summary_lines and self._summary_tokens > self.summary_budget:
+            self._summary_tokens -= estimate_tokens(self._summary_lines.popleft())
+
+        self._folded = upto
+        self._folded_tail = convo[upto - 1] if upto else None
+
+    @property
+    def summary(self) -> str:
+        return "\n".join(self._summary_lines)
+
+    # ------- Prompt assembly --------
+    def build_prompt(self, messages) -> str:
+        system = [m for m in messages if m["role"] == "system"]
+        convo = [m for m in messages if m["role"] != "system"]
+
+        parts = [_format(m) for m in system]
+        remaining = self.token_budget - sum(estimate_tokens(p) for p in parts) - self.summary_budget
+
+        # Walk back from the newest turn until the window budget is spent
+        recent = []
+        split = len(convo)
+        for msg in reversed(convo):
+            line = _format(msg)
+            cost = estimate_tokens(line)
+            if cost > remaining and len(recent) >= self.min_recent_messages:
+                break
+            recent.append(line)
+            remaining -= cost
+            split -= 1
+
+        self._fold(convo, split)
+        if self._summary_lines:
+            parts.append("SUMMARY OF EARLIER CONVERSATION:")
+            parts.extend(self._summary_lines)
+
+        parts.extend(reversed(recent))
+        parts.append("ASSISTANT:")
+        return "\n".join(parts)
+
+    # ------- Session memory bound --------
+    def trim_history(self, messages, max_messages: int) -> int:
+        """
+        Drops already-summarized messages from the front of the stored history
+        (in place) so it holds at most max_messages conversation entries.
+        System messages are always kept. Returns the number removed.
+        """
+        convo_idx = [i for i, m in enumerate(messages) if m["role"] != "system"]
+        excess = min(len(convo_idx) - max_messages, self._folded)
+        if excess <= 0:
+            return 0
+        for i in reversed(convo_idx[:excess]):
+            del messages[i]
+        self._folded -= excess
+        return excess
@@ -1,37 +1,181 @@
+import logging
+import os
+import time
+
 import streamlit as st
-from google import genai
+
+from app.help.context_window import ContextWindow
+from app.help.request_layer import ResilientClient
+from app.help.response_cache import ResponseCache, make_cache_key
+from app.help.retrieval import get_retriever
+from app.help.stub_client import StubClient
+from app.services.metrics import timed, observe, incr
+
+logger = logging.getLogger(__name__)
 
 # -------------------------
 # Gemini API Client Setup
 # -------------------------
-API_KEY = st.secrets["GEMINI"]["API_KEY"]
-client = genai.Client(api_key=API_KEY)
+# HELP_BACKEND=stub swaps in the offline StubClient (tests, benchmarks, no network).
+HELP_BACKEND = os.environ.get("HELP_BACKEND", "gemini")
 MODEL_NAME = "gemini-2.5-flash"
 
+client = None   # built on first use by get_client(); assign to inject another backend
+
+
+def get_client():
+    """
+    Returns the shared client, reading secrets and importing genai only when
+    first needed. Calls go through ResilientClient (deadlines, retries,
+    concurrency cap, coalescing of identical in-flight prompts).
+    """
+    global client
+    if client is None:
+        if HELP_BACKEND == "stub":
+            backend = StubClient()
+        else:
+            from google import genai
+            backend = genai.Client(api_key=st.secrets["GEMINI"]["API_KEY"])
+        client = ResilientClient(backend)
+    return client
+
+
+# Shared across sessions on this worker: memory LRU + on-disk TTL store
+response_cache = ResponseCache()
+
+# Conversation entries kept in session state; older ones live on in the summary
+MAX_STORED_MESSAGES = 60
+
+# Ground replies in live incidents/tickets/datasets (HELP_GROUNDING=0 disables)
+GROUNDING = os.environ.get("HELP_GROUNDING", "1") != "0"
+
+# -------------------------
+# Helper: Ground the prompt in dashboard data
+# -------------------------
+def ground_messages(messages, retriever=None):
+    """
+    Inserts the dashboard rows most relevant to the latest user question as a
+    system message (size-capped by the retriever).
+    retriever=None uses the shared index when GROUNDING is on; False disables.
+    Returns (messages, grounding_text).
+    """
+    if retriever is False or (retriever is None and not GROUNDING):
+        return messages, ""
+    question = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    if not question:
+        return messages, ""
+
+    try:
+        grounding = (retriever or get_retriever()).context_for(question)
+    except Exception:
+        # The reply is still useful ungrounded, so carry on without the context
+        logger.exception("Error retrieving dashboard context")
+        return messages, ""
+    if not grounding:
+        return messages, ""
+
+    split = 0
+    while split < len(messages) and messages[split]["role"] == "system":
+        split += 1
+    grounded = messages[:split] + [{"role": "system", "content": grounding}] + messages[split:]
+    return grounded, grounding
+
 # -------------------------
 # Helper: Generate response from Gemini
 # -------------------------
-def generate_gemini_response(messages, model=MODEL_NAME):
+@timed("help.generate_gemini_response")
+def generate_gemini_response(messages, model=MODEL_NAME, llm_client=None, cache=None, context=None,
+                             retriever=None):
     """
     messages: list of dicts with 'role' and 'content'
-    Converts chat history to a single text prompt for Gemini 2.5 API
+    Converts chat history to a single text prompt for Gemini 2.5 API.
+    llm_client/cache default to the module-level client and response cache;
+    pass cache=False to bypass caching.
+    context: the session's ContextWindow (token budget + rolling summary).
+    retriever: see ground_messages.
     """
-    # Combine all messages into a single string
-    prompt = ""
-    for msg in messages:
-        role = msg["role"]
-        content = msg["content"]
-        prompt += f"{role.upper()}: {content}\n"
-    prompt += "ASSISTANT:"
+    llm_client = llm_client or get_client()
+    cache = response_cache if cache is None else cache
+    messages, grounding = ground_messages(messages, retriever)
+
+    key = None
+    if cache:
+        key = make_cache_key(messages, model, extra=grounding)
+        cached = cache.get(key)
+        if cached is not None:
+            incr("help.cache_hits")
+            return cached
 
     # Generate response
-    response = client.models.generate_content(
+    response = llm_client.models.generate_content(
         model=model,
-        contents=prompt  # use contents, not messages
+        contents=build_prompt(messages, context)  # use contents, not messages
     )
 
+    if cache and response.text:
+        cache.set(key, response.text)
     return response.text
 
+# -------------------------
+# Helper: Prompt from chat history
+# -------------------------
+def build_prompt(messages, context=None):
+    """
+    Combines the chat history into a single text prompt, keeping it within the
+    ContextWindow's token budget (a fresh window is used if none is given).
+    """
+    return (context or ContextWindow()).build_prompt(messages)
+
+# -------------------------
+# Helper: Stream response from Gemini
+# -------------------------
+def stream_gemini_response(messages, model=MODEL_NAME, llm_client=None, cache=None, context=None,
+                           retriever=None, on_first_chunk=None):
+    """
+    Generator version of generate_gemini_response: yields text chunks as they
+    arrive. The full reply is cached once the stream completes.
+    on_first_chunk(ms) is called with the time-to-first-token. Cache hits are
+    timed as help.cache_hit_latency, not as time-to-first-token samples.
+    """
+    llm_client = llm_client or get_client()
+    cache = response_cache if cache is None else cache
+    start = time.perf_counter()
+    messages, grounding = ground_messages(messages, retriever)
+
+    def first_chunk(metric="help.time_to_first_token"):
+        ttft_ms = (time.perf_counter() - start) * 1000
+        observe(metric, ttft_ms / 1000)
+        if on_first_chunk:
+            on_first_chunk(ttft_ms)
+
+    key = None
+    if cache:
+        key = make_cache_key(messages, model, extra=grounding)
+        cached = cache.get(key)
+        if cached is not None:
+            incr("help.cache_hits")
+            first_chunk("help.cache_hit_latency")
+            yield cached
+            return
+
+    parts = []
+    stream = llm_client.models.generate_content_stream(
+        model=model,
+        contents=build_prompt(messages, context)
+    )
+    for chunk in stream:
+        text = chunk.text
+        if not text:
+            continue
+        if not parts:
+            first_chunk()
+        parts.append(text)
+        yield text
+
+    observe("help.stream_gemini_response", time.perf_counter() - start)
+    if cache and parts:
+        cache.set(key, "".join(parts))
+
 # -------------------------
 # Streamlit Page
 # -------------------------
@@ -50,6 +194,8 @@ def show_need_help_page():
                 )
             }
         ]
+    if "help_context" not in st.session_state:
+        st.session_state.help_context = ContextWindow()
 
     # Display chat history (skip system message)
     for msg in st.session_state.help_messages:
@@ -67,13 +213,25 @@ def show_need_help_page():
         # Save user message
         st.session_state.help_messages.append({"role": "user", "content": prompt})
 
-        # Generate AI response
-        with st.spinner("Generating AI response..."):
-            reply_text = generate_gemini_response(st.session_state.help_messages)
-
-        # Display assistant response
+        # Stream AI response into the assistant message as it arrives
         with st.chat_message("assistant"):
-            st.markdown(reply_text)
+            try:
+                reply_text = st.write_stream(
+                    stream_gemini_response(
+                        st.session_state.help_messages,
+                        context=st.session_state.help_context,
+                        on_first_chunk=lambda ms: st.session_state.update(help_last_ttft_ms=ms),
+                    )
+                )
+            except Exception:
+                logger.exception("AI assistant request failed")
+                # Drop the unanswered question so it can simply be asked again
+                st.session_state.help_messages.pop()
+                st.error("The AI assistant is unavailable right now. Please try again.")
+                return
+            if "help_last_ttft_ms" in st.session_state:
+                st.caption(f"First token in {st.session_state.help_last_ttft_ms:.0f} ms")
 
         # Save assistant response
         st.session_state.help_messages.append({"role": "assistant", "content": reply_text})
+        st.session_state.help_context.trim_history(st.session_state.help_messages, MAX_STORED_MESSAGES)
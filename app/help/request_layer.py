@@ -0,0 +1,313 @@
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+# -------------------------
+# Defaults (overridable via environment)
+# -------------------------
+DEFAULT_TIMEOUT = float(os.environ.get("HELP_TIMEOUT", "30"))          # per attempt, seconds
+DEFAULT_TOTAL_TIMEOUT = float(os.environ.get("HELP_TOTAL_TIMEOUT", "60"))
+DEFAULT_RETRIES = int(os.environ.get("HELP_RETRIES", "3"))
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("HELP_MAX_CONCURRENCY", "4"))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+_STREAM_DONE = object()
+
+
+class UpstreamTimeout(Exception):
+    """Raised when the model call does not finish within its deadline."""
+
+
+# Transport-level failures worth retrying; the HTTP client libraries are optional
+_TRANSIENT_ERRORS = [UpstreamTimeout, TimeoutError, ConnectionError]
+try:
+    import httpx
+    _TRANSIENT_ERRORS.append(httpx.TransportError)
+except ImportError:
+    pass
+try:
+    import requests
+    _TRANSIENT_ERRORS += [requests.ConnectionError, requests.Timeout]
+except ImportError:
+    pass
+_TRANSIENT_ERRORS = tuple(_TRANSIENT_ERRORS)
+
+
+def is_retryable(exc) -> bool:
+    """
+    Timeouts, connection errors, rate limits (429) and server errors (5xx)
+    are retried. Other status codes (4xx) and everything else, e.g. a
+    TypeError from a bad call, are not.
+    """
+    if isinstance(exc, _TRANSIENT_ERRORS):
+        return True
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if isinstance(code, int):
+        return code in (408, 429) or code >= 500
+    return False
+
+
+class _SharedStream:
+    """
+    Chunks of one upstream stream, replayed to every subscriber. A
+    subscriber that joins late first gets the chunks already received.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self._cond = threading.Condition()
+
+    def publish(self, chunk):
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.done = True
+            self.error = error
+            self._cond.notify_all()
+
+    def subscribe(self, timeout, deadline):
+        """Yields every chunk; each wait for the next one is bounded by timeout and the deadline."""
+        i = 0
+        while True:
+            with self._cond:
+                wait = min(timeout, max(0.0, deadline - time.monotonic()))
+                if not self._cond.wait_for(lambda: i < len(self.chunks) or self.done, wait):
+                    raise UpstreamTimeout(f"No model output for {wait:.1f}s.")
+                fresh = self.chunks[i:]
+                done, error = self.done, self.error
+            for chunk in fresh:
+                i += 1
+                yield chunk
+            if done and not fresh:
+                if error is not None:
+                    raise error
+                return
+
+
+class _ResilientModels:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def generate_content(self, model, contents, **kwargs):
+        return self._owner.generate_content(model, contents, **kwargs)
+
+    def generate_content_stream(self, model, contents, **kwargs):
+        return self._owner.generate_content_stream(model, contents, **kwargs)
+
+
+class ResilientClient:
+    """
+    Wraps a genai-style client (client.models.generate_content /
+    generate_content_stream) with:
+    - a deadline per attempt and for the whole call,
+    - exponential backoff with full jitter between retries,
+    - a global cap on in-flight upstream calls,
+    - single-flight coalescing: identical prompts already in flight share
+      one upstream call instead of each making their own (for streams, the
+      chunks are fanned out to every caller).
+    Exposes the same .models surface, so it is a drop-in replacement.
+    """
+
+    def __init__(self, client, timeout=DEFAULT_TIMEOUT, total_timeout=DEFAULT_TOTAL_TIMEOUT,
+                 retries=DEFAULT_RETRIES, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, rng=None):
+        self.client = client
+        self.timeout = timeout
+        self.total_timeout = total_timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.models = _ResilientModels(self)
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._inflight = {}   # (model, contents) -> Future
+        self._inflight_streams = {}   # (model, contents) -> _SharedStream
+        self._lock = threading.Lock()
+        self._rng = rng or random.Random()
+
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.retried = 0
+        self.timeouts = 0
+
+    # ------- Helpers --------
+    def _backoff(self, attempt, deadline):
+        delay = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        delay = min(delay, max(0.0, deadline - time.monotonic()))
+        if delay:
+            time.sleep(delay)
+
+    def _acquire_slot(self, deadline):
+        if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise UpstreamTimeout("Timed out waiting for a free model request slot.")
+
+    def _attempt(self, model, contents, kwargs, deadline):
+        """One upstream call, bounded by the per-attempt timeout and the overall deadline."""
+        self._acquire_slot(deadline)
+        with self._lock:
+            self.upstream_calls += 1
+        try:
+            future = self._executor.submit(self.client.models.generate_content, model=model, contents=contents,
+                                           **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the upstream call really finishes, even if we stop waiting
+        future.add_done_callback(lambda _: self._slots.release())
+        wait = min(self.timeout, max(0.0, deadline - time.monotonic()))
+        try:
+            return future.result(timeout=wait)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            raise UpstreamTimeout(f"Model call exceeded {wait:.1f}s.") from None
+
+    def _call_with_retries(self, model, contents, kwargs, deadline):
+        attempt = 0
+        while True:
+            try:
+                return self._attempt(model, contents, kwargs, deadline)
+            except Exception as exc:
+                if attempt >= self.retries or not is_retryable(exc) or time.monotonic() >= deadline:
+                    raise
+                with self._lock:
+                    self.retried += 1
+                self._backoff(attempt, deadline)
+                attempt += 1
+
+    # ------- Public API --------
+    def generate_content(self, model, contents, **kwargs):
+        deadline = time.monotonic() + self.total_timeout
+        key = (model, contents)
+
+        with self._lock:
+            shared = self._inflight.get(key)
+            if shared is None:
+                shared = self._inflight[key] = Future()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            try:
+                return shared.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                raise UpstreamTimeout("Timed out waiting for an identical in-flight request.") from None
+
+        try:
+            result = self._call_with_retries(model, contents, kwargs, deadline)
+        except BaseException as exc:
+            shared.set_exception(exc)
+            raise
+        else:
+            shared.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def generate_content_stream(self, model, contents, **kwargs):
+        """
+        Streams chunks through a producer thread so each wait (first chunk
+        and between chunks) is bounded by the per-attempt timeout. Failures
+        are retried only until the first chunk has been received.
+        Identical streams already in flight are shared: one upstream stream
+        runs on a pump thread (to completion, even if callers stop reading)
+        and every caller iterates the same chunks.
+        """
+        deadline = time.monotonic() + self.total_timeout
+        key = (model, contents)
+        with self._lock:
+            shared = self._inflight_streams.get(key)
+            if shared is None:
+                shared = self._inflight_streams[key] = _SharedStream()
+                threading.Thread(
+                    target=self._pump, args=(key, shared, model, contents, kwargs, deadline),
+                    name="llm-stream", daemon=True,
+                ).start()
+            else:
+                self.coalesced += 1
+        return shared.subscribe(self.timeout, deadline)
+
+    def _pump(self, key, shared, model, contents, kwargs, deadline):
+        error = None
+        try:
+            for chunk in self._stream_with_retries(model, contents, kwargs, deadline):
+                shared.publish(chunk)
+        except Exception as exc:
+            error = exc
+        finally:
+            # Later identical prompts start a fresh stream
+            with self._lock:
+                self._inflight_streams.pop(key, None)
+            shared.finish(error)
+
+    def _stream_with_retries(self, model, contents, kwargs, deadline):
+        attempt = 0
+        while True:
+            delivered = False
+            try:
+                for chunk in self._stream_once(model, contents, kwargs, deadline):
+                    delivered = True
+                    yield chunk
+                return
+            except Exception as exc:
+                if (delivered or attempt >= self.retries or not is_retryable(exc)
+                        or time.monotonic() >= deadline):
+                    raise
+                with self._lock:
+                    self.retried += 1
+                self._backoff(attempt, deadline)
+                attempt += 1
+
+    def _stream_once(self, model, contents, kwargs, deadline):
+        self._acquire_slot(deadline)
+        with self._lock:
+            self.upstream_calls += 1
+        chunks = queue.Queue()
+        cancelled = threading.Event()
+
+        def produce():
+            try:
+                for chunk in self.client.models.generate_content_stream(model=model, contents=contents, **kwargs):
+                    if cancelled.is_set():
+                        break
+                    chunks.put(chunk)
+                chunks.put(_STREAM_DONE)
+            except Exception as exc:
+                chunks.put(exc)
+            finally:
+                self._slots.release()
+
+        try:
+            self._executor.submit(produce)
+        except BaseException:
+            self._slots.release()
+            raise
+        try:
+            while True:
+                wait = min(self.timeout, max(0.0, deadline - time.monotonic()))
+                try:
+                    item = chunks.get(timeout=wait)
+                except queue.Empty:
+                    with self._lock:
+                        self.timeouts += 1
+                    raise UpstreamTimeout(f"No model output for {wait:.1f}s.") from None
+                if item is _STREAM_DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
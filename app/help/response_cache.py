@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# -------------------------
+# Cache Location / Defaults
+# -------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+CACHE_DB_FILE = os.path.join(BASE_DIR, "data", "HELP_CACHE.db")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 512
+# Number of trailing non-system messages that make up the cache key
+DEFAULT_TAIL_MESSAGES = 3
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercases, collapses whitespace and drops trailing punctuation."""
+    return _WS.sub(" ", text.strip().lower()).rstrip(" ?!.")
+
+
+def make_cache_key(messages, model: str, tail: int = DEFAULT_TAIL_MESSAGES, extra: str = "") -> str:
+    """
+    Key on the model name plus the normalized conversation tail, so that a
+    repeated FAQ-style question hits regardless of session.
+    extra: anything else the reply depends on (e.g. retrieved grounding rows).
+    """
+    convo = [m for m in messages if m["role"] != "system"][-tail:]
+    payload = json.dumps(
+        [model, extra] + [[m["role"], normalize_text(m["content"])] for m in convo],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-level cache for assistant replies:
+    an in-memory LRU in front of a SQLite table with per-entry TTL.
+    Pass db_path=None for a memory-only cache.
+    """
+
+    def __init__(self, db_path=CACHE_DB_FILE, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()   # key -> (expires_at, text)
+        self._lock = threading.Lock()
+        self._table_ready = False
+        self.hits = 0
+        self.misses = 0
+
+    # ------- Internal connection helper --------
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        if not self._table_ready:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS help_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+            conn.commit()
+            self._table_ready = True
+        return conn
+
+    def _remember(self, key, expires_at, text):
+        self._memory[key] = (expires_at, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # ------- Public API --------
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+        if self.db_path:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT response, expires_at FROM help_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] <= now:
+                conn.execute("DELETE FROM help_cache WHERE key = ?", (key,))
+                conn.commit()
+                row = None
+            conn.close()
+            if row:
+                with self._lock:
+                    self._remember(key, row[1], row[0])
+                    self.hits += 1
+                return row[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, text):
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at, text)
+        if self.db_path:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO help_cache (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, text, expires_at)
+            )
+            conn.commit()
+            conn.close()
+
+    def purge_expired(self):
+        """Drops expired rows from disk."""
+        if self.db_path:
+            conn = self._connect()
+            conn.execute("DELETE FROM help_cache WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+            conn.close()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            conn = self._connect()
+            conn.execute("DELETE FROM help_cache")
+            conn.commit()
+            conn.close()
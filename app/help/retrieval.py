@@ -0,0 +1,376 @@
+import csv
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import traceback
+from collections import Counter
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Data Sources
+# -------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+TICKETS_CSV = os.path.join(BASE_DIR, "data", "it_tickets.csv")
+DATASETS_CSV = os.path.join(BASE_DIR, "data", "datasets_metadata.csv")
+
+# Grounding text injected into the prompt is capped at this many characters
+DEFAULT_CONTEXT_CHARS = 1500
+# Sources are re-checked for changes at most this often (seconds)
+REFRESH_INTERVAL = 5.0
+# Index changes applied per hold of the search lock during a refresh
+APPLY_BATCH = 1000
+
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+# =====================================================
+# BM25 INVERTED INDEX
+# =====================================================
+
+class BM25Index:
+    """
+    Sparse BM25 index with in-place upsert/remove, so changed rows can be
+    re-indexed without rebuilding.
+
+    Documents get integer slots; each term keeps append-only posting lists
+    of (slot, tf) that become cached NumPy weight arrays on first query, so
+    scoring a term is one vectorized pass and top-k is an argpartition.
+    Replaced or removed documents are tombstoned and compacted away once
+    they make up a quarter of the slots.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.slot_of = {}      # doc_id -> slot
+        self.doc_ids = []      # slot -> doc_id (None once removed)
+        self.texts = []        # slot -> text
+        self.lengths = []      # slot -> token count (0 once removed)
+        self.postings = {}     # term -> ([slots], [tfs])
+        self.df = {}           # term -> live documents containing it
+        self.total_len = 0
+        self._frozen = {}      # term -> (slots array, weight array, avg length used)
+        self._lengths_arr = None
+        self._dead_arr = None
+        self._tiebreak_arr = None
+        self._dead = 0
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def has(self, doc_id, text) -> bool:
+        """True if doc_id is indexed with exactly this text."""
+        slot = self.slot_of.get(doc_id)
+        return slot is not None and self.texts[slot] == text
+
+    def upsert(self, doc_id, text) -> bool:
+        """Indexes text under doc_id; returns False if it was already indexed unchanged."""
+        slot = self.slot_of.get(doc_id)
+        if slot is not None:
+            if self.texts[slot] == text:
+                return False
+            self.remove(doc_id)
+
+        terms = Counter(tokenize(text))
+        length = sum(terms.values())
+        slot = len(self.doc_ids)
+        self.slot_of[doc_id] = slot
+        self.doc_ids.append(doc_id)
+        self.texts.append(text)
+        self.lengths.append(length)
+        self.total_len += length
+        self._lengths_arr = None
+        for term, tf in terms.items():
+            plist = self.postings.get(term)
+            if plist is None:
+                plist = self.postings[term] = ([], [])
+            plist[0].append(slot)
+            plist[1].append(tf)
+            self.df[term] = self.df.get(term, 0) + 1
+            self._frozen.pop(term, None)
+        return True
+
+    def remove(self, doc_id):
+        slot = self.slot_of.pop(doc_id, None)
+        if slot is None:
+            return
+        for term in set(tokenize(self.texts[slot])):
+            self.df[term] -= 1
+        self.total_len -= self.lengths[slot]
+        self.doc_ids[slot] = None
+        self.texts[slot] = None
+        self.lengths[slot] = 0
+        self._lengths_arr = None
+        self._dead_arr = None
+        self._dead += 1
+        if self._dead > 1000 and self._dead * 4 > len(self.doc_ids):
+            self._compact()
+
+    def _compact(self):
+        live = [(d, t) for d, t in zip(self.doc_ids, self.texts) if d is not None]
+        self.__init__(self.k1, self.b)
+        for doc_id, text in live:
+            self.upsert(doc_id, text)
+
+    def _weights(self, term, avg_len):
+        """
+        (slots, per-posting BM25 term weight without idf) for term.
+        Cached until the term gets new postings or the average document
+        length drifts by more than 2%.
+        """
+        cached = self._frozen.get(term)
+        if cached is not None and abs(cached[2] - avg_len) <= 0.02 * avg_len:
+            return cached[0], cached[1]
+        if self._lengths_arr is None:
+            self._lengths_arr = np.asarray(self.lengths, dtype=np.float32)
+        slots, tfs = self.postings[term]
+        slots = np.asarray(slots, dtype=np.int64)
+        tfs = np.asarray(tfs, dtype=np.float32)
+        norm = self.k1 * (1 - self.b + self.b * self._lengths_arr[slots] / avg_len)
+        weights = tfs * (self.k1 + 1) / (tfs + norm)
+        self._frozen[term] = (slots, weights, avg_len)
+        return slots, weights
+
+    def search(self, query, k=5):
+        """Returns [(score, doc_id, text)] for the k best matches."""
+        n = len(self.slot_of)
+        terms = [t for t in set(tokenize(query)) if self.df.get(t)]
+        if not n or not terms:
+            return []
+        avg_len = self.total_len / n
+
+        scores = np.zeros(len(self.doc_ids), dtype=np.float64)
+        for term in terms:
+            df = self.df[term]
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            slots, weights = self._weights(term, avg_len)
+            if len(slots) < 4096:
+                np.add.at(scores, slots, weights * idf)
+            else:
+                scores += np.bincount(slots, weights=weights * idf, minlength=len(scores))
+
+        # Tombstoned slots keep their old postings until compaction
+        if self._dead:
+            scores[self._dead_slots()] = 0
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k <= 0:
+            return []
+        # Heavy ties make argpartition degrade; break them in favour of newer rows
+        scores += self._tiebreak(len(scores))
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(float(scores[i]), self.doc_ids[i], self.texts[i]) for i in top]
+
+    def _tiebreak(self, size):
+        if self._tiebreak_arr is None or len(self._tiebreak_arr) < size:
+            self._tiebreak_arr = np.arange(size * 2, dtype=np.float64) * 1e-13
+        return self._tiebreak_arr[:size]
+
+    def _dead_slots(self):
+        if self._dead_arr is None:
+            self._dead_arr = np.flatnonzero(np.asarray(self.lengths) == 0)
+        return self._dead_arr
+
+
+# =====================================================
+# ROW -> DOCUMENT TEXT
+# =====================================================
+
+def _incident_rows(db_path):
+    if not os.path.exists(db_path):
+        return
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.execute(
+            "SELECT incident_id, timestamp, severity, category, status, description FROM cyber_incidents"
+        )
+        while True:
+            batch = cur.fetchmany(5000)
+            if not batch:
+                break
+            for iid, ts, sev, cat, status, desc in batch:
+                yield (
+                    f"incident:{iid}",
+                    f"Cyber incident {iid} | {ts} | severity {sev} | category {cat} | status {status} | {desc}"
+                )
+    except sqlite3.OperationalError:
+        return   # table not created yet
+    finally:
+        conn.close()
+
+
+def _ticket_rows(csv_path):
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield (
+                f"ticket:{row.get('ticket_id')}",
+                f"IT ticket {row.get('ticket_id')} | priority {row.get('priority')} | status {row.get('status')} "
+                f"| assigned to {row.get('assigned_to')} | created {row.get('created_at')} "
+                f"| resolution {row.get('resolution_time_hours')} hours | {row.get('description')}"
+            )
+
+
+def _dataset_rows(csv_path):
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield (
+                f"dataset:{row.get('dataset_id')}",
+                f"Dataset {row.get('name')} (id {row.get('dataset_id')}) | {row.get('rows')} rows "
+                f"x {row.get('columns')} columns | uploaded by {row.get('uploaded_by')} on {row.get('upload_date')}"
+            )
+
+
+# =====================================================
+# DASHBOARD RETRIEVER
+# =====================================================
+
+class DashboardRetriever:
+    """
+    Keeps a BM25 index over incidents, IT tickets and dataset metadata.
+    refresh() re-reads a source only when its file changed, and only
+    re-indexes rows whose text changed (or were removed).
+
+    Prompts never wait for a refresh: context_for() searches the current
+    index and starts a refresh on a background thread when one is due.
+    Reading and diffing the sources happens outside the search lock; the
+    lock is only held while applying APPLY_BATCH changes at a time, so a
+    search waits for at most one batch. (Only the refresh thread mutates
+    the index, which is what makes the unlocked diff safe.)
+    """
+
+    def __init__(self, incidents_db=None, tickets_csv=TICKETS_CSV, datasets_csv=DATASETS_CSV,
+                 refresh_interval=REFRESH_INTERVAL):
+        if incidents_db is None:
+            from app.cyber_security.cyber_incidents import DB_FILE
+            incidents_db = DB_FILE
+        self.sources = {
+            "incident": (incidents_db, _incident_rows),
+            "ticket": (tickets_csv, _ticket_rows),
+            "dataset": (datasets_csv, _dataset_rows),
+        }
+        self.refresh_interval = refresh_interval
+        self.index = BM25Index()
+        self._signatures = {}
+        self._ids = {name: set() for name in self.sources}
+        self._last_check = 0.0
+        self._lock = threading.Lock()           # guards the index (searches and applied changes)
+        self._refresh_lock = threading.Lock()   # one refresh at a time
+        self._thread_lock = threading.Lock()
+        self._thread = None
+        self.last_error = None
+
+    @staticmethod
+    def _signature(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _apply(self, upserts, removals):
+        with self._lock:
+            for doc_id, text in upserts:
+                self.index.upsert(doc_id, text)
+            for doc_id in removals:
+                self.index.remove(doc_id)
+        upserts.clear()
+        removals.clear()
+
+    def refresh(self, force=False) -> int:
+        """Re-indexes changed sources; returns the number of documents added/updated/removed."""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.refresh_interval:
+            return 0
+        changed = 0
+        with self._refresh_lock:
+            self._last_check = now
+            for name, (path, reader) in self.sources.items():
+                sig = self._signature(path)
+                if sig == self._signatures.get(name):
+                    continue
+                seen, upserts, removals = set(), [], []
+                if sig is not None:
+                    for doc_id, text in reader(path):
+                        seen.add(doc_id)
+                        if not self.index.has(doc_id, text):
+                            upserts.append((doc_id, text))
+                            changed += 1
+                            if len(upserts) >= APPLY_BATCH:
+                                self._apply(upserts, removals)
+                removals = list(self._ids[name] - seen)
+                changed += len(removals)
+                for i in range(0, len(removals), APPLY_BATCH):
+                    self._apply(upserts, removals[i:i + APPLY_BATCH])
+                self._apply(upserts, [])
+                self._ids[name] = seen
+                self._signatures[name] = sig
+        return changed
+
+    def refresh_in_background(self):
+        """Starts refresh() on a daemon thread if it is due and none is running."""
+        if time.monotonic() - self._last_check < self.refresh_interval:
+            return
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._background_refresh, name="retriever-refresh", daemon=True)
+            self._thread.start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+            self.last_error = None
+        except Exception:
+            # Keep serving the current index
+            self.last_error = traceback.format_exc()
+            logger.exception("Retriever refresh failed")
+
+    def search(self, query, k=5):
+        with self._lock:
+            return self.index.search(query, k)
+
+    def context_for(self, query, k=8, max_chars=DEFAULT_CONTEXT_CHARS) -> str:
+        """
+        Top-k rows for query formatted as a prompt section, capped at
+        max_chars. Uses the index as it is now (empty until the first
+        background build finishes).
+        """
+        self.refresh_in_background()
+        lines = []
+        used = 0
+        for _, _, text in self.search(query, k):
+            if used + len(text) + 1 > max_chars:
+                break
+            lines.append(text)
+            used += len(text) + 1
+        if not lines:
+            return ""
+        return "RELEVANT DASHBOARD DATA:\n" + "\n".join(lines)
+
+
+_retriever = None
+_retriever_lock = threading.Lock()
+
+
+def get_retriever() -> DashboardRetriever:
+    """Shared retriever for all sessions on this worker; its first build starts in the background."""
+    global _retriever
+    if _retriever is None:
+        with _retriever_lock:
+            if _retriever is None:
+                retriever = DashboardRetriever()
+                retriever.refresh_in_background()
+                _retriever = retriever
+    return _retriever
@@ -0,0 +1,104 @@
+import random
+import threading
+import time
+
+# -------------------------
+# Offline stand-in for genai.Client
+# -------------------------
+# Mirrors the small part of the google-genai surface used by need_help.py
+# (client.models.generate_content / generate_content_stream) so the
+# assistant can run in tests, benchmarks and offline demos.
+
+_CANNED_REPLIES = {
+    "incident": "Open the CRUD menu, choose 'Update Status', enter the incident ID and pick the new status.",
+    "ticket": "The IT Operations page shows ticket KPIs and the staff/status resolution-time charts.",
+    "dataset": "The Data Science page classifies each dataset as Small, Medium or Large by rows x columns.",
+    "login": "Use the Login tab on the home page; new users can create an account from the Register tab.",
+}
+_DEFAULT_REPLY = "I'm the offline assistant. Ask about incidents, tickets, datasets or logging in."
+
+
+class StubUpstreamError(Exception):
+    """Injected failure; .code mimics the HTTP status of a google-genai APIError."""
+
+    def __init__(self, code=503, message="stub upstream unavailable"):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _StubModels:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def generate_content(self, model, contents, **kwargs):
+        self._owner.before_call()
+        text = self._owner.reply_for(contents)
+        if self._owner.chunk_delay:
+            # A blocking call waits for the whole reply to be generated
+            time.sleep(self._owner.chunk_delay * (len(text.split(" ")) - 1))
+        return StubResponse(text)
+
+    def generate_content_stream(self, model, contents, **kwargs):
+        self._owner.before_call()
+        words = self._owner.reply_for(contents).split(" ")
+        for i, word in enumerate(words):
+            if i and self._owner.chunk_delay:
+                time.sleep(self._owner.chunk_delay)
+            yield StubResponse(word if i == 0 else " " + word)
+
+
+class StubClient:
+    """
+    Deterministic local backend.
+    latency: seconds to sleep per call, to simulate the remote round trip
+             (for streaming, the delay before the first chunk).
+    chunk_delay: seconds between streamed chunks.
+    latency_jitter: extra random latency, uniform in [0, latency_jitter].
+    error_rate: probability that a call fails with StubUpstreamError(error_code).
+    hang_rate: probability that a call sleeps for hang_seconds (slow upstream).
+    seed: makes the injected latency/errors reproducible.
+    """
+
+    def __init__(self, latency=0.0, replies=None, chunk_delay=0.0, latency_jitter=0.0,
+                 error_rate=0.0, error_code=503, hang_rate=0.0, hang_seconds=60.0, seed=None):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.replies = dict(_CANNED_REPLIES if replies is None else replies)
+        self.calls = 0
+        self.models = _StubModels(self)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Counts the call and applies injected latency, hangs and errors."""
+        with self._lock:
+            self.calls += 1
+            jitter = self._rng.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0
+            hang = self.hang_rate and self._rng.random() < self.hang_rate
+            fail = self.error_rate and self._rng.random() < self.error_rate
+        delay = self.latency + jitter + (self.hang_seconds if hang else 0.0)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise StubUpstreamError(self.error_code)
+
+    def reply_for(self, contents):
+        # Answer from the last user line of the prompt
+        last_user = ""
+        for line in str(contents).splitlines():
+            if line.startswith("USER:"):
+                last_user = line[5:].lower()
+        for keyword, reply in self.replies.items():
+            if keyword in last_user:
+                return reply
+        return _DEFAULT_REPLY
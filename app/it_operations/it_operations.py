@@ -1,16 +1,27 @@
+import logging
+
 import streamlit as st
 import pandas as pd
 import os
 
+from app.cyber_security import dashboard_utils
+from app.services.metrics import timed
+
+logger = logging.getLogger(__name__)
+
 class TicketAnalytics:
-    def __init__(self):
+    def __init__(self, file_path=None):
         # Path to CSV
-        self.file_path = os.path.join("app", "data", "it_tickets.csv")
+        self.file_path = file_path or dashboard_utils.TICKETS_CSV
         self.df = self.load_data()
+        self._aggregates = None
 
+    @timed("it_tickets.load_data")
     def load_data(self):
+        # No Streamlit calls: the precompute thread builds this off the script thread;
+        # show_dashboard reports the missing data
         if not os.path.exists(self.file_path):
-            st.error("it_tickets.csv is missing or empty.")
+            logger.warning("Ticket CSV not found: %s", self.file_path)
             return pd.DataFrame()
         df = pd.read_csv(self.file_path)
         df.columns = [c.strip().lower() for c in df.columns]
@@ -20,7 +31,7 @@ class TicketAnalytics:
         st.subheader("IT Tickets Analytics")
 
         if self.df.empty:
-            st.warning("No ticket data available.")
+            st.warning("it_tickets.csv is missing or empty. No ticket data available.")
             return
 
         # Example: display dataframe in Streamlit
@@ -32,10 +43,7 @@ class TicketAnalytics:
         st.subheader("IT Tickets Analytics ")
 
         # KPI: Total tickets
-        total_tickets = len(self.df)
-        total_open = len(self.df[self.df['status'].str.lower() == 'open'])
-        total_waiting_user = len(self.df[self.df['status'].str.lower() == 'waiting for user'])
-        total_resolved = len(self.df[self.df['status'].str.lower() == 'resolved'])
+        total_tickets, total_open, total_waiting_user, total_resolved = self.aggregates()["status_kpis"]
 
         col1, col2, col3, col4 = st.columns(4)
         col1.metric("Total Tickets", total_tickets)
@@ -52,11 +60,46 @@ class TicketAnalytics:
         # --- Ticket counts per staff ---
         self.plot_ticket_counts_by_staff()
 
+    # ------- Aggregations (no Streamlit calls) --------
+    def aggregates(self):
+        """All panel aggregations, computed once per instance (the precompute job calls this)."""
+        if self._aggregates is None:
+            self._aggregates = {
+                "status_kpis": self.status_kpis(),
+                "avg_resolution_by_staff": self.avg_resolution_by_staff(),
+                "avg_resolution_by_status": self.avg_resolution_by_status(),
+                "ticket_counts_by_staff": self.ticket_counts_by_staff(),
+            }
+        return self._aggregates
+
+    def status_kpis(self):
+        """Returns (total, open, waiting for user, resolved) ticket counts."""
+        status = self.df['status'].str.lower()
+        return (
+            len(self.df),
+            int((status == 'open').sum()),
+            int((status == 'waiting for user').sum()),
+            int((status == 'resolved').sum()),
+        )
+
+    def avg_resolution_by_staff(self):
+        hours = pd.to_numeric(self.df['resolution_time_hours'], errors='coerce')
+        avg_resolution = hours.groupby(self.df['assigned_to']).mean().reset_index()
+        return avg_resolution.sort_values(by='resolution_time_hours', ascending=False)
+
+    def avg_resolution_by_status(self):
+        hours = pd.to_numeric(self.df['resolution_time_hours'], errors='coerce')
+        avg_resolution_status = hours.groupby(self.df['status']).mean().reset_index()
+        return avg_resolution_status.sort_values(by='resolution_time_hours', ascending=False)
+
+    def ticket_counts_by_staff(self):
+        ticket_counts = self.df.groupby('assigned_to').size().reset_index(name='ticket_count')
+        return ticket_counts.sort_values(by='ticket_count', ascending=False)
+
+    # ------- Plots --------
+    @timed("it_tickets.plot_avg_resolution_by_staff")
     def plot_avg_resolution_by_staff(self):
-        df = self.df.copy()
-        df['resolution_time_hours'] = pd.to_numeric(df['resolution_time_hours'], errors='coerce')
-        avg_resolution = df.groupby('assigned_to')['resolution_time_hours'].mean().reset_index()
-        avg_resolution = avg_resolution.sort_values(by='resolution_time_hours', ascending=False)
+        avg_resolution = self.aggregates()["avg_resolution_by_staff"]
 
         st.markdown("### 1. Average Resolution Time by Staff (hours)")
         st.markdown("""
@@ -70,11 +113,9 @@ class TicketAnalytics:
         else:
             st.info("No data for staff resolution times.")
 
+    @timed("it_tickets.plot_avg_resolution_by_status")
     def plot_avg_resolution_by_status(self):
-        df = self.df.copy()
-        df['resolution_time_hours'] = pd.to_numeric(df['resolution_time_hours'], errors='coerce')
-        avg_resolution_status = df.groupby('status')['resolution_time_hours'].mean().reset_index()
-        avg_resolution_status = avg_resolution_status.sort_values(by='resolution_time_hours', ascending=False)
+        avg_resolution_status = self.aggregates()["avg_resolution_by_status"]
 
         st.markdown("### 2. Average Resolution Time by Status (hours)")
         st.markdown("""
@@ -87,10 +128,9 @@ class TicketAnalytics:
         else:
             st.info("No data for status resolution times.")
 
+    @timed("it_tickets.plot_ticket_counts_by_staff")
     def plot_ticket_counts_by_staff(self):
-        df = self.df.copy()
-        ticket_counts = df.groupby('assigned_to').size().reset_index(name='ticket_count')
-        ticket_counts = ticket_counts.sort_values(by='ticket_count', ascending=False)
+        ticket_counts = self.aggregates()["ticket_counts_by_staff"]
 
         st.markdown("### 3. Ticket Counts per Staff")
         st.markdown("""
@@ -0,0 +1,164 @@
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.services.precompute import file_signature
+
+# Correlated pairs materialized for display; counts always cover every pair
+DEFAULT_MAX_PAIRS = 5_000
+_US_PER_HOUR = 3_600_000_000
+
+
+# =====================================================
+# TIME-SORTED INPUTS (cached per source file version)
+# =====================================================
+
+@dataclass(frozen=True)
+class TimedRows:
+    """Rows of one source sorted by time; `times` is int64 microseconds."""
+    times: np.ndarray
+    ids: np.ndarray
+    labels: np.ndarray        # category (incidents) or assigned_to (tickets)
+    timestamps: np.ndarray    # original text, for display
+
+
+def _sorted_rows(ids, timestamps, labels):
+    parsed = pd.to_datetime(pd.Series(timestamps, dtype=object), format="ISO8601", errors="coerce")
+    keep = parsed.notna().to_numpy()
+    times = parsed.to_numpy(dtype="datetime64[us]").astype(np.int64)[keep]
+    order = np.argsort(times, kind="stable")
+    return TimedRows(
+        times=times[order],
+        ids=np.asarray(ids)[keep][order],
+        labels=np.asarray(labels, dtype=object)[keep][order],
+        timestamps=np.asarray(timestamps, dtype=object)[keep][order],
+    )
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _cached(key, signature, load):
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit and hit[0] == signature:
+            return hit[1]
+    value = load()
+    with _cache_lock:
+        _cache[key] = (signature, value)
+    return value
+
+
+def load_incidents(db_path=None):
+    """cyber_incidents as TimedRows (labels = category), re-read only when the DB changes."""
+    if db_path is None:
+        from app.cyber_security.cyber_incidents import _get_db
+        db_path = _get_db().db_path
+
+    def load():
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute("SELECT incident_id, timestamp, category FROM cyber_incidents").fetchall()
+        finally:
+            conn.close()
+        ids, timestamps, categories = zip(*rows) if rows else ((), (), ())
+        return _sorted_rows(ids, timestamps, categories)
+
+    return _cached(("incidents", db_path), file_signature(db_path), load)
+
+
+def load_tickets(csv_path=None):
+    """it_tickets.csv as TimedRows (labels = assigned_to), re-read only when the file changes."""
+    if csv_path is None:
+        from app.cyber_security.dashboard_utils import TICKETS_CSV
+        csv_path = TICKETS_CSV
+
+    def load():
+        df = pd.read_csv(csv_path, usecols=lambda c: c.strip().lower() in ("ticket_id", "created_at", "assigned_to"))
+        df.columns = [c.strip().lower() for c in df.columns]
+        return _sorted_rows(df["ticket_id"].to_numpy(), df["created_at"].to_numpy(dtype=object),
+                            df["assigned_to"].to_numpy(dtype=object))
+
+    return _cached(("tickets", csv_path), file_signature(csv_path), load)
+
+
+# =====================================================
+# INTERVAL JOIN
+# =====================================================
+
+@dataclass(frozen=True)
+class CorrelationResult:
+    before_hours: float
+    after_hours: float
+    total_pairs: int
+    pairs: pd.DataFrame         # first max_pairs pairs, by incident time
+    by_category: pd.DataFrame   # category, incidents, correlated_incidents, tickets_in_window
+    by_staff: pd.DataFrame      # assigned_to, tickets, correlated_tickets, incidents_in_window
+
+
+def _grouped(labels, counts, count_name, correlated_name, window_name):
+    codes, uniques = pd.factorize(pd.Series(labels, dtype=object))
+    valid = codes >= 0
+    codes, counts = codes[valid], counts[valid]
+    n = len(uniques)
+    return pd.DataFrame({
+        "label": uniques,
+        count_name: np.bincount(codes, minlength=n),
+        correlated_name: np.bincount(codes, weights=counts > 0, minlength=n).astype(np.int64),
+        window_name: np.bincount(codes, weights=counts, minlength=n).astype(np.int64),
+    }).sort_values(window_name, ascending=False, kind="stable").reset_index(drop=True)
+
+
+def correlate(incidents, tickets, before_hours=0.0, after_hours=24.0, max_pairs=DEFAULT_MAX_PAIRS):
+    """
+    Pairs each incident with the tickets created between before_hours before
+    and after_hours after its timestamp. Both inputs are time-sorted, so each
+    side's window bounds are a binary search into the other side:
+    O((n + m) log(n + m)) for all counts, plus O(max_pairs) for the pairs shown.
+    """
+    before = int(before_hours * _US_PER_HOUR)
+    after = int(after_hours * _US_PER_HOUR)
+
+    # Tickets in [t - before, t + after] for each incident
+    lo = np.searchsorted(tickets.times, incidents.times - before, side="left")
+    hi = np.searchsorted(tickets.times, incidents.times + after, side="right")
+    per_incident = hi - lo
+
+    # ...and, mirrored, incidents in [s - after, s + before] for each ticket
+    ilo = np.searchsorted(incidents.times, tickets.times - after, side="left")
+    ihi = np.searchsorted(incidents.times, tickets.times + before, side="right")
+    per_ticket = ihi - ilo
+
+    # Materialize the first max_pairs pairs without a cross join; the incident
+    # that crosses the cap contributes only its first tickets
+    cum = np.cumsum(per_incident)
+    total = int(cum[-1]) if len(cum) else 0
+    counts = np.clip(max_pairs - (cum - per_incident), 0, per_incident)
+    shown = np.cumsum(counts)
+    inc_idx = np.repeat(np.arange(len(counts)), counts)
+    tkt_idx = np.repeat(lo - (shown - counts), counts) + np.arange(len(inc_idx))
+
+    pairs = pd.DataFrame({
+        "incident_id": incidents.ids[inc_idx],
+        "incident_time": incidents.timestamps[inc_idx],
+        "category": incidents.labels[inc_idx],
+        "ticket_id": tickets.ids[tkt_idx],
+        "ticket_created": tickets.timestamps[tkt_idx],
+        "assigned_to": tickets.labels[tkt_idx],
+        "lag_hours": (tickets.times[tkt_idx] - incidents.times[inc_idx]) / _US_PER_HOUR,
+    })
+
+    by_category = _grouped(incidents.labels, per_incident, "incidents", "correlated_incidents",
+                           "tickets_in_window").rename(columns={"label": "category"})
+    by_staff = _grouped(tickets.labels, per_ticket, "tickets", "correlated_tickets",
+                        "incidents_in_window").rename(columns={"label": "assigned_to"})
+    return CorrelationResult(before_hours, after_hours, total, pairs, by_category, by_staff)
+
+
+def correlate_dashboard_data(before_hours=0.0, after_hours=24.0, max_pairs=DEFAULT_MAX_PAIRS):
+    """correlate() over the live incidents DB and tickets CSV."""
+    return correlate(load_incidents(), load_tickets(), before_hours, after_hours, max_pairs)
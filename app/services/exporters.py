@@ -0,0 +1,222 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+
+FORMATS = {"CSV": ("csv", "text/csv"), "NDJSON": ("ndjson", "application/x-ndjson")}
+# Rows fetched from SQLite / encoded per chunk
+CHUNK_ROWS = 5_000
+# Generation holds one chunk at a time, but st.download_button keeps the finished
+# file in memory while serving it, so larger exports are refused (0 = no cap)
+EXPORT_MAX_ROWS = int(os.environ.get("EXPORT_MAX_ROWS", "500000"))
+
+
+class ExportTooLarge(ValueError):
+    pass
+
+
+INCIDENT_EXPORT_COLUMNS = ["incident_id", "timestamp", "severity", "category", "status", "description"]
+
+
+# =====================================================
+# ROW SOURCES (generators, one chunk in memory at a time)
+# =====================================================
+
+def _incidents_db(db_path):
+    if db_path is None:
+        from app.cyber_security.cyber_incidents import _get_db
+        return _get_db().db_path
+    return db_path
+
+
+def _incident_where(severity=None, status=None, category=None, since=None, until=None):
+    """' WHERE ...' clause (or '') and its parameters for the incident filters."""
+    clauses, params = [], []
+    for column, values in (("severity", severity), ("status", status), ("category", category)):
+        if values:
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    if since:
+        clauses.append("timestamp >= ?")
+        params.append(str(since))
+    if until:
+        # Timestamps are 'YYYY-MM-DD HH:MM:SS...', so everything on `until` sorts below 'YYYY-MM-DD~'
+        clauses.append("timestamp < ?")
+        params.append(f"{until}~")
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def count_incident_rows(db_path=None, **filters):
+    """Number of incidents an export with these filters would contain."""
+    where, params = _incident_where(**filters)
+    conn = sqlite3.connect(_incidents_db(db_path))
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM cyber_incidents{where}", params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def iter_incident_rows(db_path=None, severity=None, status=None, category=None, since=None, until=None,
+                       chunk_rows=CHUNK_ROWS):
+    """
+    Yields cyber_incidents rows as tuples in INCIDENT_EXPORT_COLUMNS order,
+    fetched with fetchmany(). severity/status/category are lists of accepted
+    values; since/until are 'YYYY-MM-DD' bounds on the timestamp (inclusive).
+    """
+    where, params = _incident_where(severity, status, category, since, until)
+    sql = f"SELECT {', '.join(INCIDENT_EXPORT_COLUMNS)} FROM cyber_incidents{where} ORDER BY incident_id"
+
+    conn = sqlite3.connect(_incidents_db(db_path))
+    try:
+        cur = conn.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
+
+def _tickets_csv(csv_path):
+    if csv_path is None:
+        from app.cyber_security.dashboard_utils import TICKETS_CSV
+        return TICKETS_CSV
+    return csv_path
+
+
+def ticket_columns(csv_path=None):
+    """it_tickets.csv header, normalized to lowercase like TicketAnalytics does."""
+    with open(_tickets_csv(csv_path), newline="", encoding="utf-8") as f:
+        return [c.strip().lower() for c in next(csv.reader(f), [])]
+
+
+def iter_ticket_rows(csv_path=None, status=None):
+    """Yields it_tickets.csv data rows, read line by line; status is a list of accepted values."""
+    columns = ticket_columns(csv_path)
+    status_index = columns.index("status") if "status" in columns else None
+    wanted = set(status) if status else None
+    with open(_tickets_csv(csv_path), newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if wanted is None or (status_index is not None and row[status_index] in wanted):
+                yield row
+
+
+# =====================================================
+# ENCODERS
+# =====================================================
+
+def encode_csv(columns, rows, chunk_rows=CHUNK_ROWS):
+    """Yields UTF-8 CSV bytes, header first, chunk_rows rows per chunk."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    n = 0
+    for row in rows:
+        writer.writerow(row)
+        n += 1
+        if n % chunk_rows == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def encode_ndjson(columns, rows, chunk_rows=CHUNK_ROWS):
+    """Yields UTF-8 NDJSON bytes (one object per line), chunk_rows rows per chunk."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+        if len(lines) >= chunk_rows:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines.clear()
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _capped(rows, max_rows):
+    """Passes rows through, raising ExportTooLarge once more than max_rows (0 = no cap) have come."""
+    for n, row in enumerate(rows, 1):
+        if max_rows and n > max_rows:
+            raise ExportTooLarge(f"Export exceeds {max_rows:,} rows; narrow the filters")
+        yield row
+
+
+def _encode(fmt, columns, rows):
+    if fmt == "CSV":
+        return encode_csv(columns, rows)
+    if fmt == "NDJSON":
+        return encode_ndjson(columns, rows)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_incidents(fmt="CSV", max_rows=None, **filters):
+    """
+    Chunks of bytes for the filtered incidents (see iter_incident_rows for
+    filters); max_rows defaults to EXPORT_MAX_ROWS.
+    """
+    rows = _capped(iter_incident_rows(**filters), EXPORT_MAX_ROWS if max_rows is None else max_rows)
+    return _encode(fmt, INCIDENT_EXPORT_COLUMNS, rows)
+
+
+def export_tickets(fmt="CSV", max_rows=None, **filters):
+    """
+    Chunks of bytes for it_tickets.csv (see iter_ticket_rows for filters);
+    max_rows defaults to EXPORT_MAX_ROWS.
+    """
+    rows = _capped(iter_ticket_rows(**filters), EXPORT_MAX_ROWS if max_rows is None else max_rows)
+    return _encode(fmt, ticket_columns(filters.get("csv_path")), rows)
+
+
+def spool(chunks):
+    """
+    Writes chunks to an anonymous temp file (deleted once closed) and returns
+    it rewound. Unbuffered, so it is an io.RawIOBase that st.download_button
+    accepts.
+    """
+    f = tempfile.TemporaryFile(buffering=0)
+    for chunk in chunks:
+        view = memoryview(chunk)
+        while view:
+            # Raw writes may be partial
+            view = view[f.write(view):]
+    f.seek(0)
+    return f
+
+
+# =====================================================
+# STREAMLIT COMPONENT
+# =====================================================
+
+def render_export_button(label, make_chunks, file_stem, key, row_count=None):
+    """
+    Format picker plus a download button. make_chunks(fmt) must return a
+    fresh chunk generator; it only runs when the button is clicked, on
+    Streamlit's download thread, and is spooled to disk first. Streamlit
+    still holds the finished file in memory while serving it, so the button
+    is disabled when row_count (rows matching the filters) is over
+    EXPORT_MAX_ROWS.
+    """
+    import streamlit as st
+
+    too_large = bool(EXPORT_MAX_ROWS and row_count is not None and row_count > EXPORT_MAX_ROWS)
+    if too_large:
+        st.warning(f"{row_count:,} rows match; exports are limited to {EXPORT_MAX_ROWS:,}. Narrow the filters.")
+    elif row_count is not None:
+        st.caption(f"{row_count:,} rows match.")
+
+    fmt = st.radio("Format", list(FORMATS), horizontal=True, key=f"{key}_fmt")
+    extension, mime = FORMATS[fmt]
+    st.download_button(
+        label,
+        data=lambda: spool(make_chunks(fmt)),
+        file_name=f"{file_stem}.{extension}",
+        mime=mime,
+        key=f"{key}_download",
+        disabled=too_large,
+    )
@@ -0,0 +1,203 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# -------------------------
+# Configuration
+# -------------------------
+# APP_METRICS=0 turns instrumentation into a flag check per call.
+ENABLED = os.environ.get("APP_METRICS", "1") != "0"
+# Where the Performance panel writes metric dumps (created on first dump)
+DUMP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "metrics")
+
+# Histogram bucket upper bounds, in seconds (Prometheus-style, cumulative on export)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Recent samples kept per histogram for percentile estimates
+RECENT_SAMPLES = 1024
+
+
+def is_enabled() -> bool:
+    return ENABLED
+
+
+# =====================================================
+# METRIC TYPES
+# =====================================================
+
+class Counter:
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        with self._lock:
+            self.value += n
+
+
+class Histogram:
+    def __init__(self, name, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)   # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.bucket_counts[i] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+            self.recent.append(value)
+
+    def percentile(self, q):
+        with self._lock:
+            samples = sorted(self.recent)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "max": self.max,
+        }
+
+
+# =====================================================
+# REGISTRY
+# =====================================================
+
+class MetricsRegistry:
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name) -> Counter:
+        metric = self.counters.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.counters.setdefault(name, Counter(name))
+        return metric
+
+    def histogram(self, name) -> Histogram:
+        metric = self.histograms.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.histograms.setdefault(name, Histogram(name))
+        return metric
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    # ------- Export --------
+    def to_dict(self):
+        return {
+            "generated_at": time.time(),
+            "counters": {name: c.value for name, c in sorted(self.counters.items())},
+            "histograms": {name: h.summary() for name, h in sorted(self.histograms.items())},
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format; metric names become a `name` label."""
+        lines = [
+            "# HELP app_events_total Event and call counters.",
+            "# TYPE app_events_total counter",
+        ]
+        for name, c in sorted(self.counters.items()):
+            lines.append(f'app_events_total{{name="{name}"}} {c.value}')
+
+        lines += [
+            "# HELP app_duration_seconds Duration of instrumented calls.",
+            "# TYPE app_duration_seconds histogram",
+        ]
+        for name, h in sorted(self.histograms.items()):
+            with h._lock:
+                counts = list(h.bucket_counts)
+                total, sum_ = h.count, h.sum
+            cumulative = 0
+            for bound, n in zip(h.buckets, counts):
+                cumulative += n
+                lines.append(f'app_duration_seconds_bucket{{name="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'app_duration_seconds_bucket{{name="{name}",le="+Inf"}} {total}')
+            lines.append(f'app_duration_seconds_sum{{name="{name}"}} {sum_}')
+            lines.append(f'app_duration_seconds_count{{name="{name}"}} {total}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Writes the registry to path: JSON for *.json, Prometheus text otherwise."""
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+        return path
+
+
+REGISTRY = MetricsRegistry()
+
+
+def dump_to_dir(fmt="prom", directory=None):
+    """Dumps REGISTRY to a new timestamped file ('prom' or 'json') in DUMP_DIR; returns its path."""
+    directory = directory or DUMP_DIR
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return REGISTRY.dump(os.path.join(directory, f"metrics-{stamp}-{os.getpid()}.{fmt}"))
+
+
+# =====================================================
+# INSTRUMENTATION HELPERS
+# =====================================================
+
+def incr(name, n=1):
+    if ENABLED:
+        REGISTRY.counter(name).inc(n)
+
+
+def observe(name, seconds):
+    if ENABLED:
+        REGISTRY.histogram(name).observe(seconds)
+
+
+def timed(name=None):
+    """
+    Decorator recording call duration in histogram `name` (default:
+    module.qualname) and raised exceptions in counter `<name>.errors`.
+    """
+    def decorate(fn):
+        metric = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                REGISTRY.counter(metric + ".errors").inc()
+                raise
+            finally:
+                REGISTRY.histogram(metric).observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
@@ -0,0 +1,315 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+DEFAULT_PAGE_SIZE = 25
+# Seconds a filtered row count is reused before being recounted
+COUNT_TTL = 30.0
+
+
+# =====================================================
+# DATA SOURCES
+# =====================================================
+# A source answers these questions for the table component:
+#   columns            -> all selectable column names
+#   sortable_columns   -> the columns it can sort by efficiently
+#   count(filters)     -> number of matching rows
+#   fetch_page(...)    -> (DataFrame of one page, cursor for the next page)
+# filters is a dict {column: text}; a row matches when the column's value
+# contains the text (case-insensitive).
+
+class SQLiteTableSource:
+    """
+    Keyset-paginated view of one SQLite table. Each page is a
+    `WHERE (sort, key) > (last sort, last key) ORDER BY sort, key LIMIT n`
+    query on the raw sort column, so it walks a (sort, key) index and page
+    cost does not grow with how far the user has paged. Only the key and
+    columns leading an index are offered for sorting. NULLs sort first
+    ascending and last descending (SQLite's order) and are paged as their
+    own segment, ordered by key.
+    base_where is a trusted SQL condition fixed by the caller (never user input).
+    """
+
+    def __init__(self, db_path, table, key_column, base_where=None, base_params=()):
+        self.db_path = db_path
+        self.table = table
+        self.key_column = key_column
+        self.base_where = base_where
+        self.base_params = tuple(base_params)
+        self._counts = {}
+        self._lock = threading.Lock()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self.columns = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+            leading = set()
+            for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+                info = conn.execute(f"PRAGMA index_info({index[1]})").fetchall()
+                if info:
+                    leading.add(min(info)[2])   # seqno 0
+        finally:
+            conn.close()
+        self.sortable_columns = [c for c in self.columns if c == key_column or c in leading]
+
+    def _check(self, column):
+        if column not in self.columns:
+            raise ValueError(f"Unknown column: {column}")
+        return column
+
+    def _where(self, filters):
+        clauses, params = [], []
+        if self.base_where:
+            clauses.append(f"({self.base_where})")
+            params.extend(self.base_params)
+        for column, text in (filters or {}).items():
+            if text:
+                clauses.append(f"{self._check(column)} LIKE ? ESCAPE '\\'")
+                escaped = str(text).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                params.append(f"%{escaped}%")
+        return clauses, params
+
+    def count(self, filters=None):
+        # Keyed on the DB file's mtime so writes are reflected immediately
+        try:
+            version = os.stat(self.db_path).st_mtime_ns
+        except OSError:
+            version = None
+        cache_key = (version, tuple(sorted((filters or {}).items())))
+        now = time.monotonic()
+        with self._lock:
+            hit = self._counts.get(cache_key)
+            if hit and now - hit[0] < COUNT_TTL:
+                return hit[1]
+        clauses, params = self._where(filters)
+        sql = f"SELECT COUNT(*) FROM {self.table}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            total = conn.execute(sql, params).fetchone()[0]
+        finally:
+            conn.close()
+        with self._lock:
+            if len(self._counts) > 256:
+                self._counts.clear()
+            self._counts[cache_key] = (now, total)
+        return total
+
+    def _segments(self, sort_by, descending, cursor):
+        """
+        (condition, params, order) per remaining segment of the sort order,
+        starting at the cursor's. Every condition compares the raw column,
+        so SQLite can range-scan the (sort_by, key) index.
+        """
+        key = self.key_column
+        op = "<" if descending else ">"
+        direction = "DESC" if descending else "ASC"
+        if sort_by == key:
+            return [(f"{key} {op} ?" if cursor else None, [cursor[1]] if cursor else [], f"{key} {direction}")]
+
+        values = (f"{sort_by} IS NOT NULL", f"{sort_by} {direction}, {key} {direction}")
+        nulls = (f"{sort_by} IS NULL", f"{key} {direction}")
+        order = [values, nulls] if descending else [nulls, values]
+        if cursor is None:
+            return [(cond, [], by) for cond, by in order]
+        if cursor[0] is None:
+            # Inside the NULL segment
+            first = (f"{sort_by} IS NULL AND {key} {op} ?", [cursor[1]], nulls[1])
+            rest = order[order.index(nulls) + 1:]
+        else:
+            first = (f"({sort_by}, {key}) {op} (?, ?)", list(cursor), values[1])
+            rest = order[order.index(values) + 1:]
+        return [first] + [(cond, [], by) for cond, by in rest]
+
+    def _page_queries(self, columns, sort_by, descending, filters, cursor):
+        """(sql, params) per segment, each ending in `LIMIT ?` for the caller to bind."""
+        select = [self._check(c) for c in columns]
+        # Cursor values are read from extra trailing columns
+        select_sql = ", ".join(select + [f"{sort_by} AS _sort", f"{self.key_column} AS _key"])
+        base_clauses, base_params = self._where(filters)
+        queries = []
+        for condition, params, order_by in self._segments(sort_by, descending, cursor):
+            clauses = base_clauses + ([condition] if condition else [])
+            sql = f"SELECT {select_sql} FROM {self.table}"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            queries.append((sql + f" ORDER BY {order_by} LIMIT ?", base_params + params))
+        return select, queries
+
+    def fetch_page(self, columns, sort_by=None, descending=False, filters=None, cursor=None,
+                   limit=DEFAULT_PAGE_SIZE):
+        sort_by = self._check(sort_by or self.key_column)
+        select, queries = self._page_queries(columns, sort_by, descending, filters, cursor)
+
+        rows = []
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for sql, params in queries:
+                # One extra row tells us whether a next page exists
+                rows += conn.execute(sql, params + [limit + 1 - len(rows)]).fetchall()
+                if len(rows) > limit:
+                    break
+        finally:
+            conn.close()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = (rows[-1][-2], rows[-1][-1]) if has_more else None
+        page = pd.DataFrame([r[:-2] for r in rows], columns=select)
+        return page, next_cursor
+
+    def query_plans(self, columns, sort_by=None, descending=False, filters=None, cursor=None):
+        """EXPLAIN QUERY PLAN detail lines for each query fetch_page would run."""
+        sort_by = self._check(sort_by or self.key_column)
+        _, queries = self._page_queries(columns, sort_by, descending, filters, cursor)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return [
+                [r[-1] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params + [1])]
+                for sql, params in queries
+            ]
+        finally:
+            conn.close()
+
+
+class DataFrameTableSource:
+    """
+    Paged view over an in-memory DataFrame (e.g. a cached CSV). Sorted and
+    filtered row orders are cached per (sort, filters), so paging through
+    them is just an iloc slice.
+    """
+
+    def __init__(self, df, max_views=16):
+        self.df = df.reset_index(drop=True)
+        self.columns = list(self.df.columns)
+        self.sortable_columns = self.columns
+        self._views = OrderedDict()
+        self._max_views = max_views
+        self._lock = threading.Lock()
+
+    def _view(self, sort_by, descending, filters):
+        key = (sort_by, descending, tuple(sorted((filters or {}).items())))
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+
+        df = self.df
+        mask = None
+        for column, text in (filters or {}).items():
+            if text and column in df.columns:
+                m = df[column].astype(str).str.contains(str(text), case=False, regex=False, na=False)
+                mask = m if mask is None else mask & m
+        idx = df.index if mask is None else df.index[mask]
+        if sort_by and sort_by in df.columns:
+            idx = df.loc[idx, sort_by].sort_values(ascending=not descending, kind="stable").index
+        view = idx.to_numpy()
+
+        with self._lock:
+            self._views[key] = view
+            while len(self._views) > self._max_views:
+                self._views.popitem(last=False)
+        return view
+
+    def count(self, filters=None):
+        return len(self._view(None, False, filters))
+
+    def fetch_page(self, columns, sort_by=None, descending=False, filters=None, cursor=None,
+                   limit=DEFAULT_PAGE_SIZE):
+        view = self._view(sort_by, descending, filters)
+        start = cursor or 0
+        rows = view[start:start + limit]
+        next_cursor = start + limit if start + limit < len(view) else None
+        return self.df.loc[rows, [c for c in columns if c in self.columns]], next_cursor
+
+
+_csv_sources = {}
+_csv_lock = threading.Lock()
+
+
+def csv_table_source(csv_path, normalize_columns=False):
+    """
+    DataFrameTableSource for a CSV file, re-read only when the file changes.
+    Returns None if the file does not exist.
+    """
+    try:
+        mtime = os.stat(csv_path).st_mtime_ns
+    except OSError:
+        return None
+    key = (csv_path, normalize_columns)
+    with _csv_lock:
+        cached = _csv_sources.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    df = pd.read_csv(csv_path)
+    if normalize_columns:
+        df.columns = [c.strip().lower() for c in df.columns]
+    source = DataFrameTableSource(df)
+    with _csv_lock:
+        _csv_sources[key] = (mtime, source)
+    return source
+
+
+# =====================================================
+# STREAMLIT COMPONENT
+# =====================================================
+
+def render_paginated_table(source, key, default_columns=None, page_size=DEFAULT_PAGE_SIZE,
+                           default_sort=None, default_descending=False):
+    """
+    Renders a table that only fetches and sends the current page.
+    Column choice, sort, filter and page position live in st.session_state
+    under `key`, so each widget instance keeps its own state.
+    default_sort/default_descending set the initial sort (if sortable).
+    """
+    state_key = f"_ptable_{key}"
+    columns = st.multiselect(
+        "Columns", source.columns, default=default_columns or source.columns, key=f"{key}_cols"
+    )
+    if not columns:
+        st.info("Select at least one column to display.")
+        return
+
+    col_sort, col_dir, col_filter_col, col_filter_text = st.columns([3, 2, 3, 3])
+    sortable = list(source.sortable_columns)
+    sort_by = col_sort.selectbox(
+        "Sort by", sortable, index=sortable.index(default_sort) if default_sort in sortable else 0,
+        key=f"{key}_sort",
+    )
+    descending = col_dir.checkbox("Descending", value=default_descending, key=f"{key}_desc")
+    filter_col = col_filter_col.selectbox("Filter column", ["(none)"] + source.columns, key=f"{key}_fcol")
+    filter_text = col_filter_text.text_input("Contains", key=f"{key}_ftext")
+    filters = {filter_col: filter_text} if filter_col != "(none)" and filter_text else {}
+
+    # Page position resets whenever the query shape changes
+    query = (tuple(columns), sort_by, descending, tuple(filters.items()))
+    state = st.session_state.get(state_key)
+    if state is None or state["query"] != query:
+        state = {"query": query, "cursors": [None], "page": 0, "has_next": False}
+        st.session_state[state_key] = state
+
+    page_df, next_cursor = source.fetch_page(
+        columns, sort_by, descending, filters, state["cursors"][state["page"]], page_size
+    )
+    if next_cursor is not None and len(state["cursors"]) == state["page"] + 1:
+        state["cursors"].append(next_cursor)
+
+    total = source.count(filters)
+    first = state["page"] * page_size + 1 if len(page_df) else 0
+    st.dataframe(page_df, width="stretch", hide_index=True)
+
+    col_prev, col_info, col_next = st.columns([1, 4, 1])
+    if col_prev.button("Prev", key=f"{key}_prev", disabled=state["page"] == 0):
+        state["page"] -= 1
+        st.rerun()
+    col_info.caption(
+        f"Page {state['page'] + 1} of {max(1, -(-total // page_size))} · "
+        f"rows {first}–{first + len(page_df) - 1 if len(page_df) else 0} of {total}"
+    )
+    if col_next.button("Next", key=f"{key}_next", disabled=next_cursor is None):
+        state["page"] += 1
+        st.rerun()
@@ -0,0 +1,304 @@
+import logging
+import os
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+
+from app.services.metrics import incr, observe
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Configuration
+# -------------------------
+# PRECOMPUTE=0 disables the background thread; aggregates are then refreshed
+# inline by the first render that finds them out of date.
+ENABLED = os.environ.get("PRECOMPUTE", "1") != "0"
+# Seconds between unconditional refreshes of every aggregate
+PRECOMPUTE_INTERVAL = float(os.environ.get("PRECOMPUTE_INTERVAL", "300"))
+# Seconds between checks of the source files for changes
+POLL_INTERVAL = float(os.environ.get("PRECOMPUTE_POLL_INTERVAL", "1.0"))
+
+
+def file_signature(*paths):
+    """(mtime, size) of each path (plus the -wal file of a .db); changes whenever a source is written."""
+    sig = []
+    for path in paths:
+        for p in (path, path + "-wal") if path.endswith(".db") else (path,):
+            try:
+                st = os.stat(p)
+                sig.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append(None)
+    return tuple(sig)
+
+
+# =====================================================
+# SHARED STORE
+# =====================================================
+
+@dataclass(frozen=True)
+class Aggregate:
+    name: str
+    value: object        # treat as read-only: it is shared by every session
+    computed_at: float   # time.time()
+    duration: float      # seconds spent computing
+    signature: tuple     # source signature the value was computed from
+
+
+class AggregateStore:
+    """
+    Latest published value per aggregate. publish() swaps in a complete
+    Aggregate under a lock, so a reader sees either the old or the new
+    value, never a partly built one.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            return self._items.get(name)
+
+    def publish(self, aggregate):
+        with self._lock:
+            self._items[aggregate.name] = aggregate
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+# =====================================================
+# SCHEDULER
+# =====================================================
+
+class _Job:
+    __slots__ = ("name", "compute", "signature", "lock", "last_error")
+
+    def __init__(self, name, compute, signature):
+        self.name = name
+        self.compute = compute
+        self.signature = signature
+        self.lock = threading.Lock()   # one computation per job at a time
+        self.last_error = None
+
+
+class PrecomputeScheduler:
+    """
+    Recomputes registered aggregates on a daemon thread: whenever a job's
+    source signature changes (checked every poll_interval seconds) and at
+    least every `interval` seconds. Page renders only read the store.
+    """
+
+    def __init__(self, store=None, interval=PRECOMPUTE_INTERVAL, poll_interval=POLL_INTERVAL):
+        self.store = store or AggregateStore()
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self._jobs = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, name, compute, signature=lambda: ()):
+        """compute() -> value; signature() -> cheap tuple that changes when the inputs change."""
+        self._jobs[name] = _Job(name, compute, signature)
+
+    # ------- Running jobs --------
+    def _is_due(self, job, signature):
+        current = self.store.get(job.name)
+        return (
+            current is None
+            or current.signature != signature
+            or time.time() - current.computed_at >= self.interval
+        )
+
+    def run_job(self, name, force=False):
+        """Computes and publishes one aggregate if it is due (or forced); returns the current Aggregate."""
+        job = self._jobs[name]
+        with job.lock:
+            signature = job.signature()
+            if force or self._is_due(job, signature):
+                start = time.perf_counter()
+                try:
+                    value = job.compute()
+                except Exception:
+                    # Keep serving the previous value
+                    job.last_error = traceback.format_exc()
+                    incr(f"precompute.{name}.errors")
+                    logger.exception("Precompute of %s failed", name)
+                else:
+                    duration = time.perf_counter() - start
+                    job.last_error = None
+                    observe(f"precompute.{name}", duration)
+                    self.store.publish(Aggregate(name, value, time.time(), duration, signature))
+        return self.store.get(name)
+
+    def run_due(self):
+        for name in list(self._jobs):
+            self.run_job(name)
+
+    # ------- Background thread --------
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_due()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="precompute", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def trigger(self):
+        """Wakes the thread to check every job now (e.g. right after a write)."""
+        self._wake.set()
+
+    # ------- Reading --------
+    def read(self, name):
+        """
+        Published aggregate for a page render. Only a cold start (nothing
+        published yet), or a changed source with no background thread,
+        computes inline; otherwise the last value is returned as is.
+        """
+        current = self.store.get(name)
+        if current is None or not self.running:
+            return self.run_job(name)
+        return current
+
+    def is_stale(self, aggregate):
+        """True if the aggregate's sources have changed since it was computed."""
+        return aggregate.signature != self._jobs[aggregate.name].signature()
+
+    def last_error(self, name):
+        return self._jobs[name].last_error
+
+
+def staleness_caption(scheduler, aggregate):
+    """One-line 'computed N s ago' note for a panel."""
+    if aggregate is None:
+        return "Not computed yet."
+    age = max(0, int(time.time() - aggregate.computed_at))
+    age_text = f"{age} s" if age < 120 else f"{age // 60} min"
+    text = (
+        f"Computed {age_text} ago in {aggregate.duration * 1000:.0f} ms · "
+        f"refreshed on data change and every {scheduler.interval:.0f} s"
+    )
+    if scheduler.is_stale(aggregate):
+        text += " · update pending"
+    return text
+
+
+# =====================================================
+# DASHBOARD AGGREGATES
+# =====================================================
+# One job per pages/dashboard.py panel. Domain modules are imported inside
+# each job so importing this module stays cheap.
+
+def _cyber_signature():
+    from app.cyber_security.cyber_incidents import _get_db
+    return file_signature(_get_db().db_path)
+
+
+def _compute_cyber():
+    from app.cyber_security.cyber_incidents import (
+        dashboard_snapshot,
+        active_spikes,
+        spike_events,
+        incident_categories,
+    )
+    return {
+        "snapshot": dashboard_snapshot(),
+        "spikes": active_spikes(),
+        "spike_events": spike_events(),
+        "categories": incident_categories(),
+    }
+
+
+def _overview_signature():
+    from app.cyber_security import dashboard_utils
+    return file_signature(dashboard_utils.CYBER_CSV, dashboard_utils.DATASETS_CSV, dashboard_utils.TICKETS_CSV)
+
+
+def _compute_overview():
+    from app.cyber_security import dashboard_utils
+    from app.services.paginated_table import csv_table_source
+    return {
+        "cyber": csv_table_source(dashboard_utils.CYBER_CSV),
+        "datasets": csv_table_source(dashboard_utils.DATASETS_CSV),
+        "tickets": csv_table_source(dashboard_utils.TICKETS_CSV),
+    }
+
+
+def _datasets_signature():
+    from app.cyber_security import dashboard_utils
+    return file_signature(dashboard_utils.DATASETS_CSV)
+
+
+def _compute_datasets():
+    from app.data_science.dataset_metadata import (
+        load_datasets_csv,
+        dataset_resource_analysis,
+        dataset_source_dependency,
+    )
+    df = load_datasets_csv()
+    if df.empty:
+        return {"df": df, "resource": None, "dependency": None}
+    from app.services.paginated_table import DataFrameTableSource
+    df.columns = [c.strip().lower() for c in df.columns]
+    resource = dataset_resource_analysis(df)
+    return {
+        "df": df,
+        "resource": resource,
+        "dependency": dataset_source_dependency(df),
+        "df_source": DataFrameTableSource(df),
+        "resource_source": DataFrameTableSource(resource),
+    }
+
+
+def _tickets_signature():
+    from app.cyber_security import dashboard_utils
+    return file_signature(dashboard_utils.TICKETS_CSV)
+
+
+def _compute_tickets():
+    from app.it_operations.it_operations import TicketAnalytics
+    analytics = TicketAnalytics()
+    if not analytics.df.empty:
+        analytics.aggregates()
+    return analytics
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Shared scheduler for this worker, with the dashboard jobs registered and started."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                scheduler = PrecomputeScheduler()
+                scheduler.register("overview", _compute_overview, _overview_signature)
+                scheduler.register("cyber", _compute_cyber, _cyber_signature)
+                scheduler.register("datasets", _compute_datasets, _datasets_signature)
+                scheduler.register("it_tickets", _compute_tickets, _tickets_signature)
+                if ENABLED:
+                    scheduler.start()
+                _scheduler = scheduler
+    return _scheduler
@@ -0,0 +1,66 @@
+"""
+Offline benchmark of assistant cache-hit latency.
+
+Uses the StubClient with a simulated round trip and compares a cold call,
+memory hits and disk hits (fresh memory LRU over the same SQLite file).
+
+    python -m benchmarks.help_cache_latency --latency 0.8 --repeat 1000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("HELP_BACKEND", "stub")
+
+from app.help.need_help import generate_gemini_response  # noqa: E402
+from app.help.response_cache import ResponseCache  # noqa: E402
+from app.help.stub_client import StubClient  # noqa: E402
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assistant cache-hit latency benchmark")
+    parser.add_argument("--latency", type=float, default=0.5, help="simulated upstream seconds per call")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": "How do I update an incident status?"},
+    ]
+    stub = StubClient(latency=args.latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "help_cache.db")
+        cache = ResponseCache(db_path=db_path)
+
+        start = time.perf_counter()
+        generate_gemini_response(messages, llm_client=stub, cache=cache, retriever=False)
+        miss_us = (time.perf_counter() - start) * 1e6
+
+        def memory_hit():
+            generate_gemini_response(messages, llm_client=stub, cache=cache, retriever=False)
+        memory_us = _time(memory_hit, args.repeat)
+
+        def disk_hit():
+            generate_gemini_response(messages, llm_client=stub, cache=ResponseCache(db_path=db_path), retriever=False)
+        disk_us = _time(disk_hit, max(1, args.repeat // 10))
+
+    print(f"upstream calls: {stub.calls}")
+    print(f"miss (stub round trip): {miss_us:12.1f} us")
+    print(f"memory hit (median):    {memory_us:12.1f} us")
+    print(f"disk hit (median):      {disk_us:12.1f} us")
+
+
+if __name__ == "__main__":
+    main()
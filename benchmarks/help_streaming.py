@@ -0,0 +1,43 @@
+"""
+Time-to-first-token vs full-reply latency for the streaming assistant path,
+measured against the local StubClient streaming backend.
+
+    python -m benchmarks.help_streaming --latency 0.3 --chunk-delay 0.05
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("HELP_BACKEND", "stub")
+
+from app.help.need_help import stream_gemini_response, generate_gemini_response  # noqa: E402
+from app.help.stub_client import StubClient  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assistant streaming TTFT benchmark")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds before the first chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0.05, help="seconds between chunks")
+    args = parser.parse_args()
+
+    stub = StubClient(latency=args.latency, chunk_delay=args.chunk_delay)
+    messages = [{"role": "user", "content": "How do I update an incident status?"}]
+
+    start = time.perf_counter()
+    generate_gemini_response(messages, llm_client=stub, cache=False, retriever=False)
+    blocking_ms = (time.perf_counter() - start) * 1000
+
+    ttft = {}
+    start = time.perf_counter()
+    chunks = list(stream_gemini_response(
+        messages, llm_client=stub, cache=False, retriever=False, on_first_chunk=lambda ms: ttft.update(ms=ms)
+    ))
+    streaming_ms = (time.perf_counter() - start) * 1000
+
+    print(f"blocking reply visible after: {blocking_ms:8.1f} ms")
+    print(f"streaming first token after:  {ttft['ms']:8.1f} ms")
+    print(f"streaming complete after:     {streaming_ms:8.1f} ms ({len(chunks)} chunks)")
+
+
+if __name__ == "__main__":
+    main()
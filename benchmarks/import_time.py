@@ -0,0 +1,89 @@
+"""
+Import-time benchmark for the login page's first paint.
+
+Each module is imported in a fresh interpreter with `python -X importtime`;
+the cumulative time of the module itself is reported, and the run fails if
+a module exceeds its budget or drags in a heavy dependency it should defer.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 5 --budget-scale 1.5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> (budget in ms, dependencies that must not be imported with it)
+CHECKS = {
+    # homePage.py imports only this (plus streamlit) before the login form renders
+    "app.cyber_security.user_db": (150, ("pandas", "numpy", "google.genai")),
+    "app.auth": (100, ("pandas", "numpy", "google.genai")),
+    "app.cyber_security.cyber_incidents": (800, ("google.genai",)),
+    # Secrets and the Gemini client are deferred to the first question
+    "app.help.need_help": (2500, ("google.genai", "pandas")),
+}
+
+
+def import_profile(module: str) -> tuple[float, set[str]]:
+    """Returns (cumulative ms for module, set of every module imported)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+        env={**os.environ, "HELP_BACKEND": os.environ.get("HELP_BACKEND", "stub")},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative_us = None
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        name = fields[2].strip()
+        if not fields[1].strip().isdigit():
+            continue   # header row
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(fields[1])
+    return (cumulative_us or 0) / 1000, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time regression check")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply every budget (slow CI hosts)")
+    args = parser.parse_args()
+
+    failures = []
+    for module, (budget_ms, forbidden) in CHECKS.items():
+        samples = []
+        imported = set()
+        for _ in range(args.repeat):
+            ms, imported = import_profile(module)
+            samples.append(ms)
+        ms = statistics.median(samples)
+        budget = budget_ms * args.budget_scale
+        leaked = [dep for dep in forbidden if dep in imported]
+
+        status = "ok"
+        if ms > budget:
+            status = "OVER BUDGET"
+            failures.append(f"{module}: {ms:.1f} ms > {budget:.0f} ms")
+        if leaked:
+            status = "HEAVY IMPORT"
+            failures.append(f"{module}: imports {', '.join(leaked)}")
+        print(f"{module:40s} {ms:9.1f} ms  (budget {budget:6.0f} ms)  {status}")
+
+    if failures:
+        print("\nImport-time regressions:")
+        for f in failures:
+            print(f"  {f}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
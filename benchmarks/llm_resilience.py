@@ -0,0 +1,77 @@
+"""
+Drives ResilientClient against a flaky local StubClient (injected latency,
+errors and hangs) from many concurrent "sessions" and reports success rate,
+latency percentiles, upstream calls saved by coalescing, retries and timeouts.
+
+    python -m benchmarks.llm_resilience --sessions 32 --error-rate 0.2 --hang-rate 0.05
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from app.help.request_layer import ResilientClient
+from app.help.stub_client import StubClient
+
+QUESTIONS = [
+    "USER: how do I update an incident status\nASSISTANT:",
+    "USER: where are the ticket charts\nASSISTANT:",
+    "USER: how are datasets classified\nASSISTANT:",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM request layer resilience benchmark")
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5, help="requests per session")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--hang-rate", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--total-timeout", type=float, default=5.0)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    stub = StubClient(latency=args.latency, latency_jitter=args.jitter, error_rate=args.error_rate,
+                      hang_rate=args.hang_rate, hang_seconds=args.timeout * 3, seed=7)
+    client = ResilientClient(stub, timeout=args.timeout, total_timeout=args.total_timeout,
+                             max_concurrency=args.max_concurrency, backoff_base=0.05, backoff_max=0.5)
+
+    latencies, failures = [], []
+    lock = threading.Lock()
+
+    def session(i):
+        for r in range(args.requests):
+            prompt = QUESTIONS[(i + r) % len(QUESTIONS)]
+            start = time.perf_counter()
+            try:
+                client.models.generate_content(model="stub", contents=prompt)
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except Exception as exc:
+                with lock:
+                    failures.append(type(exc).__name__)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(args.sessions)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    total = args.sessions * args.requests
+    latencies.sort()
+    print(f"requests: {total} in {elapsed:.1f}s  succeeded: {len(latencies)}  failed: {len(failures)}")
+    if latencies:
+        print(f"latency p50={statistics.median(latencies) * 1000:.0f}ms  "
+              f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f}ms  max={latencies[-1] * 1000:.0f}ms")
+    print(f"upstream calls: {client.upstream_calls}  coalesced: {client.coalesced}  "
+          f"retries: {client.retried}  timeouts: {client.timeouts}")
+    if failures:
+        print("failure types:", {name: failures.count(name) for name in set(failures)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""
+Multi-session load test of one Streamlit server process.
+
+Starts the dashboard as a real Streamlit server (one worker process, pointed
+at the synthetic data, a scratch users DB and the stub assistant), then
+connects N simulated analysts to it over the same WebSocket protocol the
+browser uses. Each analyst logs in through homePage.py, then walks every
+pages/dashboard.py menu branch (and asks the assistant one question) for a
+number of rounds. All sessions are served concurrently by that one process,
+so they share its response cache, precompute thread, group-commit writer
+and bcrypt pool, as real users of one worker do.
+
+    python -m benchmarks.load_test --sessions 8 --rounds 3 --size 10k
+    python -m benchmarks.load_test --sessions 32 --branches "Cyber Security" "IT Operations"
+
+Reports per-branch rerun latency percentiles (request sent to script
+finished, as the browser sees it), overall reruns/second, the server's RSS
+(current and peak, from /proc on Linux), and the traceback of every page
+exception or failed session.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+import urllib.request
+
+# Before any app module reads it (the server process imports this module too)
+os.environ["HELP_BACKEND"] = "stub"
+
+from benchmarks.synthetic_data import ensure_data
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOME_PAGE = os.path.join(ROOT_DIR, "homePage.py")
+
+BRANCHES = ["Dashboard", "Cyber Security", "Data Science", "IT Operations", "CRUD", "Need Help/Ai"]
+PASSWORD = "LoadTest#2024"
+QUESTION = "Which incident categories have the most open phishing cases?"
+# Seconds allowed for the server to start answering health checks
+START_TIMEOUT = 120.0
+
+
+def _percentile(samples, q):
+    return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else 0.0
+
+
+def _rss_mb(pid):
+    """(current, peak) resident set size of a process in MB; (None, None) where /proc is unavailable."""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    name, kb = line.split()[:2]
+                    values[name] = int(kb) / 1024
+    except OSError:
+        pass
+    return values.get("VmRSS:"), values.get("VmHWM:")
+
+
+# =====================================================
+# SERVER PROCESS
+# =====================================================
+
+def configure_process(paths, users_db):
+    """Points every data path the pages use (in this process) at the synthetic data and scratch users DB."""
+    from app.cyber_security import cyber_incidents, dashboard_utils, user_db
+    from app.help import need_help, retrieval
+    from app.help.response_cache import ResponseCache
+
+    dashboard_utils.CYBER_CSV = paths["incidents_csv"]
+    dashboard_utils.DATASETS_CSV = paths["datasets_csv"]
+    dashboard_utils.TICKETS_CSV = paths["tickets_csv"]
+    cyber_incidents.DB_FILE = paths["incidents_db"]
+    cyber_incidents._db = cyber_incidents.CyberIncidentDB(db_path=paths["incidents_db"])
+    retrieval._retriever = retrieval.DashboardRetriever(
+        incidents_db=paths["incidents_db"], tickets_csv=paths["tickets_csv"], datasets_csv=paths["datasets_csv"]
+    )
+    need_help.response_cache = ResponseCache(db_path=None)
+    user_db.DB_FILE = users_db
+
+
+def register_users(users_db, sessions):
+    """Creates one account per session in the scratch users DB; returns the usernames."""
+    from app.cyber_security import user_db
+
+    user_db.DB_FILE = users_db
+    usernames = [f"analyst{i:03d}" for i in range(sessions)]
+    for name in usernames:
+        result = user_db.register_user(name, PASSWORD)
+        if not result["success"]:
+            raise RuntimeError(f"Could not register {name}: {result['message']}")
+    return usernames
+
+
+def serve(size, data_dir, users_db, port):
+    """Body of the server process: configures the app in-process, then runs Streamlit on it."""
+    from streamlit.web import bootstrap
+
+    configure_process(ensure_data(data_dir, size), users_db)
+    flags = {
+        "server_port": port,
+        "server_address": "127.0.0.1",
+        "server_headless": True,
+        "server_fileWatcherType": "none",
+        "server_runOnSave": False,
+        "browser_gatherUsageStats": False,
+        "client_showErrorDetails": "full",
+    }
+    # As `streamlit run` does: config first, then the server
+    bootstrap.load_config_options(flags)
+    bootstrap.run(HOME_PAGE, False, [], flags)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(size, data_dir, users_db, log_path):
+    """Starts `python -m benchmarks.load_test --serve` and waits until it is healthy; returns (process, port)."""
+    port = _free_port()
+    log = open(log_path, "w")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.load_test", "--serve", "--size", str(size),
+         "--data-dir", data_dir, "--users-db", users_db, "--port", str(port)],
+        cwd=ROOT_DIR, stdout=log, stderr=subprocess.STDOUT,
+    )
+    log.close()
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            break
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2) as resp:
+                if resp.status == 200:
+                    return proc, port
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    with open(log_path) as f:
+        raise RuntimeError(f"Streamlit server did not start:\n{f.read()}")
+
+
+# =====================================================
+# ONE SIMULATED SESSION (browser protocol client)
+# =====================================================
+
+class BrowserSession:
+    """
+    Minimal stand-in for the Streamlit frontend over one WebSocket: requests
+    reruns with the current page and widget values, and keeps the elements
+    of the last completed run so widgets can be found by label.
+    """
+
+    def __init__(self, port, timeout):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.timeout = timeout
+        self.ws = None
+        self.page_hash = ""
+        self.widgets = {}      # widget id -> WidgetState kept across reruns
+        self.elements = []     # (kind, proto) of the last run
+
+    async def connect(self):
+        import websockets
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def find(self, kind, label):
+        for element_kind, proto in self.elements:
+            if element_kind == kind and proto.label == label:
+                return proto
+        raise LookupError(f"No {kind} labelled {label!r} on page")
+
+    def set_value(self, kind, label, field, value):
+        state = self._state(self.find(kind, label).id)
+        setattr(state, field, value)
+
+    async def click(self, label):
+        return await self.rerun(triggers={self.find("button", label).id: "trigger_value"})
+
+    async def chat(self, text):
+        widget_id = next(p.id for kind, p in self.elements if kind == "chat_input")
+        return await self.rerun(chat={widget_id: text})
+
+    def _state(self, widget_id):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        if widget_id not in self.widgets:
+            self.widgets[widget_id] = WidgetState(id=widget_id)
+        return self.widgets[widget_id]
+
+    async def rerun(self, triggers=None, chat=None):
+        """Requests a rerun and waits for the script to finish; returns the page's exception texts."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = self.page_hash
+        states = msg.rerun_script.widget_states.widgets
+        states.extend(self.widgets.values())
+        # Buttons and chat input fire for one rerun only
+        for widget_id, field in (triggers or {}).items():
+            setattr(states.add(id=widget_id), field, True)
+        for widget_id, text in (chat or {}).items():
+            states.add(id=widget_id).chat_input_value.data = text
+        await self.ws.send(msg.SerializeToString())
+
+        elements, errors = [], []
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.timeout))
+            kind = reply.WhichOneof("type")
+            if kind == "new_session":
+                # Also sent when the script switches page or reruns itself
+                self.page_hash = reply.new_session.page_script_hash
+                elements = []
+            elif kind == "delta" and reply.delta.WhichOneof("type") == "new_element":
+                element = reply.delta.new_element
+                element_kind = element.WhichOneof("type")
+                proto = getattr(element, element_kind)
+                elements.append((element_kind, proto))
+                if element_kind == "exception":
+                    errors.append("\n".join([proto.message] + list(proto.stack_trace)))
+            elif kind == "script_finished":
+                if reply.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if reply.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    errors.append("Script failed to compile")
+                self.elements = elements
+                return errors
+
+
+async def run_session(port, username, branches, rounds, timeout, record):
+    """Logs in, then reruns the dashboard on every branch `rounds` times."""
+    session = BrowserSession(port, timeout)
+
+    async def timed_run(branch, action):
+        start = time.perf_counter()
+        errors = await action
+        record(branch, time.perf_counter() - start, "\n\n".join(errors) or None)
+
+    try:
+        await session.connect()
+        await timed_run("initial render", session.rerun())
+        session.set_value("text_input", "Username", "string_value", username)
+        session.set_value("text_input", "Password", "string_value", PASSWORD)
+        await timed_run("login", session.click("Log in"))
+        if not any(kind == "selectbox" and p.label == "Main Menu" for kind, p in session.elements):
+            record("login", 0.0, f"{username} could not log in")
+            return
+
+        for _ in range(rounds):
+            for branch in branches:
+                session.set_value("selectbox", "Main Menu", "string_value", branch)
+                await timed_run(branch, session.rerun())
+                if branch == "Need Help/Ai" and any(kind == "chat_input" for kind, _ in session.elements):
+                    await timed_run("Need Help/Ai (question)", session.chat(QUESTION))
+    finally:
+        await session.close()
+
+
+async def _run_sessions(port, usernames, branches, rounds, timeout):
+    results = []
+
+    async def one(username):
+        result = {"username": username, "samples": {}, "failures": [], "crash": None}
+
+        def record(branch, seconds, failure):
+            result["samples"].setdefault(branch, []).append(seconds)
+            if failure:
+                result["failures"].append({"branch": branch, "traceback": failure})
+
+        try:
+            await run_session(port, username, branches, rounds, timeout, record)
+        except Exception:
+            result["crash"] = traceback.format_exc()
+        results.append(result)
+
+    await asyncio.gather(*(one(name) for name in usernames))
+    return results
+
+
+# =====================================================
+# DRIVER
+# =====================================================
+
+def run_load_test(sessions, rounds, size, data_dir, branches=BRANCHES, timeout=120.0):
+    ensure_data(data_dir, size)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        users_db = os.path.join(work_dir, "USER_DATABASE.db")
+        usernames = register_users(users_db, sessions)
+        log_path = os.path.join(work_dir, "server.log")
+        server, port = start_server(size, data_dir, users_db, log_path)
+        try:
+            rss_before, _ = _rss_mb(server.pid)
+            started = time.perf_counter()
+            results = asyncio.run(_run_sessions(port, usernames, branches, rounds, timeout))
+            elapsed = time.perf_counter() - started
+            rss_after, rss_peak = _rss_mb(server.pid)
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    samples, errors = {}, {}
+    for r in results:
+        for branch, values in r["samples"].items():
+            samples.setdefault(branch, []).extend(values)
+        for failure in r["failures"]:
+            errors[failure["branch"]] = errors.get(failure["branch"], 0) + 1
+
+    reruns = sum(len(v) for v in samples.values())
+    report = {
+        "sessions": sessions,
+        "rounds": rounds,
+        "size": str(size),
+        "elapsed_seconds": elapsed,
+        "reruns": reruns,
+        "reruns_per_second": reruns / elapsed if elapsed else 0.0,
+        "server_rss_mb_start": rss_before,
+        "server_rss_mb_end": rss_after,
+        "server_rss_mb_peak": rss_peak,
+        "crashed_sessions": {r["username"]: r["crash"] for r in results if r["crash"]},
+        "failures": {r["username"]: r["failures"] for r in results if r["failures"]},
+        "branches": {},
+    }
+    for branch, values in samples.items():
+        values.sort()
+        report["branches"][branch] = {
+            "reruns": len(values),
+            "errors": errors.get(branch, 0),
+            "p50": _percentile(values, 0.50),
+            "p95": _percentile(values, 0.95),
+            "p99": _percentile(values, 0.99),
+            "max": values[-1],
+        }
+    return report
+
+
+def print_report(report):
+    def mb(value):
+        return "n/a" if value is None else f"{value:.0f} MB"
+
+    print(f"\n{report['sessions']} sessions x {report['rounds']} rounds on {report['size']} rows, one server process: "
+          f"{report['reruns']} reruns in {report['elapsed_seconds']:.1f}s "
+          f"({report['reruns_per_second']:.1f} reruns/s)")
+    print(f"server RSS: {mb(report['server_rss_mb_start'])} before, {mb(report['server_rss_mb_end'])} after, "
+          f"peak {mb(report['server_rss_mb_peak'])}\n")
+    print(f"{'branch':28s} {'reruns':>7s} {'errors':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    for branch, s in report["branches"].items():
+        print(f"{branch:28s} {s['reruns']:7d} {s['errors']:7d} {s['p50'] * 1000:9.1f} "
+              f"{s['p95'] * 1000:9.1f} {s['p99'] * 1000:9.1f} {s['max'] * 1000:9.1f}")
+    for username, failures in report["failures"].items():
+        for failure in failures:
+            print(f"\n--- {username}: exception on {failure['branch']} ---\n{failure['traceback']}")
+    for username, crash in report["crashed_sessions"].items():
+        print(f"\n--- {username}: session crashed ---\n{crash}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test of one Streamlit server process")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the branches per session")
+    parser.add_argument("--size", default="10k", help="synthetic data size: 10k, 1m, 10m or a row count")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "dashboard_synthetic"))
+    parser.add_argument("--branches", nargs="+", default=BRANCHES, choices=BRANCHES)
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per rerun")
+    parser.add_argument("--output", default=None, help="also write the report as JSON")
+    # Internal: run the server process (started by run_load_test)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--users-db", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.size, args.data_dir, args.users_db, args.port)
+        return
+
+    report = run_load_test(args.sessions, args.rounds, args.size, args.data_dir, args.branches, args.timeout)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    sys.exit(1 if report["crashed_sessions"] or report["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Concurrency benchmark for logins/sec.
+
+Runs authenticate_user from N concurrent threads against a throwaway user DB
+and reports throughput and latency percentiles.
+
+    python -m benchmarks.login_throughput --threads 8 --seconds 10
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from app import auth
+from app.cyber_security import user_db
+
+
+def _setup_users(count: int, password: str):
+    for i in range(count):
+        user_db.register_user(f"bench{i}", password)
+
+
+def run(threads: int, seconds: float, users: int, password: str) -> dict:
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(idx):
+        local = []
+        n = idx
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            ok = user_db.authenticate_user(f"bench{n % users}", password)
+            local.append(time.perf_counter() - start)
+            assert ok, "benchmark login failed"
+            n += threads
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "threads": threads,
+        "logins": len(latencies),
+        "logins_per_sec": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login throughput benchmark")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        user_db.DB_FILE = os.path.join(tmp, "bench_users.db")
+        user_db.create_users_table()
+        password = "benchpass123"
+        _setup_users(args.users, password)
+
+        print(f"bcrypt cost={auth.get_bcrypt_rounds()} hash workers={auth.HASH_WORKERS}")
+        for n in args.threads:
+            r = run(n, args.seconds, args.users, password)
+            print(
+                f"threads={r['threads']:>3}  logins={r['logins']:>6}  "
+                f"logins/sec={r['logins_per_sec']:8.1f}  p50={r['p50_ms']:7.1f}ms  p95={r['p95_ms']:7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+BM25 retrieval latency over synthetic incident/ticket rows.
+
+    python -m benchmarks.retrieval_latency --rows 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.help.retrieval import BM25Index
+
+CATEGORIES = ["Phishing", "Malware", "DDoS", "Unauthorized Access", "Misconfiguration"]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+STAFF = ["IT_Support_A", "IT_Support_B", "IT_Support_C"]
+QUERIES = [
+    "critical phishing incidents still open",
+    "ticket 2042 waiting for user",
+    "ddos incident 1000123",
+    "which tickets are assigned to IT_Support_C",
+    "unauthorized access high severity",
+]
+
+
+def _row(i, rng):
+    if i % 2:
+        return (
+            f"incident:{i}",
+            f"Cyber incident {i} | severity {rng.choice(SEVERITIES)} | category {rng.choice(CATEGORIES)} "
+            f"| status {rng.choice(STATUSES)} | Incident {i} description",
+        )
+    return (
+        f"ticket:{i}",
+        f"IT ticket {i} | priority {rng.choice(SEVERITIES)} | status {rng.choice(STATUSES)} "
+        f"| assigned to {rng.choice(STAFF)} | Ticket {i} problem description",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 retrieval latency benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--k", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    index = BM25Index()
+    start = time.perf_counter()
+    for i in range(args.rows):
+        index.upsert(*_row(i, rng))
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(0, min(args.rows, 10_000), 10):
+        index.upsert(*_row(i, rng))
+    update_us = (time.perf_counter() - start) / max(1, min(args.rows, 10_000) // 10) * 1e6
+
+    print(f"indexed {len(index)} rows in {build_s:.1f}s; incremental upsert {update_us:.1f} us/row")
+    for query in QUERIES:
+        index.search(query, args.k)   # first query builds the term's weight arrays
+        samples = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            index.search(query, args.k)
+            samples.append(time.perf_counter() - t)
+        print(f"{statistics.median(samples) * 1000:9.2f} ms  {query}")
+
+
+if __name__ == "__main__":
+    main()
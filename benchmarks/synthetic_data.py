@@ -0,0 +1,191 @@
+"""
+Deterministic synthetic data for cyber_incidents, it_tickets and
+datasets_metadata, shaped like the shipped CSVs (same columns, value sets
+and rough proportions) but at any scale.
+
+    python -m benchmarks.synthetic_data --size 1m --out /tmp/synth
+    python -m benchmarks.synthetic_data --size 10k --out /tmp/synth --db
+
+Sizes: 10k, 1m, 10m (or a plain row count), used for all three tables;
+--datasets-rows sizes datasets_metadata separately. The same seed and
+sizes always produce byte-identical files.
+"""
+import argparse
+import csv
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+# Bumped whenever generated content changes, so cached data dirs are regenerated
+DATA_VERSION = 2
+
+# Value sets and weights follow the shipped sample data
+SEVERITIES = (["Low", "Medium", "High", "Critical"], [35, 49, 26, 5])
+CATEGORIES = (["Phishing", "Malware", "DDoS", "Misconfiguration", "Unauthorized Access"], [62, 22, 13, 9, 9])
+INCIDENT_STATUSES = (["Open", "In Progress", "Resolved", "Closed"], [22, 33, 41, 19])
+PRIORITIES = (["Low", "Medium", "High", "Critical"], [40, 65, 36, 9])
+TICKET_STATUSES = (["Open", "In Progress", "Resolved", "Waiting for User"], [26, 22, 89, 13])
+STAFF = ["IT_Support_A", "IT_Support_B", "IT_Support_C"]
+UPLOADERS = ["data_scientist", "cyber_admin", "it_admin", "analyst", "ml_engineer"]
+DATASET_TOPICS = ["Customer", "Financial", "Server", "Image", "HR", "Network", "Sales", "Sensor"]
+
+START = datetime(2024, 1, 1)
+INCIDENT_COLUMNS = ["incident_id", "timestamp", "severity", "category", "status", "description"]
+TICKET_COLUMNS = ["ticket_id", "priority", "description", "status", "assigned_to", "created_at",
+                  "resolution_time_hours"]
+DATASET_COLUMNS = ["dataset_id", "name", "rows", "columns", "uploaded_by", "upload_date"]
+
+
+def parse_size(size) -> int:
+    return SIZES.get(str(size).lower()) or int(size)
+
+
+def _picker(rng, values_weights, n):
+    values, weights = values_weights
+    return rng.choices(values, weights=weights, k=n)
+
+
+def generate_incidents(n, seed=1, chunk=100_000, start_id=1000):
+    """Yields incident rows (tuples in INCIDENT_COLUMNS order), one year of hourly timestamps."""
+    rng = random.Random(seed)
+    for base in range(0, n, chunk):
+        size = min(chunk, n - base)
+        sev = _picker(rng, SEVERITIES, size)
+        cat = _picker(rng, CATEGORIES, size)
+        status = _picker(rng, INCIDENT_STATUSES, size)
+        for j in range(size):
+            i = base + j
+            ts = START + timedelta(hours=rng.randrange(365 * 24))
+            yield (start_id + i, ts.strftime("%Y-%m-%d %H:%M:%S.000000"), sev[j], cat[j], status[j],
+                   f"Incident {i} description")
+
+
+def generate_tickets(n, seed=2, chunk=100_000, start_id=2000):
+    """Yields ticket rows (tuples in TICKET_COLUMNS order)."""
+    rng = random.Random(seed)
+    for base in range(0, n, chunk):
+        size = min(chunk, n - base)
+        prio = _picker(rng, PRIORITIES, size)
+        status = _picker(rng, TICKET_STATUSES, size)
+        for j in range(size):
+            i = base + j
+            created = START + timedelta(hours=rng.randrange(365 * 24))
+            staff = STAFF[rng.randrange(3)]
+            # IT_Support_C is slower on average, as in the sample data
+            hours = rng.randint(1, 60) + (30 if staff == "IT_Support_C" else 0)
+            yield (start_id + i, prio[j], f"Ticket {i} problem description", status[j], staff,
+                   created.strftime("%Y-%m-%d %H:%M:%S"), hours)
+
+
+def generate_datasets(n, seed=3):
+    """Yields dataset metadata rows (tuples in DATASET_COLUMNS order)."""
+    rng = random.Random(seed)
+    for i in range(n):
+        uploaded = START + timedelta(days=rng.randrange(365))
+        yield (i + 1, f"{DATASET_TOPICS[i % len(DATASET_TOPICS)]}_{i}", int(10 ** rng.uniform(3, 6.5)),
+               rng.randint(3, 40), UPLOADERS[rng.randrange(len(UPLOADERS))], uploaded.strftime("%Y-%m-%d"))
+
+
+def write_csv(path, columns, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    return path
+
+
+def write_incidents_db(path, rows, batch=50_000):
+    """Bulk-loads incident rows into a cyber_incidents table with the app's schema."""
+    from app.cyber_security.cyber_incidents import CyberIncidentDB
+    CyberIncidentDB(db_path=path)   # creates the table
+    conn = sqlite3.connect(path)
+    try:
+        buf = []
+        for row in rows:
+            buf.append(row)
+            if len(buf) >= batch:
+                conn.executemany("INSERT OR IGNORE INTO cyber_incidents VALUES (?, ?, ?, ?, ?, ?)", buf)
+                buf.clear()
+        if buf:
+            conn.executemany("INSERT OR IGNORE INTO cyber_incidents VALUES (?, ?, ?, ?, ?, ?)", buf)
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def data_paths(out_dir):
+    return {
+        "incidents_csv": os.path.join(out_dir, "cyber_incidents.csv"),
+        "tickets_csv": os.path.join(out_dir, "it_tickets.csv"),
+        "datasets_csv": os.path.join(out_dir, "datasets_metadata.csv"),
+        "incidents_db": os.path.join(out_dir, "CYBER_INCIDENTS.db"),
+    }
+
+
+def generate_all(out_dir, size, seed=1, with_db=False, datasets_rows=None):
+    """
+    Writes cyber_incidents.csv, it_tickets.csv and datasets_metadata.csv
+    (plus CYBER_INCIDENTS.db when with_db) for one size; returns their paths.
+    Every table gets `size` rows unless datasets_rows is given.
+    """
+    n = parse_size(size)
+    datasets_n = n if datasets_rows is None else parse_size(datasets_rows)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {
+        "incidents_csv": write_csv(os.path.join(out_dir, "cyber_incidents.csv"), INCIDENT_COLUMNS,
+                                   generate_incidents(n, seed)),
+        "tickets_csv": write_csv(os.path.join(out_dir, "it_tickets.csv"), TICKET_COLUMNS,
+                                 generate_tickets(n, seed + 1)),
+        "datasets_csv": write_csv(os.path.join(out_dir, "datasets_metadata.csv"), DATASET_COLUMNS,
+                                  generate_datasets(datasets_n, seed + 2)),
+    }
+    if with_db:
+        db_path = os.path.join(out_dir, "CYBER_INCIDENTS.db")
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        paths["incidents_db"] = write_incidents_db(db_path, generate_incidents(n, seed))
+    with open(os.path.join(out_dir, ".version"), "w") as f:
+        f.write(f"{DATA_VERSION} {n} {datasets_n} {seed}\n")
+    return paths
+
+
+def ensure_data(data_dir, size, with_db=True):
+    """
+    Paths of the default synthetic data for `size` under data_dir/size,
+    (re)generated if any file is missing or was written by an older version.
+    """
+    size_dir = os.path.join(data_dir, str(size))
+    paths = data_paths(size_dir)
+    if not with_db:
+        del paths["incidents_db"]
+    n = parse_size(size)
+    try:
+        with open(os.path.join(size_dir, ".version")) as f:
+            current = f.read().strip() == f"{DATA_VERSION} {n} {n} 1"
+    except OSError:
+        current = False
+    if not current or not all(os.path.exists(p) for p in paths.values()):
+        print(f"Generating synthetic data ({n:,} rows) in {size_dir} ...")
+        paths = generate_all(size_dir, size, with_db=with_db)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic dashboard data")
+    parser.add_argument("--size", default="10k", help="10k, 1m, 10m or a row count")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--db", action="store_true", help="also build a CYBER_INCIDENTS.db")
+    parser.add_argument("--datasets-rows", default=None,
+                        help="rows of datasets_metadata (default: same as --size)")
+    args = parser.parse_args()
+
+    for name, path in generate_all(args.out, args.size, args.seed, args.db, args.datasets_rows).items():
+        print(f"{name:14s} {path}  ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
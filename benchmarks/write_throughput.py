@@ -0,0 +1,108 @@
+"""
+Write throughput benchmark for CyberIncidentDB: direct vs group commit.
+
+N concurrent sessions (threads) each insert incidents and then update their
+status, against a fresh throwaway DB per run. "direct" is one transaction
+per write (CyberIncidentDB.insert/update_status); "queued" submits through
+the GroupCommitWriter and waits for each write's acknowledgement, as the
+page wrappers do.
+
+    python -m benchmarks.write_throughput --sessions 1 4 16 64 --writes 200
+    python -m benchmarks.write_throughput --max-batch 64 --max-delay-ms 1
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from app.cyber_security.cyber_incidents import CyberIncidentDB
+from app.cyber_security.write_queue import GroupCommitWriter, MAX_BATCH, MAX_DELAY
+from benchmarks.synthetic_data import generate_incidents
+
+ROW_KEYS = ["incident_id", "timestamp", "severity", "category", "status", "description"]
+
+
+def _session_rows(session, writes):
+    """Distinct incidents per session (ids never collide across sessions)."""
+    return [
+        dict(zip(ROW_KEYS, row))
+        for row in generate_incidents(writes, seed=session, start_id=1000 + session * writes)
+    ]
+
+
+def run(mode, sessions, writes, work_dir, max_batch, max_delay):
+    db_path = os.path.join(work_dir, f"{mode}_{sessions}.db")
+    db = CyberIncidentDB(db_path=db_path, column_store=False)
+    writer = GroupCommitWriter(db, max_batch=max_batch, max_delay=max_delay) if mode == "queued" else None
+    rows = [_session_rows(s, writes) for s in range(sessions)]
+    latencies = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(sessions + 1)
+
+    def session(idx):
+        local = []
+        start_gate.wait()
+        for row in rows[idx]:
+            for kind, args in (("insert", (row,)), ("update_status", (int(row["incident_id"]), "Resolved"))):
+                t0 = time.perf_counter()
+                if writer is None:
+                    getattr(db, kind)(*args)
+                else:
+                    writer.submit(kind, *args).result()
+                local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for t in pool:
+        t.start()
+    start_gate.wait()
+    started = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    conn = db._connect()
+    stored, resolved = conn.execute(
+        "SELECT COUNT(*), SUM(status = 'Resolved') FROM cyber_incidents"
+    ).fetchone()
+    conn.close()
+    assert stored == sessions * writes, "lost writes"
+    assert resolved == stored, "lost status updates"
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "writes": len(latencies),
+        "writes_per_sec": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "mean_batch": writer.mean_batch if writer else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CyberIncidentDB write throughput: direct vs group commit")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--writes", type=int, default=100, help="incidents per session (each is inserted and updated)")
+    parser.add_argument("--modes", nargs="+", choices=["direct", "queued"], default=["direct", "queued"])
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-delay-ms", type=float, default=MAX_DELAY * 1000)
+    args = parser.parse_args()
+
+    print(f"max_batch={args.max_batch} max_delay={args.max_delay_ms:g}ms writes/session={args.writes * 2}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sessions:
+            for mode in args.modes:
+                r = run(mode, n, args.writes, tmp, args.max_batch, args.max_delay_ms / 1000)
+                print(
+                    f"{r['mode']:>6}  sessions={r['sessions']:>3}  writes={r['writes']:>6}  "
+                    f"writes/sec={r['writes_per_sec']:9.1f}  p50={r['p50_ms']:7.2f}ms  "
+                    f"p99={r['p99_ms']:7.2f}ms  batch={r['mean_batch']:6.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,13 @@
-import streamlit as st
-import pandas as pd
 import os
+import time
 
-# ---- Internal imports: your app modules ----
-from app.cyber_security.dashboard_utils import load_all_dashboard_data
-from app.cyber_security.cyber_incidents import (
-    insert_incident,
-    update_incident_status,
-    delete_incident,
-    create_table,                  # Make sure the SQLite table exists
-    get_all_incidents,             # Read all incidents from DB
-    phishing_trend_over_time,      # Phishing trend from DB
-    unresolved_per_category,       # Unresolved incidents per category
-    high_severity_open_incidents,  # High/Critical unresolved incidents
-)
-from app.data_science.dataset_metadata import (
-    load_datasets_csv,
-    dataset_resource_analysis,
-    dataset_source_dependency,
-)
+import streamlit as st
+
+from app.services.metrics import observe
 
-# IT Operations: OOP analytics class
-from app.it_operations.it_operations import TicketAnalytics
+# Domain modules (and pandas with them) are imported inside the menu branch
+# that needs them, so the login check and sidebar render without paying for
+# every page's imports and DB setup.
 
 # -------------------------------------------------
 # BASIC PAGE CONFIGURATION
@@ -60,7 +46,14 @@ menu = [
     "Need Help/Ai",
     "Logout"
 ]
+# The Performance panel is only offered to the usernames in DASHBOARD_ADMINS
+# (comma-separated). Empty by default: usernames are self-registered, so no
+# name is trusted unless the operator lists it.
+DASHBOARD_ADMINS = {u.strip() for u in os.environ.get("DASHBOARD_ADMINS", "").split(",") if u.strip()}
+if st.session_state.username in DASHBOARD_ADMINS:
+    menu.insert(-1, "Performance")
 choice = st.sidebar.selectbox("Main Menu", menu)
+page_started = time.perf_counter()
 
 # =================================================
 # 1) MAIN DASHBOARD OVERVIEW
@@ -68,13 +61,24 @@ choice = st.sidebar.selectbox("Main Menu", menu)
 if choice == "Dashboard":
     st.subheader("Overview")
 
-    # Load summary data for all three domains
-    cyber_df, dataset_df, it_df = load_all_dashboard_data()
+    from app.services.paginated_table import render_paginated_table
+    from app.services.precompute import get_scheduler, staleness_caption
+
+    # Paged views over the three domain CSVs, loaded by the precompute thread
+    scheduler = get_scheduler()
+    overview = scheduler.read("overview")
+    if overview is None:
+        st.error("The overview data could not be loaded.")
+        st.stop()
+    st.caption(staleness_caption(scheduler, overview))
+    cyber_src = overview.value["cyber"]
+    dataset_src = overview.value["datasets"]
+    it_src = overview.value["tickets"]
 
     # ---- Cyber Incidents Section ----
     st.markdown("###  Cyber Incidents")
-    if not cyber_df.empty:
-        st.dataframe(cyber_df, use_container_width=True)
+    if cyber_src is not None and cyber_src.count():
+        render_paginated_table(cyber_src, key="overview_cyber")
         st.markdown(
             """
             **Dashboard Objective (Cyber):**
@@ -87,8 +91,8 @@ if choice == "Dashboard":
 
     # ---- Dataset Metadata Section ----
     st.markdown("###  Dataset Metadata")
-    if not dataset_df.empty:
-        st.dataframe(dataset_df, use_container_width=True)
+    if dataset_src is not None and dataset_src.count():
+        render_paginated_table(dataset_src, key="overview_datasets")
         st.markdown(
             """
             **Dashboard Objective (Data Science):**
@@ -101,8 +105,8 @@ if choice == "Dashboard":
 
     # ---- IT Tickets Section ----
     st.markdown("### IT Tickets")
-    if not it_df.empty:
-        st.dataframe(it_df, use_container_width=True)
+    if it_src is not None and it_src.count():
+        render_paginated_table(it_src, key="overview_tickets")
         st.markdown(
             """
             **Dashboard Objective (IT Operations):**
@@ -113,42 +117,105 @@ if choice == "Dashboard":
     else:
         st.info("`it_tickets.csv` is missing or empty.")
 
+    # ---- Cross-Domain Correlation ----
+    st.markdown("### Incidents vs IT Tickets")
+    st.caption(
+        "Tickets created within a time window around each cyber incident. "
+        "Categories or staff with many correlated tickets may point to incidents that spill over into IT support."
+    )
+    from app.services.correlation import correlate_dashboard_data
+    from app.services.paginated_table import DataFrameTableSource
+
+    col_before, col_after = st.columns(2)
+    before_hours = col_before.number_input("Hours before incident", min_value=0.0, value=0.0, step=1.0, key="corr_before")
+    after_hours = col_after.number_input("Hours after incident", min_value=0.0, value=24.0, step=1.0, key="corr_after")
+    try:
+        corr = correlate_dashboard_data(before_hours, after_hours)
+    except (OSError, KeyError, ValueError) as e:
+        corr = None
+        st.info(f"Correlation unavailable: {e}")
+
+    if corr is not None and corr.total_pairs:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Correlated Pairs", f"{corr.total_pairs:,}")
+        col2.metric("Incidents with Tickets", int(corr.by_category["correlated_incidents"].sum()))
+        col3.metric("Tickets near Incidents", int(corr.by_staff["correlated_tickets"].sum()))
+
+        col_cat, col_staff = st.columns(2)
+        with col_cat:
+            st.markdown("**Tickets in window per incident category**")
+            st.bar_chart(corr.by_category.set_index("category")["tickets_in_window"])
+        with col_staff:
+            st.markdown("**Incidents in window per staff member**")
+            st.bar_chart(corr.by_staff.set_index("assigned_to")["incidents_in_window"])
+
+        st.markdown("**Correlated pairs**")
+        if len(corr.pairs) < corr.total_pairs:
+            st.caption(f"Showing the first {len(corr.pairs):,} of {corr.total_pairs:,} pairs, by incident time.")
+        render_paginated_table(DataFrameTableSource(corr.pairs), key="overview_correlation")
+    elif corr is not None:
+        st.info("No tickets were created within this window of any incident.")
+
 # =================================================
 # 2) CYBER SECURITY ANALYTICS (FROM SQLITE DB)
 # =================================================
 elif choice == "Cyber Security":
     st.subheader("Cyber Incident Insights")
 
-    # Ensure the database table exists
-    create_table()
-
-    # Fetch all incidents from SQLite
-    cyber_df = get_all_incidents()
+    import pandas as pd
+    from app.cyber_security.cyber_incidents import high_severity_open_source
+    from app.services.paginated_table import render_paginated_table
+    from app.services.precompute import get_scheduler, staleness_caption
+
+    # KPIs, trend and backlog (one consistent read transaction) plus detected
+    # spikes, refreshed by the precompute thread; the open list is paged from SQLite
+    scheduler = get_scheduler()
+    cyber = scheduler.read("cyber")
+    if cyber is None:
+        st.error("The incident aggregates could not be computed.")
+        st.stop()
+    st.caption(staleness_caption(scheduler, cyber))
+    snapshot = cyber.value["snapshot"]
 
-    if cyber_df.empty:
+    if snapshot.total == 0:
         st.info("No cyber incidents have been logged yet.")
     else:
-        # Clean up column names for consistency
-        cyber_df.columns = [c.strip().lower().replace(" ", "_") for c in cyber_df.columns]
-        # Expected: incident_id, timestamp, severity, category, status, description
-
         # ---- Key Metrics ----
-        total_incidents = len(cyber_df)
-        unresolved_count = len(cyber_df[~cyber_df["status"].isin(["Closed", "Resolved"])])
-        phishing_count = len(cyber_df[cyber_df["category"].str.lower() == "phishing"])
-
         col1, col2, col3 = st.columns(3)
-        col1.metric("Total Logged Incidents", total_incidents)
-        col2.metric("Pending/Active Incidents", unresolved_count)
-        col3.metric("Phishing Cases", phishing_count)
+        col1.metric("Total Logged Incidents", snapshot.total)
+        col2.metric("Pending/Active Incidents", snapshot.unresolved)
+        col3.metric("Phishing Cases", snapshot.phishing)
+
+        # ---- Campaign / Spike Detection ----
+        st.markdown("### Active Incident Spikes")
+        st.caption(
+            "Categories whose latest daily incident count is well above their usual rate "
+            "(EWMA baseline, updated as each incident is logged)."
+        )
+        spikes = cyber.value["spikes"]
+        if spikes:
+            for spike in spikes:
+                st.warning(
+                    f"**{spike.category}**: {spike.count} incidents on {spike.bucket} "
+                    f"(usually ~{spike.expected:.1f}/day, z = {spike.zscore:.1f})"
+                )
+        else:
+            st.success("No category is currently above its usual incident rate.")
+        events = cyber.value["spike_events"]
+        if events:
+            with st.expander("Past spikes"):
+                st.dataframe(
+                    pd.DataFrame(events)[["bucket", "category", "count", "expected", "zscore"]],
+                    width="stretch", hide_index=True,
+                )
 
         # ---- Phishing Incidents Over Time ----
         st.markdown("### Phishing Activity Timeline")
         st.caption(
-            "Visualizes the number of phishing incidents over time. "
+            "Visualizes the number of phishing incidents per day. "
             "Noticeable spikes may indicate concentrated attack campaigns."
         )
-        trend_df = phishing_trend_over_time()
+        trend_df = snapshot.phishing_trend
         if not trend_df.empty:
             st.line_chart(trend_df.set_index("Timestamp")["Count"])
         else:
@@ -159,7 +226,7 @@ elif choice == "Cyber Security":
         st.caption(
             "Categories with the most unresolved incidents highlight potential operational bottlenecks."
         )
-        bottleneck_df = unresolved_per_category()
+        bottleneck_df = snapshot.unresolved_by_category
         if not bottleneck_df.empty:
             st.bar_chart(bottleneck_df.set_index("Category")["Unresolved"])
         else:
@@ -171,8 +238,7 @@ elif choice == "Cyber Security":
             "Shows all High/Critical incidents that are still unresolved. "
             "SOC teams should address these with top priority."
         )
-        high_df = high_severity_open_incidents()
-        if not high_df.empty:
+        if snapshot.high_open_count:
             st.markdown(
                 """
                 **Insights:**  
@@ -181,10 +247,34 @@ elif choice == "Cyber Security":
                 - High-risk threats are not being mitigated quickly enough.  
                 """
             )
-            st.dataframe(high_df, use_container_width=True)
+            render_paginated_table(
+                high_severity_open_source(), key="cyber_high_open",
+                default_sort="timestamp", default_descending=True,
+            )
         else:
             st.success("No active High/Critical incidents. Excellent work!")
 
+        # ---- Export ----
+        with st.expander("Export incidents"):
+            from app.services.exporters import count_incident_rows, export_incidents, render_export_button
+
+            col1, col2, col3 = st.columns(3)
+            severities = col1.multiselect("Severity", ["Low", "Medium", "High", "Critical"], key="exp_severity")
+            statuses = col2.multiselect("Status", ["Open", "In Progress", "Resolved", "Closed"], key="exp_status")
+            categories = col3.multiselect("Category", cyber.value["categories"], key="exp_category")
+            date_range = st.date_input("Date range (optional)", value=[], key="exp_dates")
+            since, until = (date_range[0], date_range[-1]) if len(date_range) else (None, None)
+            filters = dict(severity=severities, status=statuses, category=categories, since=since, until=until)
+
+            # Rows are streamed from SQLite in chunks when the button is clicked
+            render_export_button(
+                "Download incidents",
+                lambda fmt: export_incidents(fmt, **filters),
+                file_stem="cyber_incidents",
+                key="exp_incidents",
+                row_count=count_incident_rows(**filters) if any(filters.values()) else snapshot.total,
+            )
+
 
 # =================================================
 # 3) CRUD: MANAGE CYBER INCIDENTS
@@ -194,6 +284,14 @@ elif choice == "CRUD":
 
     st.caption("Add new incidents or update/delete existing ones stored in the SQLite database.")
 
+    from app.cyber_security.cyber_incidents import (
+        insert_incident,
+        update_incident_status,
+        delete_incident,
+        create_table,
+    )
+    from app.services.precompute import get_scheduler
+
     # Ensure table exists
     create_table()
 
@@ -222,6 +320,7 @@ elif choice == "CRUD":
                 "status": status,
                 "description": description
             })
+            get_scheduler().trigger()
             st.success(" Incident added successfully!")
 
     # ---- UPDATE INCIDENT STATUS ----
@@ -237,6 +336,7 @@ elif choice == "CRUD":
 
         if st.button("Update Status"):
             update_incident_status(incident_id, new_status)
+            get_scheduler().trigger()
             st.success(f" Incident {incident_id} status updated to **{new_status}**.")
 
     # ---- DELETE INCIDENT ----
@@ -246,6 +346,7 @@ elif choice == "CRUD":
         incident_id = st.number_input("Incident ID to delete", min_value=1, step=1, key="delete_id")
         if st.button("Delete Incident"):
             delete_incident(incident_id)
+            get_scheduler().trigger()
             st.success(f"Incident {incident_id} deleted successfully.")
 
 # =================================================
@@ -256,23 +357,29 @@ elif choice == "Data Science":
 
     st.caption("Analyze dataset size, usage, and dependencies to support data governance decisions.")
 
-    # Load dataset metadata from CSV
-    df = load_datasets_csv()
+    from app.services.paginated_table import render_paginated_table
+    from app.services.precompute import get_scheduler, staleness_caption
+
+    # Dataset metadata (column names normalized) and both analyses, from the precompute thread
+    scheduler = get_scheduler()
+    datasets = scheduler.read("datasets")
+    if datasets is None:
+        st.error("The dataset analytics could not be computed.")
+        st.stop()
+    df = datasets.value["df"]
 
     if df.empty:
         st.info("`datasets_metadata.csv` is missing or empty. No dataset analytics available.")
         st.stop()
-
-    # Normalize column names (lowercase etc.)
-    df.columns = [c.strip().lower() for c in df.columns]
+    st.caption(staleness_caption(scheduler, datasets))
 
     # ---- Raw Metadata ----
     st.markdown("###  Raw Dataset Metadata")
-    st.dataframe(df, use_container_width=True)
+    render_paginated_table(datasets.value["df_source"], key="ds_raw")
 
     # ---- 1. Dataset Resource Consumption ----
     st.markdown("## 1️ Dataset Resource Consumption")
-    resource_df = dataset_resource_analysis(df)
+    resource_df = datasets.value["resource"]
 
     st.markdown(
         """
@@ -282,7 +389,7 @@ elif choice == "Data Science":
         """
     )
 
-    st.dataframe(resource_df, width="stretch")
+    render_paginated_table(datasets.value["resource_source"], key="ds_resource")
 
     # The bar chart of size score
     st.markdown("### 1.1 Dataset Size Score Comparison")
@@ -291,7 +398,7 @@ elif choice == "Data Science":
 
     # ---- 2. Dataset Source Dependency ----
     st.markdown("##  Dataset Source Dependency")
-    dependency_df = dataset_source_dependency(df)
+    dependency_df = datasets.value["dependency"]
 
     st.markdown(
         """
@@ -315,8 +422,35 @@ elif choice == "IT Operations":
     st.subheader(" IT Operations Dashboard")
 
     st.caption("Visualize IT ticket performance, bottlenecks, and resolution stages.")
-    analytics = TicketAnalytics()
-    analytics.show_dashboard()
+
+    # IT Operations: OOP analytics class, loaded and aggregated by the precompute thread
+    from app.services.precompute import get_scheduler, staleness_caption
+    scheduler = get_scheduler()
+    tickets = scheduler.read("it_tickets")
+    if tickets is None:
+        st.error("The ticket analytics could not be computed.")
+        st.stop()
+    st.caption(staleness_caption(scheduler, tickets))
+    tickets.value.show_dashboard()
+
+    # ---- Export ----
+    with st.expander("Export tickets"):
+        from app.services.exporters import export_tickets, render_export_button
+
+        ticket_statuses = st.multiselect(
+            "Status", ["Open", "In Progress", "Resolved", "Waiting for User"], key="exp_ticket_status"
+        )
+        ticket_df = tickets.value.df
+        ticket_count = len(ticket_df)
+        if ticket_statuses and "status" in ticket_df:
+            ticket_count = int(ticket_df["status"].isin(ticket_statuses).sum())
+        render_export_button(
+            "Download tickets",
+            lambda fmt: export_tickets(fmt, status=ticket_statuses),
+            file_stem="it_tickets",
+            key="exp_tickets",
+            row_count=ticket_count,
+        )
 
 # =================================================
 # 6) HELP / AI ASSISTANT SECTION
@@ -324,7 +458,7 @@ elif choice == "IT Operations":
 # =================================================
 # 6) INTERACTIVE AI ASSISTANT
 # =================================================
-elif choice == "Smart Assistant":
+elif choice == "Need Help/Ai":
     st.subheader("Your AI Dashboard Companion")
 
     st.caption(
@@ -337,10 +471,73 @@ elif choice == "Smart Assistant":
     show_need_help_page()
 
 # =================================================
-# 7) LOGOUT
+# 7) PERFORMANCE (ADMIN ONLY)
+# =================================================
+elif choice == "Performance":
+    st.subheader("Performance Metrics")
+
+    st.caption(
+        "Latency and call counts recorded by the instrumented DB, CSV, analytics and assistant paths "
+        "since this server process started."
+    )
+
+    import pandas as pd
+    from app.services.metrics import REGISTRY, DUMP_DIR, dump_to_dir, is_enabled
+
+    if not is_enabled():
+        st.info("Instrumentation is disabled (APP_METRICS=0).")
+
+    snapshot = REGISTRY.to_dict()
+    if snapshot["histograms"]:
+        timings = pd.DataFrame([
+            {
+                "Name": name,
+                "Calls": h["count"],
+                "Mean (ms)": round(h["mean"] * 1000, 2),
+                "p50 (ms)": round(h["p50"] * 1000, 2),
+                "p95 (ms)": round(h["p95"] * 1000, 2),
+                "Max (ms)": round(h["max"] * 1000, 2),
+            }
+            for name, h in snapshot["histograms"].items()
+        ]).sort_values("p95 (ms)", ascending=False)
+        st.markdown("### Timings")
+        st.dataframe(timings, width="stretch", hide_index=True)
+    else:
+        st.info("No timings recorded yet. Visit a few pages first.")
+
+    if snapshot["counters"]:
+        st.markdown("### Counters")
+        st.dataframe(
+            pd.DataFrame(list(snapshot["counters"].items()), columns=["Name", "Count"]),
+            width="stretch", hide_index=True,
+        )
+
+    # ---- Export ----
+    col1, col2 = st.columns(2)
+    col1.download_button("Download Prometheus text", REGISTRY.to_prometheus(),
+                         file_name="metrics.prom", mime="text/plain")
+    col2.download_button("Download JSON", REGISTRY.to_json(),
+                         file_name="metrics.json", mime="application/json")
+
+    dump_format = st.radio("Dump format", ["prom", "json"], horizontal=True)
+    col3, col4 = st.columns(2)
+    if col3.button("Write dump to file"):
+        try:
+            st.success(f"Metrics written to `{dump_to_dir(dump_format)}`")
+        except OSError as e:
+            st.error(f"Could not write the metrics dump to {DUMP_DIR}: {e}")
+    if col4.button("Reset metrics"):
+        REGISTRY.reset()
+        st.rerun()
+
+# =================================================
+# 8) LOGOUT
 # =================================================
 elif choice == "Logout":
     st.session_state.logged_in = False
     st.session_state.username = ""
     st.success("You have been logged out successfully.")
 
+# Whole-page render time per menu entry (st.stop() on an empty page skips this)
+observe("page." + choice.lower().replace(" ", "_").replace("/", "_"), time.perf_counter() - page_started)
+
@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import ensure_data, parse_size
+
+# BENCH_SIZE picks the synthetic data size (10k, 1m, 10m or a row count);
+# generated data is cached per size under BENCH_DATA_DIR.
+BENCH_SIZE = os.environ.get("BENCH_SIZE", "10k")
+BENCH_DATA_DIR = os.environ.get("BENCH_DATA_DIR", os.path.join(tempfile.gettempdir(), "dashboard_synthetic"))
+
+
+@pytest.fixture(scope="session")
+def bench_rows():
+    return parse_size(BENCH_SIZE)
+
+
+@pytest.fixture(scope="session")
+def bench_paths():
+    """Synthetic data for BENCH_SIZE, with the CSV-based loaders pointed at it."""
+    from app.cyber_security import dashboard_utils
+
+    paths = ensure_data(BENCH_DATA_DIR, BENCH_SIZE)
+    saved = dashboard_utils.CYBER_CSV, dashboard_utils.DATASETS_CSV, dashboard_utils.TICKETS_CSV
+    dashboard_utils.CYBER_CSV = paths["incidents_csv"]
+    dashboard_utils.DATASETS_CSV = paths["datasets_csv"]
+    dashboard_utils.TICKETS_CSV = paths["tickets_csv"]
+    yield paths
+    dashboard_utils.CYBER_CSV, dashboard_utils.DATASETS_CSV, dashboard_utils.TICKETS_CSV = saved
+
+
+@pytest.fixture(scope="session")
+def cyber_db(bench_paths):
+    from app.cyber_security.cyber_incidents import CyberIncidentDB
+    return CyberIncidentDB(db_path=bench_paths["incidents_db"], column_store=False)
+
+
+@pytest.fixture(scope="session")
+def tickets(bench_paths):
+    from app.it_operations.it_operations import TicketAnalytics
+    return TicketAnalytics(file_path=bench_paths["tickets_csv"])
+
+
+@pytest.fixture(scope="session")
+def datasets_df(bench_paths):
+    return pd.read_csv(bench_paths["datasets_csv"])
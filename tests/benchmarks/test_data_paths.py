@@ -0,0 +1,150 @@
+"""
+Benchmarks of the dashboard's data paths on synthetic data (pytest-benchmark).
+
+    python -m pytest tests/benchmarks --benchmark-json=bench_results/after.json
+    BENCH_SIZE=1m python -m pytest tests/benchmarks --benchmark-json=bench_results/after-1m.json
+    pytest-benchmark compare tests/benchmarks/baseline-10k.json bench_results/after.json
+
+tests/benchmarks/baseline-10k.json is the recorded baseline at 10k rows (per-round
+samples stripped; the summary stats are what compare reads).
+Unit-test runs can leave these out with --benchmark-skip.
+"""
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.synthetic_data import INCIDENT_COLUMNS, generate_incidents, write_csv
+
+# load_cyber_incidents still parses and counts every row in Python (and commits per row
+# with WRITE_QUEUE=0), so it runs on a capped slice of the data
+LOAD_ROWS_CAP = 5_000
+
+
+# =====================================================
+# CYBER INCIDENTS DB
+# =====================================================
+
+@pytest.mark.benchmark(group="cyber_db")
+def test_fetch_all(benchmark, cyber_db):
+    benchmark(cyber_db.fetch_all)
+
+
+@pytest.mark.benchmark(group="cyber_db")
+def test_phishing_trend(benchmark, cyber_db):
+    benchmark(cyber_db.phishing_trend)
+
+
+@pytest.mark.benchmark(group="cyber_db")
+def test_unresolved_by_category(benchmark, cyber_db):
+    benchmark(cyber_db.unresolved_by_category)
+
+
+@pytest.mark.benchmark(group="cyber_db")
+def test_high_severity_open(benchmark, cyber_db):
+    benchmark(cyber_db.high_severity_open)
+
+
+@pytest.mark.benchmark(group="cyber_db")
+def test_high_severity_open_page(benchmark, cyber_db):
+    source = cyber_db.high_severity_open_source()
+    columns = list(source.columns)
+    benchmark(source.fetch_page, columns, "timestamp", True)
+
+
+@pytest.mark.benchmark(group="cyber_db")
+def test_dashboard_snapshot(benchmark, cyber_db):
+    benchmark(cyber_db.dashboard_snapshot)
+
+
+@pytest.mark.benchmark(group="cyber_db")
+def test_column_store_snapshot(benchmark, cyber_db):
+    from app.cyber_security.cyber_incidents import CyberIncidentDB
+    db = CyberIncidentDB(db_path=cyber_db.db_path, column_store=True)
+    db.column_store()   # built once, outside the timed calls
+    benchmark(db.dashboard_snapshot)
+
+
+@pytest.mark.benchmark(group="cyber_db")
+def test_column_store_filter(benchmark, cyber_db):
+    from app.cyber_security.cyber_incidents import CyberIncidentDB
+    store = CyberIncidentDB(db_path=cyber_db.db_path, column_store=True).column_store()
+    benchmark(
+        store.count,
+        exclude_status=["Closed", "Resolved"], severity=["High", "Critical"], category=["Phishing"],
+    )
+
+
+@pytest.mark.benchmark(group="cyber_db")
+def test_load_cyber_incidents(benchmark, bench_rows, tmp_path, monkeypatch):
+    from app.cyber_security import cyber_incidents, load_data
+
+    n = min(LOAD_ROWS_CAP, bench_rows)
+    csv_path = write_csv(str(tmp_path / "load_slice.csv"), INCIDENT_COLUMNS, generate_incidents(n))
+    db_path = str(tmp_path / "load_target.db")
+    monkeypatch.setattr(cyber_incidents, "_db", None)
+
+    def fresh_db():
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        cyber_incidents._db = cyber_incidents.CyberIncidentDB(db_path=db_path)
+
+    benchmark.extra_info["rows"] = n
+    benchmark.pedantic(load_data.load_cyber_incidents, args=(csv_path,), setup=fresh_db, rounds=3)
+
+
+# =====================================================
+# IT TICKETS
+# =====================================================
+
+@pytest.mark.benchmark(group="it_tickets")
+def test_status_kpis(benchmark, tickets):
+    benchmark(tickets.status_kpis)
+
+
+@pytest.mark.benchmark(group="it_tickets")
+def test_avg_resolution_by_staff(benchmark, tickets):
+    benchmark(tickets.avg_resolution_by_staff)
+
+
+@pytest.mark.benchmark(group="it_tickets")
+def test_avg_resolution_by_status(benchmark, tickets):
+    benchmark(tickets.avg_resolution_by_status)
+
+
+@pytest.mark.benchmark(group="it_tickets")
+def test_ticket_counts_by_staff(benchmark, tickets):
+    benchmark(tickets.ticket_counts_by_staff)
+
+
+# =====================================================
+# DATASETS
+# =====================================================
+
+@pytest.mark.benchmark(group="datasets")
+def test_dataset_resource_analysis(benchmark, datasets_df):
+    from app.data_science.dataset_metadata import dataset_resource_analysis
+    benchmark(dataset_resource_analysis, datasets_df)
+
+
+@pytest.mark.benchmark(group="datasets")
+def test_dataset_source_dependency(benchmark, datasets_df):
+    from app.data_science.dataset_metadata import dataset_source_dependency
+    benchmark(dataset_source_dependency, datasets_df)
+
+
+@pytest.mark.benchmark(group="datasets")
+def test_dataset_governance_recommendations(benchmark, datasets_df):
+    from app.data_science.dataset_metadata import dataset_resource_analysis, dataset_governance_recommendations
+    benchmark(dataset_governance_recommendations, dataset_resource_analysis(datasets_df))
+
+
+# =====================================================
+# DASHBOARD
+# =====================================================
+
+@pytest.mark.benchmark(group="dashboard")
+def test_load_all_dashboard_data(benchmark, bench_paths):
+    from app.cyber_security import dashboard_utils
+    benchmark(dashboard_utils.load_all_dashboard_data)
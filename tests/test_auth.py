@@ -0,0 +1,152 @@
+import threading
+import time
+
+import pytest
+
+from app import auth
+from app.cyber_security import user_db
+
+
+def _cost(hashed):
+    return int(hashed.split("$")[2])
+
+
+@pytest.fixture
+def rounds(monkeypatch):
+    """Sets the configured bcrypt cost (4 is bcrypt's minimum, to keep tests fast)."""
+    def set_rounds(value):
+        monkeypatch.setattr(auth, "_rounds", value)
+    set_rounds(4)
+    return set_rounds
+
+
+@pytest.fixture
+def users(tmp_path, monkeypatch, rounds):
+    monkeypatch.setattr(user_db, "DB_FILE", str(tmp_path / "users.db"))
+    monkeypatch.setattr(user_db, "_table_ready_for", None)
+    assert user_db.register_user("alice", "s3cret!")["success"]
+    return user_db
+
+
+def _stored_hash(username):
+    conn = user_db.connect_db()
+    try:
+        return conn.execute("SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+# --- Calibration ---
+def _fake_hash_timings(monkeypatch, timings_ms):
+    """Makes calibration's timed hashes take timings_ms, one after another."""
+    clock = iter(t for ms in timings_ms for t in (0.0, ms / 1000))
+    monkeypatch.setattr(auth.time, "perf_counter", lambda: next(clock))
+    monkeypatch.setattr(auth.bcrypt, "hashpw", lambda password, salt: b"")
+
+
+def test_calibration_uses_the_median_sample(monkeypatch):
+    # One slow outlier first; a single sample would have settled on min_rounds
+    _fake_hash_timings(monkeypatch, [1000, 10, 12, 9, 10])
+    assert auth.calibrate_bcrypt_rounds(target_ms=250, min_rounds=10, max_rounds=16, samples=5) == 14
+
+
+def test_calibration_stays_within_bounds(monkeypatch):
+    _fake_hash_timings(monkeypatch, [0.01] * 3)
+    assert auth.calibrate_bcrypt_rounds(target_ms=250, min_rounds=10, max_rounds=12, samples=3) == 12
+    _fake_hash_timings(monkeypatch, [900] * 3)
+    assert auth.calibrate_bcrypt_rounds(target_ms=250, min_rounds=10, max_rounds=12, samples=3) == 10
+
+
+def test_auto_rounds_are_persisted_and_only_move_up(tmp_path, monkeypatch):
+    path = str(tmp_path / "nested" / "bcrypt_rounds")
+    picks = iter([12, 11, 13])
+    monkeypatch.setattr(auth, "calibrate_bcrypt_rounds", lambda: next(picks))
+
+    assert auth._auto_rounds(path) == 12
+    assert auth._auto_rounds(path) == 12      # a slower calibration does not lower the cost
+    assert open(path).read().strip() == "12"
+    assert auth._auto_rounds(path) == 13
+    assert open(path).read().strip() == "13"
+
+
+def test_auto_rounds_without_a_writable_store(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(auth, "calibrate_bcrypt_rounds", lambda: 11)
+    assert auth._auto_rounds(str(blocker / "bcrypt_rounds")) == 11
+
+
+# --- Thread-pool hashing ---
+def test_submitted_hashes_run_on_the_bounded_pool(monkeypatch, rounds):
+    monkeypatch.setattr(auth, "HASH_WORKERS", 2)
+    monkeypatch.setattr(auth, "_pool", None)
+    real_hash = auth.hash_password
+    lock = threading.Lock()
+    running, peak, threads = 0, 0, set()
+
+    def tracked_hash(password, rounds=None):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+            threads.add(threading.current_thread().name)
+        try:
+            time.sleep(0.02)
+            return real_hash(password, rounds)
+        finally:
+            with lock:
+                running -= 1
+
+    monkeypatch.setattr(auth, "hash_password", tracked_hash)
+    try:
+        futures = [auth.submit_hash(f"password{i}") for i in range(8)]
+        hashes = [f.result(timeout=30) for f in futures]
+        verified = [auth.submit_verify(f"password{i}", h).result(timeout=30) for i, h in enumerate(hashes)]
+        rejected = auth.submit_verify("wrong", hashes[0]).result(timeout=30)
+    finally:
+        auth._pool.shutdown()
+
+    assert verified == [True] * 8
+    assert not rejected
+    assert all(_cost(h) == 4 for h in hashes)
+    assert peak == 2
+    assert threads and all(name.startswith("bcrypt") for name in threads)
+
+
+def test_explicit_rounds_override_the_configured_cost(rounds):
+    assert _cost(auth.submit_hash("s3cret!", rounds=5).result(timeout=30)) == 5
+    assert auth.needs_rehash(auth.hash_password("s3cret!"), rounds=5)
+    assert not auth.needs_rehash(auth.hash_password("s3cret!"))
+    assert auth.needs_rehash("not-a-bcrypt-hash")
+
+
+# --- Rehash on login ---
+def test_login_rehashes_at_the_configured_cost(users, rounds):
+    old_hash = _stored_hash("alice")
+    assert _cost(old_hash) == 4
+
+    rounds(5)
+    assert users.authenticate_user("alice", "s3cret!")
+    new_hash = _stored_hash("alice")
+    assert _cost(new_hash) == 5
+    assert auth.verify_password("s3cret!", new_hash)
+
+    assert users.authenticate_user("alice", "s3cret!")
+    assert _stored_hash("alice") == new_hash   # already at the configured cost
+
+
+def test_failed_login_does_not_rehash(users, rounds):
+    old_hash = _stored_hash("alice")
+    rounds(5)
+    assert not users.authenticate_user("alice", "wrong")
+    assert not users.authenticate_user("nobody", "s3cret!")
+    assert _stored_hash("alice") == old_hash
+
+
+def test_rehash_skips_a_hash_changed_meanwhile(users, rounds):
+    old_hash = _stored_hash("alice")
+    rounds(5)
+    assert not users.rehash_user_password("alice", "s3cret!", "$2b$04$someone.else.changed.it")
+    assert _stored_hash("alice") == old_hash
+    assert users.rehash_user_password("alice", "s3cret!", old_hash)
+    assert _cost(_stored_hash("alice")) == 5
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+from app import auth
+from app.cyber_security import bulk_users, user_db
+from app.cyber_security.bulk_users import bulk_register_users, read_users_csv
+
+
+def test_read_users_csv_handles_excel_bom(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_bytes("username,password\r\nalice,s3cret\r\n".encode("utf-8-sig"))
+    assert read_users_csv(str(path)) == [{"username": "alice", "password": "s3cret"}]
+
+
+@pytest.fixture
+def users_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(user_db, "DB_FILE", str(tmp_path / "users.db"))
+    monkeypatch.setattr(user_db, "_table_ready_for", None)
+    monkeypatch.setattr(auth, "_rounds", 4)   # bcrypt's minimum cost keeps the tests fast
+    return user_db.DB_FILE
+
+
+def _stored(path):
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT username, password_hash FROM users"))
+    finally:
+        conn.close()
+
+
+def _messages(report):
+    return [(r["row"], r["username"], r["success"], r["message"]) for r in report]
+
+
+def test_rows_are_validated_before_registering(users_db):
+    rows = [
+        {"username": "alice", "password": "s3cret!"},
+        {"username": "al", "password": "s3cret!"},
+        {"username": "bob smith", "password": "s3cret!"},
+        {"username": "carol", "password": "short"},
+        {"username": "dave", "password": "x" * 51},
+        {"username": "erin", "password": "another1"},
+    ]
+    report = bulk_register_users(rows, workers=2)
+
+    assert _messages(report) == [
+        (1, "alice", True, "User registered successfully."),
+        (2, "al", False, "Username must be between 3 and 20 characters."),
+        (3, "bob smith", False, "Username must be alphanumeric only."),
+        (4, "carol", False, "Password must be at least 6 characters long."),
+        (5, "dave", False, "Password too long (max 50 characters)."),
+        (6, "erin", True, "User registered successfully."),
+    ]
+    stored = _stored(users_db)
+    assert set(stored) == {"alice", "erin"}
+    assert auth.verify_password("s3cret!", stored["alice"])
+    assert auth.verify_password("another1", stored["erin"])
+    assert stored["alice"].startswith("$2b$04$")
+
+
+def test_duplicate_usernames_in_the_file_and_database(users_db):
+    assert user_db.register_user("alice", "original")["success"]
+    original_hash = _stored(users_db)["alice"]
+
+    rows = [
+        {"username": "bob", "password": "first1"},
+        {"username": "alice", "password": "replaced"},
+        {"username": "bob", "password": "second2"},
+    ]
+    report = bulk_register_users(rows, workers=2)
+
+    assert _messages(report) == [
+        (1, "bob", True, "User registered successfully."),
+        (2, "alice", False, "Username entered already exists."),
+        (3, "bob", False, "Duplicate username in import file."),
+    ]
+    stored = _stored(users_db)
+    assert stored["alice"] == original_hash
+    assert auth.verify_password("first1", stored["bob"])
+
+
+def test_nothing_valid_to_insert(users_db):
+    report = bulk_register_users([{"username": "x", "password": "s3cret!"}], workers=2)
+    assert not report[0]["success"]
+    assert bulk_register_users([], workers=2) == []
+    assert _stored(users_db) == {}
+
+
+class _FailingCursor(sqlite3.Cursor):
+    inserts = 0
+
+    def execute(self, sql, *args):
+        if sql.startswith("INSERT"):
+            type(self).inserts += 1
+            if type(self).inserts == 3:
+                raise sqlite3.OperationalError("disk I/O error")
+        return super().execute(sql, *args)
+
+
+class _FailingConnection(sqlite3.Connection):
+    def cursor(self, factory=_FailingCursor):
+        return super().cursor(factory)
+
+
+def test_a_failure_mid_import_rolls_back_every_row(users_db, monkeypatch):
+    assert user_db.register_user("alice", "original")["success"]
+    monkeypatch.setattr(_FailingCursor, "inserts", 0)
+    monkeypatch.setattr(bulk_users, "connect_db", lambda: sqlite3.connect(users_db, factory=_FailingConnection))
+
+    rows = [{"username": f"user{i}", "password": "s3cret!"} for i in range(5)]
+    with pytest.raises(sqlite3.OperationalError):
+        bulk_register_users(rows, workers=2)
+
+    assert _FailingCursor.inserts == 3
+    assert set(_stored(users_db)) == {"alice"}
@@ -0,0 +1,115 @@
+from app.help.context_window import ContextWindow, estimate_tokens
+
+SYSTEM = {"role": "system", "content": "You are the help desk assistant."}
+SUMMARY_HEADER = "SUMMARY OF EARLIER CONVERSATION:"
+
+
+def _conversation(turns, words=30):
+    messages = [SYSTEM]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"question {i} " + "detail " * words})
+        messages.append({"role": "assistant", "content": f"answer {i} " + "because " * words})
+    return messages
+
+
+def _budgeted_tokens(prompt):
+    # The section header and the trailing "ASSISTANT:" cue sit outside the budget
+    return sum(estimate_tokens(line) for line in prompt.split("\n") if line not in (SUMMARY_HEADER, "ASSISTANT:"))
+
+
+def test_short_conversation_fits_without_a_summary():
+    context = ContextWindow(token_budget=4000)
+    messages = _conversation(2)
+    prompt = context.build_prompt(messages)
+
+    assert SUMMARY_HEADER not in prompt
+    assert context.summary == ""
+    assert prompt.startswith("SYSTEM: You are the help desk assistant.")
+    assert all(m["content"] in prompt for m in messages)
+    assert prompt.endswith("ASSISTANT:")
+
+
+def test_prompt_stays_within_the_token_budget():
+    for budget in (200, 400, 1000):
+        context = ContextWindow(token_budget=budget)
+        messages = _conversation(40)
+        prompt = context.build_prompt(messages)
+
+        assert _budgeted_tokens(prompt) <= budget
+        assert messages[-1]["content"] in prompt       # the newest turn is always sent
+        assert messages[1]["content"] not in prompt    # the oldest is only summarized
+        assert SUMMARY_HEADER in prompt
+
+
+def test_min_recent_messages_are_kept_over_budget():
+    context = ContextWindow(token_budget=60, min_recent_messages=2)
+    messages = _conversation(3, words=200)
+    prompt = context.build_prompt(messages)
+
+    assert messages[-1]["content"] in prompt
+    assert messages[-2]["content"] in prompt
+    assert messages[-3]["content"] not in prompt
+
+
+def test_older_turns_fold_into_a_truncated_summary():
+    context = ContextWindow(token_budget=400, summary_chars_per_turn=40)
+    messages = _conversation(10)
+    context.build_prompt(messages)
+
+    lines = context.summary.split("\n")
+    assert lines[0].startswith("- ") and lines[-1].endswith("...")
+    assert all(len(line) <= len("- assistant: ") + 40 + 3 for line in lines)
+    assert sum(estimate_tokens(line) for line in lines) <= context.summary_budget
+
+
+def test_summary_is_extended_incrementally_and_reset_for_a_new_history():
+    context = ContextWindow(token_budget=1000, summary_chars_per_turn=40)
+    messages = _conversation(12)
+    context.build_prompt(messages)
+    before = context.summary.split("\n")
+    assert before != [""]
+
+    messages += _conversation(14)[len(messages):]
+    context.build_prompt(messages)
+    after = context.summary.split("\n")
+    assert after[:len(before)] == before and len(after) > len(before)
+
+    fresh = _conversation(12)
+    fresh[1] = {"role": "user", "content": "a different opening question " + "detail " * 30}
+    context.build_prompt(fresh)
+    assert context.summary.startswith("- user: a different opening question")
+
+
+def test_trim_history_only_drops_turns_already_in_the_summary():
+    context = ContextWindow(token_budget=400)
+    messages = _conversation(10)
+
+    # Nothing is folded before the first prompt, so nothing may be dropped
+    assert context.trim_history(messages, max_messages=4) == 0
+    assert len(messages) == 21
+
+    full_prompt = context.build_prompt(messages)
+    folded = context._folded
+    dropped = messages[1:1 + folded]
+    removed = context.trim_history(messages, max_messages=4)
+
+    assert removed == folded
+    assert messages[0] == SYSTEM
+    assert dropped[0] not in messages
+    assert len(messages) == 21 - removed
+    for msg in dropped[-2:]:
+        assert msg["content"].split()[0] in context.summary
+
+    # The trimmed history gives the same prompt, summary included
+    assert context.build_prompt(messages) == full_prompt
+
+
+def test_trim_history_keeps_unfolded_turns_over_the_limit():
+    context = ContextWindow(token_budget=400)
+    messages = _conversation(10)
+    context.build_prompt(messages)
+    recent = len(messages) - 1 - context._folded
+
+    context.trim_history(messages, max_messages=1)
+    assert len(messages) == 1 + recent
+    assert context.trim_history(messages, max_messages=1) == 0
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from app.services.correlation import _sorted_rows, correlate
+
+
+def _rows(rng, n, prefix, labels):
+    # Whole hours over a few days, so many timestamps are equal and land exactly on window edges
+    ids = [f"{prefix}{i}" for i in range(n)]
+    timestamps = [f"2024-03-{rng.randrange(1, 4):02d} {rng.randrange(0, 24):02d}:00:00" for _ in range(n)]
+    return _sorted_rows(ids, timestamps, [rng.choice(labels) for _ in range(n)])
+
+
+def _brute_force(incidents, tickets, before_hours, after_hours):
+    """Every (incident, ticket) pair, by incident time then ticket time (both inputs are time-sorted)."""
+    before, after = before_hours * 3_600_000_000, after_hours * 3_600_000_000
+    return [
+        (incidents.ids[i], tickets.ids[j])
+        for i in range(len(incidents.times))
+        for j in range(len(tickets.times))
+        if incidents.times[i] - before <= tickets.times[j] <= incidents.times[i] + after
+    ]
+
+
+@pytest.fixture
+def inputs():
+    rng = random.Random(11)
+    return _rows(rng, 40, "inc", ["Phishing", "Malware", "DDoS"]), _rows(rng, 60, "tkt", ["amy", "bo", "cy"])
+
+
+@pytest.mark.parametrize("before_hours, after_hours", [(0, 24), (3, 0), (2, 5), (0, 0)])
+@pytest.mark.parametrize("max_pairs", [0, 1, 3, 17, 10_000])
+def test_matches_brute_force(inputs, before_hours, after_hours, max_pairs):
+    incidents, tickets = inputs
+    expected = _brute_force(incidents, tickets, before_hours, after_hours)
+    result = correlate(incidents, tickets, before_hours, after_hours, max_pairs=max_pairs)
+
+    assert result.total_pairs == len(expected)
+    assert list(zip(result.pairs["incident_id"], result.pairs["ticket_id"])) == expected[:max_pairs]
+
+    by_category, by_staff = {}, {}
+    for incident, ticket in expected:
+        category = incidents.labels[list(incidents.ids).index(incident)]
+        staff = tickets.labels[list(tickets.ids).index(ticket)]
+        by_category[category] = by_category.get(category, 0) + 1
+        by_staff[staff] = by_staff.get(staff, 0) + 1
+    assert {r.category: r.tickets_in_window for r in result.by_category.itertuples() if r.tickets_in_window} \
+        == by_category
+    assert {r.assigned_to: r.incidents_in_window for r in result.by_staff.itertuples() if r.incidents_in_window} \
+        == by_staff
+
+
+def test_cap_inside_the_first_incident():
+    incidents = _sorted_rows(["a", "b"], ["2024-03-01 10:00:00", "2024-03-02 10:00:00"], ["Phishing", "DDoS"])
+    tickets = _sorted_rows([f"t{i}" for i in range(5)], ["2024-03-01 11:00:00"] * 5, ["amy"] * 5)
+    result = correlate(incidents, tickets, 0, 24, max_pairs=3)
+    assert result.total_pairs == 5
+    assert list(result.pairs["ticket_id"]) == ["t0", "t1", "t2"]
+    assert set(result.pairs["incident_id"]) == {"a"}
@@ -0,0 +1,52 @@
+import sqlite3
+
+import pytest
+
+from app.cyber_security.cyber_incidents import CyberIncidentDB
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    db = CyberIncidentDB(db_path=str(tmp_path / "incidents.db"), column_store=False)
+    db.insert({"incident_id": 1, "timestamp": "2024-01-01 10:00:00", "severity": "High",
+               "category": "Phishing", "status": "Open", "description": "Incident 1"})
+
+    opened = []
+
+    def tracked_connect():
+        conn = sqlite3.connect(db.db_path)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(db, "_connect", tracked_connect)
+    db.opened = opened
+    return db
+
+
+def _is_closed(conn):
+    try:
+        conn.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+@pytest.mark.parametrize("method, args, exec_name", [
+    ("update_status", (1, "Closed"), "_exec_update_status"),
+    ("delete", (1,), "_exec_delete"),
+])
+def test_failed_writes_close_their_connection(db, monkeypatch, method, args, exec_name):
+    def failing_exec(*a):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(db, exec_name, failing_exec)
+    with pytest.raises(sqlite3.OperationalError):
+        getattr(db, method)(*args)
+
+    assert len(db.opened) == 1 and _is_closed(db.opened[0])
+
+
+def test_successful_writes_close_their_connection(db):
+    assert db.update_status(1, "Closed")
+    assert db.delete(1)
+    assert len(db.opened) == 2 and all(_is_closed(conn) for conn in db.opened)
@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.cyber_security.cyber_incidents import CyberIncidentDB
+from app.services.exporters import (
+    INCIDENT_EXPORT_COLUMNS,
+    ExportTooLarge,
+    count_incident_rows,
+    encode_csv,
+    encode_ndjson,
+    export_incidents,
+    export_tickets,
+    iter_incident_rows,
+    iter_ticket_rows,
+    spool,
+)
+
+INCIDENTS = [
+    (1, "2024-03-01 00:00:00", "High", "Phishing", "Open", "first second of the 1st"),
+    (2, "2024-03-01 23:59:59.999999", "Low", "Malware", "Closed", "last instant of the 1st"),
+    (3, "2024-03-02 00:00:00", "Critical", "Phishing", "Open", "first second of the 2nd"),
+    (4, "2024-03-02 12:30:00", "Medium", "DDoS", "Resolved", 'quotes "and", commas'),
+    (5, "2024-03-02 23:59:59", "High", "Phishing", "In Progress", "line\nbreak"),
+    (6, "2024-03-03 00:00:00", "Low", "Malware", "Open", "first second of the 3rd"),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    db = CyberIncidentDB(db_path=str(tmp_path / "incidents.db"), column_store=False)
+    for row in INCIDENTS:
+        db.insert(dict(zip(INCIDENT_EXPORT_COLUMNS, row)))
+    return db.db_path
+
+
+@pytest.fixture
+def tickets_csv(tmp_path):
+    path = tmp_path / "it_tickets.csv"
+    path.write_text(
+        "Ticket_ID,Status,Assigned_To\n"
+        "T1,Open,amy\n"
+        "T2,Resolved,bo\n"
+        "T3,Open,\"cy, jr\"\n"
+        "T4,Waiting for User,amy\n",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def _ids(rows):
+    return [row[0] for row in rows]
+
+
+def test_no_filters_exports_every_incident_in_id_order(db_path):
+    rows = list(iter_incident_rows(db_path=db_path, chunk_rows=2))
+    assert rows == INCIDENTS
+    assert count_incident_rows(db_path=db_path) == len(INCIDENTS)
+
+
+@pytest.mark.parametrize("since, until, expected", [
+    ("2024-03-01", "2024-03-01", [1, 2]),          # until includes the last microsecond of the day
+    ("2024-03-02", "2024-03-02", [3, 4, 5]),       # since includes midnight, until excludes the next midnight
+    ("2024-03-02", None, [3, 4, 5, 6]),
+    (None, "2024-03-02", [1, 2, 3, 4, 5]),
+    ("2024-03-04", None, []),
+])
+def test_date_bounds_are_inclusive_days(db_path, since, until, expected):
+    assert _ids(iter_incident_rows(db_path=db_path, since=since, until=until)) == expected
+    assert count_incident_rows(db_path=db_path, since=since, until=until) == len(expected)
+
+
+def test_date_bounds_accept_dates(db_path):
+    import datetime
+
+    day = datetime.date(2024, 3, 1)
+    assert _ids(iter_incident_rows(db_path=db_path, since=day, until=day)) == [1, 2]
+
+
+def test_list_filters_combine_with_dates(db_path):
+    filters = dict(severity=["High", "Critical"], category=["Phishing"], status=["Open"], since="2024-03-02")
+    assert _ids(iter_incident_rows(db_path=db_path, **filters)) == [3]
+    assert count_incident_rows(db_path=db_path, **filters) == 1
+
+
+def test_csv_round_trips_with_one_header_across_chunks():
+    rows = INCIDENTS + [(7, "2024-03-04 00:00:00", "Low", "Other", "Open", "naïve ✓")]
+    chunks = list(encode_csv(INCIDENT_EXPORT_COLUMNS, rows, chunk_rows=2))
+
+    assert len(chunks) == 4
+    assert all(isinstance(c, bytes) for c in chunks)
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert parsed[0] == INCIDENT_EXPORT_COLUMNS
+    assert parsed[1:] == [[str(v) for v in row] for row in rows]
+
+
+def test_csv_with_no_rows_is_just_the_header():
+    assert b"".join(encode_csv(["a", "b"], [])) == b"a,b\r\n"
+
+
+def test_ndjson_writes_one_object_per_line():
+    chunks = list(encode_ndjson(INCIDENT_EXPORT_COLUMNS, INCIDENTS, chunk_rows=4))
+
+    assert len(chunks) == 2
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [dict(zip(INCIDENT_EXPORT_COLUMNS, row)) for row in INCIDENTS]
+    assert list(encode_ndjson(["a"], [])) == []
+
+
+def test_ticket_rows_filter_on_status(tickets_csv):
+    assert [r[0] for r in iter_ticket_rows(csv_path=tickets_csv)] == ["T1", "T2", "T3", "T4"]
+    assert list(iter_ticket_rows(csv_path=tickets_csv, status=["Open"])) == [["T1", "Open", "amy"],
+                                                                             ["T3", "Open", "cy, jr"]]
+
+
+def test_ticket_export_uses_lowercase_header(tickets_csv):
+    text = b"".join(export_tickets("CSV", csv_path=tickets_csv, status=["Resolved"])).decode("utf-8")
+    assert text.splitlines() == ["ticket_id,status,assigned_to", "T2,Resolved,bo"]
+
+
+def test_spool_returns_a_rewound_file_of_the_chunks():
+    with spool(iter([b"ab", b"", b"cd" * 100_000])) as f:
+        assert f.readall() == b"ab" + b"cd" * 100_000
+
+
+def test_exports_over_the_cap_are_refused(db_path, tickets_csv):
+    assert len(b"".join(export_incidents("NDJSON", max_rows=6, db_path=db_path)).splitlines()) == 6
+    assert len(list(export_incidents("CSV", max_rows=0, db_path=db_path))) == 1   # 0 lifts the cap
+
+    with pytest.raises(ExportTooLarge):
+        b"".join(export_incidents("CSV", max_rows=5, db_path=db_path))
+    with pytest.raises(ExportTooLarge):
+        b"".join(export_tickets("NDJSON", max_rows=3, csv_path=tickets_csv))
@@ -0,0 +1,59 @@
+from app.help.need_help import ground_messages, stream_gemini_response
+from app.help.response_cache import ResponseCache
+from app.help.stub_client import StubClient
+from app.services.metrics import REGISTRY
+
+MESSAGES = [{"role": "user", "content": "how do I update an incident?"}]
+
+
+class _BrokenRetriever:
+    def context_for(self, question):
+        raise RuntimeError("index unavailable")
+
+
+def test_cache_hits_are_not_ttft_samples(tmp_path):
+    REGISTRY.reset()
+    cache = ResponseCache(db_path=str(tmp_path / "cache.db"))
+    stub = StubClient(latency=0.0, chunk_delay=0.0)
+    first = "".join(stream_gemini_response(MESSAGES, llm_client=stub, cache=cache, retriever=False))
+    ttft = []
+    second = "".join(stream_gemini_response(MESSAGES, llm_client=stub, cache=cache, retriever=False,
+                                            on_first_chunk=ttft.append))
+
+    assert second == first
+    assert ttft, "the UI still gets a first-chunk time for cache hits"
+    assert REGISTRY.histogram("help.time_to_first_token").count == 1
+    assert REGISTRY.histogram("help.cache_hit_latency").count == 1
+    assert REGISTRY.counter("help.cache_hits").value == 1
+
+
+def test_grounding_failure_is_logged_and_skipped(caplog):
+    with caplog.at_level("ERROR", logger="app.help.need_help"):
+        messages, grounding = ground_messages(MESSAGES, _BrokenRetriever())
+    assert (messages, grounding) == (MESSAGES, "")
+    assert "Error retrieving dashboard context" in caplog.text
+
+
+
+def _need_help_page():
+    from app.help.need_help import show_need_help_page
+    show_need_help_page()
+
+
+def test_model_failure_shows_a_generic_error_and_logs_the_details(monkeypatch, caplog):
+    from streamlit.testing.v1 import AppTest
+
+    from app.help import need_help
+
+    def failing_stream(*args, **kwargs):
+        raise RuntimeError("quota exceeded for key AIza-secret")
+        yield
+
+    monkeypatch.setattr(need_help, "stream_gemini_response", failing_stream)
+    at = AppTest.from_function(_need_help_page).run()
+    at.chat_input[0].set_value("how do I update an incident?").run()
+
+    assert [e.value for e in at.error] == ["The AI assistant is unavailable right now. Please try again."]
+    assert "AI assistant request failed" in caplog.text
+    assert "AIza-secret" in caplog.text
+    assert [m["role"] for m in at.session_state.help_messages] == ["system"]
@@ -0,0 +1,87 @@
+import random
+
+import pandas as pd
+import pytest
+
+from app.cyber_security.cyber_incidents import CyberIncidentDB, SORT_INDEX_COLUMNS
+
+COLUMNS = ["incident_id", "timestamp", "severity", "category", "status"]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = CyberIncidentDB(db_path=str(tmp_path / "incidents.db"), column_store=False)
+    rng = random.Random(7)
+    for i in range(1, 241):
+        db.insert({
+            "incident_id": i,
+            "timestamp": f"2024-01-{rng.randrange(1, 29):02d} 10:00:00",
+            "severity": rng.choice(["Low", "Medium", "High", "Critical"]),
+            "category": rng.choice(["Phishing", "Malware", None]),
+            "status": rng.choice(["Open", "In Progress", "Resolved", None]),
+            "description": f"Incident {i}",
+        })
+    return db
+
+
+def _tuples(page):
+    # pandas shows NULLs as NaN
+    return [tuple(None if pd.isna(v) else v for v in r) for r in page.itertuples(index=False)]
+
+
+def _all_pages(source, sort_by, descending, filters=None, limit=17):
+    rows, cursor = [], None
+    while True:
+        page, cursor = source.fetch_page(COLUMNS, sort_by, descending, filters, cursor, limit)
+        rows += _tuples(page)
+        if cursor is None:
+            return rows
+
+
+def _expected(source, sort_by, descending, filters=None):
+    page, _ = source.fetch_page(COLUMNS, "incident_id", False, filters, None, limit=10_000)
+    rows = _tuples(page)
+    col = COLUMNS.index(sort_by)
+    # SQLite order: NULLs first ascending, last descending; ties by key
+    nulls = sorted((r for r in rows if r[col] is None), key=lambda r: r[0], reverse=descending)
+    values = sorted((r for r in rows if r[col] is not None), key=lambda r: (r[col], r[0]), reverse=descending)
+    return values + nulls if descending else nulls + values
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("sort_by", ["incident_id", *SORT_INDEX_COLUMNS])
+def test_keyset_pages_cover_the_sort_order(db, sort_by, descending):
+    source = db.table_source()
+    assert _all_pages(source, sort_by, descending) == _expected(source, sort_by, descending)
+
+
+def test_keyset_pages_with_filter_and_base_where(db):
+    source = db.table_source("severity IN ('High','Critical')")
+    filters = {"status": "o"}
+    assert _all_pages(source, "status", True, filters) == _expected(source, "status", True, filters)
+
+
+def test_only_indexed_columns_are_sortable(db):
+    source = db.table_source()
+    assert set(source.sortable_columns) == {"incident_id", *SORT_INDEX_COLUMNS}
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("sort_by", SORT_INDEX_COLUMNS)
+def test_page_queries_use_the_sort_index(db, sort_by, descending):
+    source = db.table_source()
+    _, cursor = source.fetch_page(COLUMNS, sort_by, descending, limit=5)
+    null_cursor = (None, 10)
+    for page_cursor in (None, cursor, null_cursor):
+        for plan in source.query_plans(COLUMNS, sort_by, descending, cursor=page_cursor):
+            text = " | ".join(plan)
+            assert f"idx_cyber_incidents_{sort_by}" in text, text
+            assert "TEMP B-TREE" not in text, text
+
+
+def test_high_open_list_matches_snapshot_count(db):
+    # The fixture has incidents with no status; they are open, so counted and listed
+    source = db.high_severity_open_source()
+    rows = _all_pages(source, "timestamp", True)
+    assert any(r[COLUMNS.index("status")] is None for r in rows)
+    assert len(rows) == source.count() == db.dashboard_snapshot().high_open_count
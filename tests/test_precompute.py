@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from app.services.precompute import PrecomputeScheduler, staleness_caption
+
+
+class _Source:
+    """A fake input: compute() returns its version (or raises), signature() reports it."""
+
+    def __init__(self):
+        self.version = 1
+        self.calls = 0
+        self.fail = False
+
+    def compute(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("source unreadable")
+        return {"version": self.version}
+
+    def signature(self):
+        return (self.version,)
+
+
+@pytest.fixture
+def source():
+    return _Source()
+
+
+@pytest.fixture
+def scheduler(source):
+    scheduler = PrecomputeScheduler(interval=3600, poll_interval=0.01)
+    scheduler.register("job", source.compute, source.signature)
+    yield scheduler
+    scheduler.stop()
+
+
+def test_cold_read_computes_once(scheduler, source):
+    first = scheduler.read("job")
+    assert first.value == {"version": 1}
+    assert scheduler.read("job") is first
+    assert source.calls == 1
+
+
+def test_signature_change_recomputes(scheduler, source):
+    first = scheduler.read("job")
+    source.version = 2
+    assert scheduler.is_stale(first)
+    assert "update pending" in staleness_caption(scheduler, first)
+
+    second = scheduler.read("job")   # no background thread: refreshed inline
+    assert second.value == {"version": 2}
+    assert not scheduler.is_stale(second)
+    assert source.calls == 2
+
+
+def test_interval_expiry_recomputes(scheduler, source):
+    scheduler.read("job")
+    scheduler.interval = 0
+    scheduler.run_due()
+    assert source.calls == 2
+
+
+def test_failure_keeps_last_good_value(scheduler, source, caplog):
+    good = scheduler.read("job")
+    source.version, source.fail = 2, True
+
+    assert scheduler.run_job("job") is good
+    assert "RuntimeError: source unreadable" in scheduler.last_error("job")
+    assert "Precompute of job failed" in caplog.text
+
+    source.fail = False
+    assert scheduler.run_job("job").value == {"version": 2}
+    assert scheduler.last_error("job") is None
+
+
+def test_background_thread_picks_up_changes(scheduler, source):
+    scheduler.start()
+    first = scheduler.read("job")
+    source.version = 2
+    scheduler.trigger()
+
+    deadline = time.monotonic() + 5
+    while scheduler.store.get("job").value["version"] != 2:
+        assert time.monotonic() < deadline, "background refresh did not run"
+        time.sleep(0.01)
+    # Renders while the thread runs only read the store
+    assert scheduler.read("job") is scheduler.store.get("job") is not first
+
+
+def test_one_computation_per_job_at_a_time(source):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return source.compute()
+
+    scheduler = PrecomputeScheduler(interval=3600)
+    scheduler.register("job", slow, source.signature)
+    first = threading.Thread(target=scheduler.run_job, args=("job",))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=scheduler.run_job, args=("job",))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+    # The second caller found the value already current once it got the lock
+    assert source.calls == 1
+
+
+def test_ticket_job_with_missing_csv_logs_instead_of_rendering(tmp_path, monkeypatch, caplog):
+    import streamlit as st
+    from app.cyber_security import dashboard_utils
+    from app.services.precompute import _compute_tickets
+
+    def no_script_context(*args, **kwargs):
+        raise AssertionError("Streamlit call from the precompute thread")
+
+    monkeypatch.setattr(dashboard_utils, "TICKETS_CSV", str(tmp_path / "missing.csv"))
+    for name in ("error", "warning", "info"):
+        monkeypatch.setattr(st, name, no_script_context)
+
+    assert _compute_tickets().df.empty
+    assert "Ticket CSV not found" in caplog.text
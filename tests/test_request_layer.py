@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from app.help.request_layer import ResilientClient, UpstreamTimeout, is_retryable
+from app.help.stub_client import StubClient, StubUpstreamError
+
+PROMPT = "USER: how do I update an incident?"
+
+
+class _FailingModels:
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def generate_content_stream(self, model, contents, **kwargs):
+        self.calls += 1
+        raise self.error
+        yield
+
+
+class _FailingClient:
+    def __init__(self, error):
+        self.models = _FailingModels(error)
+
+
+def _client(stub, **kwargs):
+    return ResilientClient(stub, timeout=2.0, total_timeout=5.0, backoff_base=0.001, backoff_max=0.01, **kwargs)
+
+
+def test_identical_streams_share_one_upstream_call():
+    stub = StubClient(latency=0.2, chunk_delay=0.01)
+    client = _client(stub)
+    results = [None] * 6
+    barrier = threading.Barrier(len(results))
+
+    def ask(i):
+        barrier.wait()
+        results[i] = "".join(c.text for c in client.models.generate_content_stream(model="stub", contents=PROMPT))
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(len(results))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    expected = stub.reply_for(PROMPT)
+    assert results == [expected] * len(results)
+    assert stub.calls == 1
+    assert client.coalesced == len(results) - 1
+
+
+def test_finished_stream_is_not_reused():
+    stub = StubClient()
+    client = _client(stub)
+    for _ in range(2):
+        list(client.models.generate_content_stream(model="stub", contents=PROMPT))
+    assert stub.calls == 2
+
+
+def test_stream_error_reaches_every_subscriber():
+    client = _client(_FailingClient(StubUpstreamError(400)))
+    with pytest.raises(StubUpstreamError):
+        list(client.models.generate_content_stream(model="stub", contents=PROMPT))
+    assert client.client.models.calls == 1
+
+
+def test_server_errors_are_retried():
+    client = _client(_FailingClient(StubUpstreamError(503)), retries=2)
+    with pytest.raises(StubUpstreamError):
+        list(client.models.generate_content_stream(model="stub", contents=PROMPT))
+    assert client.client.models.calls == 3
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (UpstreamTimeout(), True),
+    (TimeoutError(), True),
+    (ConnectionResetError(), True),
+    (StubUpstreamError(429), True),
+    (StubUpstreamError(503), True),
+    (StubUpstreamError(404), False),
+    (TypeError("bad argument"), False),
+    (ValueError("bad value"), False),
+])
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
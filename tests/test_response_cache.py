@@ -0,0 +1,142 @@
+import sqlite3
+
+import pytest
+
+from app.help import response_cache
+from app.help.response_cache import ResponseCache, make_cache_key, normalize_text
+
+SYSTEM = {"role": "system", "content": "You are a helpful assistant."}
+
+
+def _ask(question, *history):
+    return [SYSTEM, *history, {"role": "user", "content": question}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.time() for the cache module."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+
+def _disk_keys(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {row[0] for row in conn.execute("SELECT key FROM help_cache")}
+    finally:
+        conn.close()
+
+
+# --- Key normalization ---
+def test_normalize_text():
+    assert normalize_text("  How do I   reset\tmy password?? ") == "how do i reset my password"
+    assert normalize_text("Reset password!.") == "reset password"
+    assert normalize_text("What is 2.5?") == "what is 2.5"
+
+
+def test_keys_ignore_case_whitespace_punctuation_and_system_prompt():
+    key = make_cache_key(_ask("How do I reset my password?"), "gemini")
+    assert make_cache_key(_ask("  how do i RESET my   password "), "gemini") == key
+    assert make_cache_key(_ask("How do I reset my password?")[1:], "gemini") == key
+    assert make_cache_key(_ask("How do I reset my email?"), "gemini") != key
+    assert make_cache_key(_ask("How do I reset my password?"), "other-model") != key
+
+
+def test_keys_use_only_the_conversation_tail():
+    old = [{"role": "user", "content": f"question {i}"} for i in range(5)]
+    recent = [{"role": "assistant", "content": "answer"}, {"role": "user", "content": "thanks"}]
+    assert make_cache_key(_ask("and then?", *old, *recent), "gemini", tail=3) == \
+        make_cache_key(_ask("and then?", *recent), "gemini", tail=3)
+    assert make_cache_key(_ask("and then?", *old, *recent), "gemini", tail=4) != \
+        make_cache_key(_ask("and then?", *recent), "gemini", tail=4)
+
+
+def test_grounding_in_extra_separates_entries(tmp_path):
+    cache = ResponseCache(db_path=str(tmp_path / "cache.db"))
+    messages = _ask("How many open incidents are there?")
+    before = make_cache_key(messages, "gemini", extra="open incidents: 12")
+    after = make_cache_key(messages, "gemini", extra="open incidents: 13")
+    assert before != after
+    assert make_cache_key(messages, "gemini", extra="open incidents: 12") == before
+
+    cache.set(before, "There are 12.")
+    assert cache.get(after) is None
+    assert cache.get(before) == "There are 12."
+
+
+# --- In-memory LRU ---
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(db_path=None, max_entries=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"     # "b" is now least recently used
+    cache.set("c", "C")
+
+    assert list(cache._memory) == ["a", "c"]
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("A", "C")
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_evicted_entries_are_reloaded_from_disk(tmp_path):
+    cache = ResponseCache(db_path=str(tmp_path / "cache.db"), max_entries=1)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert list(cache._memory) == ["b"]
+
+    assert cache.get("a") == "A"
+    assert list(cache._memory) == ["a"]
+
+
+# --- TTL ---
+def test_memory_entries_expire(clock):
+    cache = ResponseCache(db_path=None, ttl_seconds=60)
+    cache.set("a", "A")
+    clock[0] += 59
+    assert cache.get("a") == "A"
+    clock[0] += 1
+    assert cache.get("a") is None
+    assert "a" not in cache._memory
+
+
+def test_disk_entries_expire_and_are_deleted(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(db_path=path, ttl_seconds=60).set("a", "A")
+
+    # A fresh instance (e.g. after a restart) only has the on-disk copy
+    assert ResponseCache(db_path=path, ttl_seconds=60).get("a") == "A"
+    clock[0] += 60
+    restarted = ResponseCache(db_path=path, ttl_seconds=60)
+    assert restarted.get("a") is None
+    assert _disk_keys(path) == set()
+
+
+def test_disk_entries_keep_their_original_expiry(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(db_path=path, ttl_seconds=60).set("a", "A")
+    clock[0] += 30
+    reloaded = ResponseCache(db_path=path, ttl_seconds=60)
+    assert reloaded.get("a") == "A"   # back in memory with the stored expiry, not a fresh TTL
+    clock[0] += 30
+    assert reloaded.get("a") is None
+
+
+def test_purge_expired_only_drops_expired_rows(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(db_path=path, ttl_seconds=60)
+    cache.set("old", "1")
+    clock[0] += 30
+    cache.set("new", "2")
+    clock[0] += 30
+    cache.purge_expired()
+    assert _disk_keys(path) == {"new"}
+
+
+def test_clear_empties_both_levels(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(db_path=path)
+    cache.set("a", "A")
+    cache.clear()
+    assert cache.get("a") is None
+    assert _disk_keys(path) == set()
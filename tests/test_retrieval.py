@@ -0,0 +1,106 @@
+import sqlite3
+import threading
+import time
+
+from app.help import retrieval
+from app.help.retrieval import DashboardRetriever
+
+
+def _make_sources(tmp_path, incidents=50):
+    db = tmp_path / "incidents.db"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE cyber_incidents (incident_id INTEGER PRIMARY KEY, timestamp TEXT, severity TEXT, "
+                 "category TEXT, status TEXT, description TEXT)")
+    conn.executemany("INSERT INTO cyber_incidents VALUES (?, '2024-01-01 10:00:00', 'High', ?, 'Open', ?)",
+                     [(i, "Phishing" if i % 2 else "Malware", f"Incident {i}") for i in range(incidents)])
+    conn.commit()
+    conn.close()
+    tickets = tmp_path / "tickets.csv"
+    tickets.write_text("ticket_id,priority,status,assigned_to,created_at,resolution_time_hours,description\n"
+                       "1,High,Open,IT_Support_A,2024-01-01,4,VPN down\n")
+    datasets = tmp_path / "datasets.csv"
+    datasets.write_text("dataset_id,name,rows,columns,uploaded_by,upload_date\n1,sales,10,3,alice,2024-01-01\n")
+    return str(db), str(tickets), str(datasets)
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_context_for_does_not_wait_for_the_build(tmp_path, monkeypatch):
+    db, tickets, datasets = _make_sources(tmp_path)
+    retriever = DashboardRetriever(incidents_db=db, tickets_csv=tickets, datasets_csv=datasets)
+    release = threading.Event()
+    reader = retriever.sources["incident"][1]
+
+    def slow_reader(path):
+        release.wait(10)
+        yield from reader(path)
+
+    retriever.sources["incident"] = (db, slow_reader)
+    start = time.perf_counter()
+    assert retriever.context_for("phishing incident") == ""   # cold index, build still running
+    assert time.perf_counter() - start < 1.0
+
+    release.set()
+    _wait_for(lambda: len(retriever.index) == 52)
+    assert "Phishing" in retriever.context_for("phishing incident")
+
+
+def test_refresh_applies_only_changed_rows(tmp_path):
+    db, tickets, datasets = _make_sources(tmp_path)
+    retriever = DashboardRetriever(incidents_db=db, tickets_csv=tickets, datasets_csv=datasets)
+    assert retriever.refresh(force=True) == 52
+
+    conn = sqlite3.connect(db)
+    conn.execute("UPDATE cyber_incidents SET status='Resolved' WHERE incident_id=3")
+    conn.execute("DELETE FROM cyber_incidents WHERE incident_id=4")
+    conn.execute("INSERT INTO cyber_incidents VALUES (999, '2024-01-02', 'Low', 'DDoS', 'Open', 'Flood')")
+    conn.commit()
+    conn.close()
+
+    assert retriever.refresh(force=True) == 3
+    assert len(retriever.index) == 52
+    assert retriever.search("ddos flood", k=1)[0][1] == "incident:999"
+
+
+def test_refresh_batches_release_the_search_lock(tmp_path, monkeypatch):
+    monkeypatch.setattr(retrieval, "APPLY_BATCH", 10)
+    db, tickets, datasets = _make_sources(tmp_path, incidents=200)
+    retriever = DashboardRetriever(incidents_db=db, tickets_csv=tickets, datasets_csv=datasets)
+    applied = []
+    apply = retriever._apply
+
+    def counting_apply(upserts, removals):
+        applied.append(len(upserts) + len(removals))
+        apply(upserts, removals)
+
+    retriever._apply = counting_apply
+    retriever.refresh(force=True)
+    assert max(applied) <= 10
+    assert len(retriever.index) == 202
+
+
+def test_failed_background_refresh_is_logged_and_keeps_the_index(tmp_path, caplog):
+    db, tickets, datasets = _make_sources(tmp_path)
+    retriever = DashboardRetriever(incidents_db=db, tickets_csv=tickets, datasets_csv=datasets)
+    retriever.refresh(force=True)
+
+    def broken_reader(path):
+        raise OSError("disk gone")
+        yield
+
+    conn = sqlite3.connect(db)
+    conn.execute("INSERT INTO cyber_incidents VALUES (999, '2024-01-02', 'Low', 'DDoS', 'Open', 'Flood')")
+    conn.commit()
+    conn.close()
+    retriever.sources["incident"] = (db, broken_reader)
+    retriever._last_check = float("-inf")
+    retriever._background_refresh()
+
+    assert "OSError: disk gone" in retriever.last_error
+    assert "Retriever refresh failed" in caplog.text
+    assert len(retriever.index) == 52
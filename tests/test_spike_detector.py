@@ -0,0 +1,82 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from app.cyber_security.cyber_incidents import CyberIncidentDB
+from app.cyber_security.spike_detector import SpikeDetector, STATE_TABLE
+
+
+def _incidents():
+    """One Phishing incident a day for 10 days, then 8 on 2024-01-11 (a spike)."""
+    rows = [(f"2024-01-{day:02d} 09:00:00", "Phishing") for day in range(1, 11)]
+    rows += [(f"2024-01-11 {hour:02d}:00:00", "Phishing") for hour in range(8)]
+    return [
+        {"incident_id": i, "timestamp": ts, "severity": "High", "category": cat, "status": "Open",
+         "description": f"Incident {i}"}
+        for i, (ts, cat) in enumerate(rows, start=1)
+    ]
+
+
+def _saved_state(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute(f"SELECT category, state FROM {STATE_TABLE}").fetchall())
+    finally:
+        conn.close()
+
+
+def _replayed_state(rows):
+    conn = sqlite3.connect(":memory:")
+    detector = SpikeDetector()
+    detector.create_table(conn)
+    detector.rebuild((r["category"], r["timestamp"]) for r in rows)
+    detector.save(conn)
+    return dict(conn.execute(f"SELECT category, state FROM {STATE_TABLE}").fetchall())
+
+
+def test_writers_in_separate_instances_do_not_overwrite_each_other(tmp_path):
+    path = str(tmp_path / "incidents.db")
+    first = CyberIncidentDB(db_path=path, column_store=False)
+    second = CyberIncidentDB(db_path=path, column_store=False)
+    rows = _incidents()
+    for i, row in enumerate(rows):
+        (first if i % 2 else second).insert(row)
+    assert _saved_state(path) == _replayed_state(rows)
+
+
+def test_failed_batch_leaves_the_saved_state_untouched(tmp_path, monkeypatch):
+    path = str(tmp_path / "incidents.db")
+    db = CyberIncidentDB(db_path=path, column_store=False)
+    rows = _incidents()
+    for row in rows[:5]:
+        db.insert(row)
+    before = _saved_state(path)
+
+    def failing_save(self, conn):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    with monkeypatch.context() as m:
+        m.setattr(SpikeDetector, "save", failing_save)
+        with pytest.raises(sqlite3.OperationalError):
+            db.commit_batch(conn, [("insert", (row,)) for row in rows[5:]])
+    assert _saved_state(path) == before
+
+    db.commit_batch(conn, [("insert", (row,)) for row in rows[5:]])
+    conn.close()
+    assert _saved_state(path) == _replayed_state(rows)
+
+
+def test_open_spikes_expire_with_the_clock(tmp_path):
+    db = CyberIncidentDB(db_path=str(tmp_path / "incidents.db"), column_store=False)
+    for row in _incidents():
+        db.insert(row)
+
+    on_the_day = db.active_spikes(now=datetime(2024, 1, 11, 12))
+    assert [(s.category, s.bucket, s.count) for s in on_the_day] == [("Phishing", "2024-01-11", 8)]
+    assert db.active_spikes(now=datetime(2024, 1, 12, 12))   # still within the lateness window
+
+    later = datetime(2024, 1, 14, 12)
+    assert db.active_spikes(now=later) == []
+    assert [(e["category"], e["bucket"]) for e in db.spike_events(now=later)] == [("Phishing", "2024-01-11")]
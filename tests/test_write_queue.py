@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+from app.cyber_security.cyber_incidents import CyberIncidentDB
+from app.cyber_security.write_queue import GroupCommitWriter
+
+
+def _row(incident_id, category="Phishing", status="Open"):
+    return {"incident_id": incident_id, "timestamp": f"2024-01-{1 + incident_id % 28:02d} 10:00:00",
+            "severity": "High", "category": category, "status": status, "description": f"Incident {incident_id}"}
+
+
+@pytest.fixture
+def db(tmp_path):
+    return CyberIncidentDB(db_path=str(tmp_path / "incidents.db"), column_store=False)
+
+
+def test_writer_failure_fails_pending_writes_and_restarts(db, tmp_path, caplog):
+    writer = GroupCommitWriter(db)
+    good_path = db.db_path
+    db.db_path = str(tmp_path / "missing" / "incidents.db")   # connect() cannot open it
+
+    with pytest.raises(sqlite3.OperationalError):
+        writer.insert(_row(1)).result(timeout=10)
+    assert "Incident writer thread failed" in caplog.text
+
+    db.db_path = good_path
+    assert writer.insert(_row(2)).result(timeout=10) is True
+
+
+def _table(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT * FROM cyber_incidents ORDER BY incident_id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_bad_op_in_a_batch_fails_alone(db):
+    db.insert(_row(1))
+    conn = sqlite3.connect(db.db_path, isolation_level=None)
+    try:
+        outcomes = db.commit_batch(conn, [
+            ("insert", (_row(2),)),
+            ("insert", ({"incident_id": "not a number"},)),   # ValueError
+            ("insert", (_row(1),)),                           # duplicate: ignored, not an error
+            ("update_status", (2, "Resolved")),
+            ("no_such_op", (3,)),                             # AttributeError
+            ("delete", (1,)),
+        ])
+    finally:
+        conn.close()
+
+    assert [ok for ok, _ in outcomes] == [True, False, True, True, False, True]
+    assert [r for ok, r in outcomes if ok] == [True, False, 1, 1]
+    assert isinstance(outcomes[1][1], ValueError)
+    assert isinstance(outcomes[4][1], AttributeError)
+    assert [(r[0], r[4]) for r in _table(db.db_path)] == [(2, "Resolved")]
+
+
+def test_writer_resolves_each_future_with_its_own_outcome(db):
+    writer = GroupCommitWriter(db, max_delay=0.05)
+    good = writer.insert(_row(1))
+    bad = writer.insert({"incident_id": "x"})
+    duplicate = writer.insert(_row(1))
+    assert good.result(timeout=10) is True
+    assert duplicate.result(timeout=10) is False
+    with pytest.raises(ValueError):
+        bad.result(timeout=10)
+
+
+def test_column_store_matches_sql_after_queued_writes(tmp_path):
+    path = str(tmp_path / "incidents.db")
+    db = CyberIncidentDB(db_path=path, column_store=True)
+    for i in range(1, 41):
+        db.insert(_row(i, category=["Phishing", "Malware", "DDoS"][i % 3]))
+    store = db.column_store()
+
+    writer = GroupCommitWriter(db, max_batch=16, max_delay=0.01)
+    futures = [writer.insert(_row(i, category="Phishing")) for i in range(41, 81)]
+    futures += [writer.update_status(i, "Resolved") for i in range(1, 81, 3)]
+    futures += [writer.delete(i) for i in range(2, 81, 5)]
+    futures.append(writer.insert({"incident_id": "bad"}))
+    futures.append(writer.update_status(999, "Closed"))   # no such incident
+    for future in futures:
+        future.exception(timeout=10)
+    assert writer.batches > 1
+
+    # Patched in place by the batches, not rebuilt from the DB
+    assert db.column_store() is store
+    from_memory = store.dashboard_snapshot()
+    from_sql = CyberIncidentDB(db_path=path, column_store=False).dashboard_snapshot()
+
+    for field in ("total", "unresolved", "phishing", "high_open_count"):
+        assert getattr(from_memory, field) == getattr(from_sql, field), field
+    for field in ("phishing_trend", "unresolved_by_category"):
+        left = getattr(from_memory, field).reset_index(drop=True)
+        right = getattr(from_sql, field).reset_index(drop=True)
+        assert left.astype(str).equals(right.astype(str)), field
+    assert store.count() == len(_table(path))